@@ -0,0 +1,22 @@
+#!/usr/bin/env python3
+"""
+Batcave hook dispatcher entry point (see dispatcher.py)
+Kept to a few lines: a script run as __main__ is compiled on every launch,
+while the imported dispatcher module is loaded from cached bytecode.
+
+Usage:
+    dispatch.py <Event>           # run the pipeline for a hook event (payload on stdin)
+    dispatch.py table [<Event>]   # print the compiled dispatch table
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from dispatcher import main, profiling
+
+if __name__ == "__main__":
+    # CLAUDE_HOOK_PROFILE=1 records a cProfile and subprocess trace per invocation
+    profiler = profiling()
+    sys.exit(profiler.run(sys.argv[1] if len(sys.argv) > 1 else "dispatch", main) if profiler else main())
@@ -0,0 +1,325 @@
+#!/usr/bin/env python3
+"""
+Batcave hook dispatcher
+One process per hook event instead of one per hook. The pipeline in
+hooks/pipeline.json (or $CLAUDE_HOOK_PIPELINE) is compiled at startup into a
+table of tool name -> ordered stages, so a tool call imports and runs exactly
+the handlers that apply to it.
+
+The compiled table is cached in $CLAUDE_HOME/cache/dispatch_table.marshal,
+and a payload that names none of an event's routed tools is answered before
+json or any hook module is imported, so irrelevant tool calls cost about a
+bare interpreter launch. The dispatcher only uses the standard library and
+runs under `python -I -S`; settings.json starts it through the small
+dispatch.py launcher so this module's bytecode is cached instead of being
+recompiled on every tool call.
+
+CLAUDE_HOOK_PROFILE=1 runs each event under cProfile with subprocess tracing
+(see lib/hook_profile.py).
+
+Stage fields:
+    name      stage name (also used by CLAUDE_HOOK_DISABLE=name,name)
+    handler   "<path under hooks/>:<function>"; the function takes the hook
+              payload and returns {"action", "message"}
+    tools     list of tool names, or "*" for every tool
+    when      optional conditions: {"extensions": [...], "env": "VAR"}
+    mode      "sync" (default) or "async" (runs after the response is sent)
+    order     sort key within the event (default 50, ties keep file order)
+    enabled   false turns the stage off
+    on_error  "allow" (default) or "block" when the handler raises
+
+Usage:
+    dispatch.py <Event>           # run the pipeline for a hook event (payload on stdin)
+    dispatch.py table [<Event>]   # print the compiled dispatch table
+"""
+
+import marshal
+import os
+import sys
+
+# json and importlib.util are imported on first use; see the fast path in main()
+
+HOOKS_DIR = os.path.dirname(os.path.abspath(__file__))
+PIPELINE_FILE = os.environ.get("CLAUDE_HOOK_PIPELINE", os.path.join(HOOKS_DIR, "pipeline.json"))
+CLAUDE_HOME = os.environ.get("CLAUDE_HOME", os.path.expanduser("~/.claude"))
+TABLE_CACHE = os.path.join(CLAUDE_HOME, "cache", "dispatch_table.marshal")
+ALLOW = '{"action": "allow"}'
+WILDCARD = "*"
+DEFAULT_ORDER = 50
+
+STAGE_FIELDS = {"name", "handler", "tools", "when", "mode", "order", "enabled", "on_error"}
+CONDITIONS = {"extensions", "env"}
+
+
+_profiler = False
+
+
+def profiling():
+    """hook_profile from ~/.claude/lib when CLAUDE_HOOK_PROFILE is on (optional; None otherwise)"""
+    global _profiler
+    if _profiler is False:
+        _profiler = None
+        if os.environ.get("CLAUDE_HOOK_PROFILE", "").lower() not in ("", "0", "false", "no"):
+            sys.path.insert(0, os.path.join(CLAUDE_HOME, "lib"))
+            try:
+                import hook_profile
+                _profiler = hook_profile
+            except ImportError:
+                pass
+    return _profiler
+
+
+class PipelineError(Exception):
+    """Raised for an invalid pipeline definition"""
+
+
+def load_pipeline(path=PIPELINE_FILE):
+    """Read the pipeline definition"""
+    import json
+    try:
+        with open(path) as handle:
+            pipeline = json.load(handle)
+    except (OSError, ValueError) as e:
+        raise PipelineError(f"cannot read {path}: {e}")
+    if not isinstance(pipeline, dict):
+        raise PipelineError(f"{path} must map hook events to stage lists")
+    return pipeline
+
+
+def validate_stage(event, stage):
+    """Check one stage definition; returns it with defaults filled in"""
+    name = stage.get("name") if isinstance(stage, dict) else None
+    if not name:
+        raise PipelineError(f"{event}: every stage needs a name")
+    unknown = set(stage) - STAGE_FIELDS
+    if unknown:
+        raise PipelineError(f"{event}/{name}: unknown fields {', '.join(sorted(unknown))}")
+    if ":" not in stage.get("handler", ""):
+        raise PipelineError(f"{event}/{name}: handler must be '<path>:<function>'")
+    tools = stage.get("tools", WILDCARD)
+    if tools != WILDCARD and not (isinstance(tools, list) and all(isinstance(tool, str) for tool in tools)):
+        raise PipelineError(f"{event}/{name}: tools must be a list of names or \"*\"")
+    if stage.get("mode", "sync") not in ("sync", "async"):
+        raise PipelineError(f"{event}/{name}: mode must be sync or async")
+    if stage.get("on_error", "allow") not in ("allow", "block"):
+        raise PipelineError(f"{event}/{name}: on_error must be allow or block")
+    unknown = set(stage.get("when", {})) - CONDITIONS
+    if unknown:
+        raise PipelineError(f"{event}/{name}: unknown conditions {', '.join(sorted(unknown))}")
+    return dict({"tools": WILDCARD, "when": {}, "mode": "sync", "order": DEFAULT_ORDER,
+                 "enabled": True, "on_error": "allow"}, **stage)
+
+
+def compile_pipeline(pipeline, disabled=()):
+    """Build {event: {tool: [stage, ...], "*": [stage, ...]}} with order and enable flags applied"""
+    table = {}
+    for event, stages in pipeline.items():
+        if not isinstance(stages, list):
+            raise PipelineError(f"{event}: expected a list of stages")
+        ordered = sorted(enumerate(validate_stage(event, stage) for stage in stages),
+                         key=lambda item: (item[1]["order"], item[0]))
+        active = [stage for _, stage in ordered if stage["enabled"] and stage["name"] not in disabled]
+
+        named_tools = {tool for stage in active if stage["tools"] != WILDCARD for tool in stage["tools"]}
+        routes = {tool: [stage for stage in active if stage["tools"] == WILDCARD or tool in stage["tools"]]
+                  for tool in named_tools}
+        routes[WILDCARD] = [stage for stage in active if stage["tools"] == WILDCARD]
+        table[event] = routes
+    return table
+
+
+def cached_table(path=PIPELINE_FILE, disabled=()):
+    """compile_pipeline(load_pipeline()), reused until the pipeline file or CLAUDE_HOOK_DISABLE changes"""
+    try:
+        stat = os.stat(path)
+        key = [path, stat.st_mtime_ns, stat.st_size, sorted(disabled)]
+    except OSError:
+        key = None
+    if key:
+        try:
+            with open(TABLE_CACHE, "rb") as handle:
+                cached = marshal.load(handle)
+            if cached["key"] == key:
+                return cached["table"]
+        except (OSError, EOFError, ValueError, TypeError, KeyError):
+            pass
+
+    table = compile_pipeline(load_pipeline(path), disabled)
+    if key:
+        try:
+            os.makedirs(os.path.dirname(TABLE_CACHE), exist_ok=True)
+            temp_path = f"{TABLE_CACHE}.{os.getpid()}.tmp"
+            with open(temp_path, "wb") as handle:
+                marshal.dump({"key": key, "table": table}, handle)
+            os.replace(temp_path, TABLE_CACHE)
+        except (OSError, ValueError):
+            pass
+    return table
+
+
+def unrouted(routes, raw_payload):
+    """True when no stage can apply: nothing runs for every tool and no routed tool name appears in the payload"""
+    if routes.get(WILDCARD):
+        return False
+    return not any(f'"{tool}"' in raw_payload for tool in routes if tool != WILDCARD)
+
+
+def normalize(payload):
+    """Give every handler both payload shapes (tool/input and tool_name/parameters)"""
+    event = dict(payload)
+    tool = payload.get("tool") or payload.get("tool_name") or ""
+    tool_input = payload.get("input") or payload.get("tool_input") or payload.get("parameters") or {}
+    event.update(tool=tool, tool_name=tool, input=tool_input, parameters=tool_input)
+    return event
+
+
+def applies(stage, event):
+    """Evaluate a stage's when-conditions against a payload"""
+    when = stage["when"]
+    if "extensions" in when:
+        file_path = event["input"].get("file_path") or event["input"].get("notebook_path") or ""
+        if not file_path.lower().endswith(tuple(when["extensions"])):
+            return False
+    if "env" in when and os.environ.get(when["env"], "").lower() in ("", "0", "false", "no"):
+        return False
+    return True
+
+
+_handlers = {}
+
+
+def load_handler(stage):
+    """Import a stage's hook module on first use and return its handler function"""
+    path, function = stage["handler"].rsplit(":", 1)
+    if stage["handler"] not in _handlers:
+        import importlib.util
+        spec = importlib.util.spec_from_file_location(f"batcave_hook_{stage['name']}",
+                                                      os.path.join(HOOKS_DIR, path))
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        _handlers[stage["handler"]] = getattr(module, function)
+    return _handlers[stage["handler"]]
+
+
+def route(table, event_name, event):
+    """Stages for one payload, split into (sync, async)"""
+    routes = table.get(event_name, {})
+    stages = routes.get(event["tool"], routes.get(WILDCARD, []))
+    stages = [stage for stage in stages if applies(stage, event)]
+    return ([stage for stage in stages if stage["mode"] == "sync"],
+            [stage for stage in stages if stage["mode"] == "async"])
+
+
+def run_stages(stages, event):
+    """Run sync stages in order; the first block wins, messages are joined"""
+    messages = []
+    for stage in stages:
+        try:
+            response = load_handler(stage)(event) or {}
+        except Exception as e:
+            if profiling():
+                profiling().context.setdefault("errors", []).append(f"{stage['name']}: {type(e).__name__}: {e}")
+            if stage["on_error"] == "block":
+                messages.append(f"{stage['name']} error: {e}")
+                return {"action": "block", "message": "\n".join(messages)}
+            messages.append(f"🦇 {stage['name']} error: {e}")
+            continue
+        if response.get("message"):
+            messages.append(response["message"])
+        if response.get("action") == "block":
+            return {"action": "block", "message": "\n".join(messages)}
+
+    response = {"action": "allow"}
+    if messages:
+        response["message"] = "\n".join(messages)
+    return response
+
+
+def run_async_stages(stages, event):
+    """Run every async stage; their responses have nowhere to go"""
+    for stage in stages:
+        try:
+            load_handler(stage)(event)
+        except Exception as e:
+            if profiling():
+                profiling().context.setdefault("errors", []).append(f"{stage['name']}: {type(e).__name__}: {e}")
+
+
+def run_detached(stages, event):
+    """Run async stages in a child process so the hook returns without waiting for them"""
+    if hasattr(os, "fork"):
+        if os.fork():
+            return
+        os.setsid()
+        devnull = os.open(os.devnull, os.O_RDWR)
+        for fd in (0, 1, 2):
+            os.dup2(devnull, fd)
+    if profiling():
+        # run() always calls run_async_stages, unprofiled when the profiler cannot start
+        profiling().run(f"{profiling().context.get('name', 'dispatch')}-async", run_async_stages, stages, event)
+    else:
+        run_async_stages(stages, event)
+    if hasattr(os, "fork"):
+        os._exit(0)
+
+
+def main():
+    """Command line entry point used by settings.json"""
+    args = sys.argv[1:]
+    if not args:
+        print(__doc__.strip(), file=sys.stderr)
+        return 2
+
+    disabled = {name.strip() for name in os.environ.get("CLAUDE_HOOK_DISABLE", "").split(",") if name.strip()}
+
+    if args[0] == "table":
+        try:
+            table = cached_table(disabled=disabled)
+        except PipelineError as e:
+            print(f"dispatch: {e}", file=sys.stderr)
+            return 1
+        for event, routes in table.items():
+            if len(args) > 1 and event != args[1]:
+                continue
+            print(event)
+            for tool in sorted(routes, key=lambda tool: (tool == WILDCARD, tool)):
+                if not routes[tool]:
+                    continue
+                print(f"  {tool}: " + ", ".join(f"{stage['name']}{' (async)' if stage['mode'] == 'async' else ''}"
+                                                for stage in routes[tool]))
+        return 0
+
+    event_name = args[0]
+    try:
+        table = cached_table(disabled=disabled)
+    except PipelineError as e:
+        import json
+        # Without a pipeline the safety stages cannot run, so tool calls are held back
+        action = "block" if event_name == "PreToolUse" else "allow"
+        print(json.dumps({"action": action, "message": f"🦇 Batcave hook pipeline error: {e}"}))
+        return 0
+
+    # Fast path: answer before json or any hook module is imported
+    input_data = sys.stdin.read()
+    if unrouted(table.get(event_name, {}), input_data):
+        print(ALLOW)
+        return 0
+
+    import json
+    try:
+        event = normalize(json.loads(input_data) if input_data.strip() else {})
+    except ValueError:
+        print(ALLOW)
+        return 0
+    if profiling():
+        profiling().context["tool"] = event["tool"]
+
+    sync_stages, async_stages = route(table, event_name, event)
+    print(json.dumps(run_stages(sync_stages, event)), flush=True)
+    if async_stages:
+        run_detached(async_stages, event)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
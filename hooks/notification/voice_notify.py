@@ -6,11 +6,11 @@ Provides Master Wayne with audio updates from the Batcave
 
 import json
 import sys
-import subprocess
-import platform
 
 def speak(message):
     """Speak the message using system TTS"""
+    import platform
+    import subprocess
     system = platform.system()
     
     try:
@@ -33,32 +33,35 @@ def speak(message):
         # Fallback to terminal bell if TTS fails
         print("\a")
 
+def notify(notification):
+    """Speak a notification (also the hook pipeline handler)"""
+    message = notification.get("message", "")
+    
+    # Add Batman-themed personality to messages
+    if "needs your input" in message.lower():
+        speak("Master Wayne, the Batcave requires your attention.")
+    elif "completed" in message.lower():
+        speak("Master Wayne, mission accomplished. Gotham is secure.")
+    elif "error" in message.lower():
+        speak("Master Wayne, we've encountered a situation in the field.")
+    elif "analyzing" in message.lower():
+        speak("Master Wayne, running diagnostics from the Batcave.")
+    elif "implementing" in message.lower():
+        speak("Master Wayne, deploying Wayne Tech protocols.")
+    elif "testing" in message.lower():
+        speak("Master Wayne, running security validation systems.")
+    else:
+        speak(f"Master Wayne, {message}")
+    
+    # Always allow
+    return {"action": "allow"}
+
 def main():
     """Main entry point for the hook"""
     try:
         # Read notification from stdin
         notification = json.load(sys.stdin)
-        
-        message = notification.get("message", "")
-        
-        # Add Batman-themed personality to messages
-        if "needs your input" in message.lower():
-            speak("Master Wayne, the Batcave requires your attention.")
-        elif "completed" in message.lower():
-            speak("Master Wayne, mission accomplished. Gotham is secure.")
-        elif "error" in message.lower():
-            speak("Master Wayne, we've encountered a situation in the field.")
-        elif "analyzing" in message.lower():
-            speak("Master Wayne, running diagnostics from the Batcave.")
-        elif "implementing" in message.lower():
-            speak("Master Wayne, deploying Wayne Tech protocols.")
-        elif "testing" in message.lower():
-            speak("Master Wayne, running security validation systems.")
-        else:
-            speak(f"Master Wayne, {message}")
-        
-        # Always allow
-        print(json.dumps({"action": "allow"}))
+        print(json.dumps(notify(notification)))
         
     except Exception as e:
         print(json.dumps({"action": "allow"}))
@@ -6,8 +6,40 @@ ABOUTME: Reports formatting failures back to Claude Code instead of failing sile
 
 import json
 import sys
-import subprocess
 import os
+import time
+
+# Optional helpers in ~/.claude/lib, imported by load_helpers() once a file actually needs formatting:
+#   shared_cache  content-addressed cache shared by all worktrees
+#   hook_budget   latency budget manager (without it checks use a fixed 30s timeout)
+#   file_profile  generated/minified/large file detection (without it every file is formatted whole)
+#   js_worker     warm prettier worker (without it prettier starts fresh per edit)
+shared_cache = hook_budget = file_profile = js_worker = None
+helpers_loaded = False
+
+def load_helpers():
+    """Import the optional ~/.claude/lib helpers that are installed"""
+    global shared_cache, hook_budget, file_profile, js_worker, helpers_loaded
+    if helpers_loaded:
+        return
+    helpers_loaded = True
+    sys.path.insert(0, os.path.join(os.environ.get("CLAUDE_HOME", os.path.expanduser("~/.claude")), "lib"))
+    try:
+        import shared_cache
+    except ImportError:
+        pass
+    try:
+        import hook_budget
+    except ImportError:
+        pass
+    try:
+        import file_profile
+    except ImportError:
+        pass
+    try:
+        import js_worker
+    except ImportError:
+        pass
 
 FORMATTERS = {
     # JavaScript/TypeScript
@@ -36,7 +68,13 @@ FORMATTERS = {
     ('.yml', '.yaml'): ['prettier', '--write'],
 }
 
-def format_file(file_path):
+# Formatters that can format just the edited region of a large file
+RANGE_ARGS = {
+    'prettier': lambda start, end, start_line, end_line: ['--range-start', str(start), '--range-end', str(end)],
+    'black': lambda start, end, start_line, end_line: ['--line-ranges', f'{start_line}-{end_line}'],
+}
+
+def format_file(file_path, tool_input=None):
     """Format a file based on its extension and return result details"""
     if not os.path.exists(file_path):
         return {
@@ -47,19 +85,116 @@ def format_file(file_path):
     # Find appropriate formatter
     for extensions, formatter_cmd in FORMATTERS.items():
         if any(file_path.endswith(ext) for ext in extensions):
+            import subprocess
+            load_helpers()
+            tool_id = " ".join(formatter_cmd)
+            blob = config = None
+            
+            # Generated and minified files are left alone; large ones only get their edited region formatted
+            range_args = []
+            region = None
+            profile = file_profile.profile_file(file_path) if file_profile else None
+            if profile and profile['kind'] in ('generated', 'minified'):
+                return {
+                    "success": True,
+                    "message": f"⏭️ {os.path.basename(file_path)}: Left unformatted ({profile['kind']} file: {profile['reason']})"
+                }
+            if profile and profile['kind'] == 'large':
+                region = file_profile.edited_region(file_path, tool_input or {})
+                if region is None or formatter_cmd[0] not in RANGE_ARGS:
+                    return {
+                        "success": True,
+                        "message": f"⏭️ {os.path.basename(file_path)}: Left unformatted (large file: {profile['reason']}, "
+                                   f"no edited region {formatter_cmd[0]} can format on its own)"
+                    }
+                range_args = RANGE_ARGS[formatter_cmd[0]](*region)
+            
+            # Same content under the same config was already formatted (maybe in another worktree)
+            if shared_cache:
+                blob, original = shared_cache.file_blob(file_path)
+                config = shared_cache.config_fingerprint(file_path)
+                version = shared_cache.tool_version(formatter_cmd, file_path)
+                cached = shared_cache.get_formatted(tool_id, version, blob, config)
+                if cached is not None:
+                    if cached != original:
+                        with open(file_path, 'wb') as f:
+                            f.write(cached)
+                    return {
+                        "success": True,
+                        "message": f"✅ {os.path.basename(file_path)}: Formatted with {formatter_cmd[0]} (shared cache)"
+                    }
+            
+            # The project's warm prettier worker; the CLI below when it is unavailable
+            response = None
+            if formatter_cmd[0] == 'prettier' and js_worker:
+                response = js_worker.request('format', file_path, config=config,
+                                             range=list(region[:2]) if range_args else None)
+            if response is not None:
+                if not response['success']:
+                    return {
+                        "success": False,
+                        "message": f"🚨 FORMATTING FAILED for {os.path.basename(file_path)}: {response['stderr'] or 'Unknown formatting error'}"
+                    }
+                output = response['output'].encode('utf-8')
+                with open(file_path, 'rb') as f:
+                    changed = f.read() != output
+                if changed:
+                    with open(file_path, 'wb') as f:
+                        f.write(output)
+                if shared_cache and not range_args:
+                    shared_cache.put_formatted(tool_id, version, blob, config, output)
+                scope = " (edited region)" if range_args else ""
+                return {
+                    "success": True,
+                    "message": f"✅ {os.path.basename(file_path)}: Formatted with {formatter_cmd[0]}{scope}"
+                }
+            
             try:
                 # Check if formatter exists
                 subprocess.run(['which', formatter_cmd[0]], 
                              check=True, capture_output=True)
                 
+                # Formatting rewrites the file, so it runs inline or not at all
+                if range_args:
+                    tool_id += " --range"
+                timeout = 30
+                budget = hook_budget.Budget('auto_format', file_path) if hook_budget else None
+                if budget:
+                    decision, timeout = budget.plan(tool_id, formatter_cmd[0], allow_background=False)
+                    if decision != 'inline':
+                        return {
+                            "success": True,
+                            "message": f"{budget.summary()} ({os.path.basename(file_path)} left unformatted)"
+                        }
+                
                 # Run formatter
-                cmd = formatter_cmd + [file_path]
-                result = subprocess.run(cmd, capture_output=True, text=True, timeout=30)
+                cmd = formatter_cmd + range_args + [file_path]
+                started = time.time()
+                try:
+                    result = subprocess.run(cmd, capture_output=True, text=True, timeout=timeout)
+                except subprocess.TimeoutExpired:
+                    if budget:
+                        budget.record(tool_id, formatter_cmd[0], time.time() - started, timed_out=True)
+                    raise
+                if budget:
+                    budget.record(tool_id, formatter_cmd[0], time.time() - started)
+                
+                if range_args and result.returncode == 2 and 'no such option' in result.stderr.lower():
+                    # e.g. black before 23.11 has no --line-ranges
+                    return {
+                        "success": True,
+                        "message": f"⏭️ {os.path.basename(file_path)}: Left unformatted (large file; this {formatter_cmd[0]} cannot format a range)"
+                    }
                 
                 if result.returncode == 0:
+                    # A range-formatted file is not the whole-file formatter output the cache stores
+                    if shared_cache and not range_args:
+                        with open(file_path, 'rb') as f:
+                            shared_cache.put_formatted(tool_id, version, blob, config, f.read())
+                    scope = " (edited region)" if range_args else ""
                     return {
                         "success": True,
-                        "message": f"✅ {os.path.basename(file_path)}: Formatted with {formatter_cmd[0]}"
+                        "message": f"✅ {os.path.basename(file_path)}: Formatted with {formatter_cmd[0]}{scope}"
                     }
                 else:
                     error_msg = result.stderr.strip() or result.stdout.strip() or "Unknown formatting error"
@@ -92,30 +227,30 @@ def format_file(file_path):
         "message": f"No formatter configured for {os.path.basename(file_path)}"
     }
 
+def handle(tool_use):
+    """Format the file a Write/Edit/MultiEdit touched (also the hook pipeline handler)"""
+    # Check if it's a file modification tool
+    if tool_use.get("tool") in ["Write", "Edit", "MultiEdit"]:
+        file_path = tool_use.get("input", {}).get("file_path")
+        
+        if file_path:
+            format_result = format_file(file_path, tool_use.get("input", {}))
+            
+            # Report result back to Claude with Batman theming
+            return {
+                "action": "allow",
+                "message": f"🦇 Batcave Auto-Format: {format_result['message']}"
+            }
+    
+    # Default response for non-file operations
+    return {"action": "allow"}
+
 def main():
     """Main entry point for the hook"""
     try:
         # Read tool use from stdin
         tool_use = json.load(sys.stdin)
-        
-        # Check if it's a file modification tool
-        if tool_use.get("tool") in ["Write", "Edit", "MultiEdit"]:
-            file_path = tool_use.get("input", {}).get("file_path")
-            
-            if file_path:
-                format_result = format_file(file_path)
-                
-                # Report result back to Claude with Batman theming
-                response = {
-                    "action": "allow",
-                    "message": f"🦇 Batcave Auto-Format: {format_result['message']}"
-                }
-                
-                print(json.dumps(response))
-                return
-        
-        # Default response for non-file operations
-        print(json.dumps({"action": "allow"}))
+        print(json.dumps(handle(tool_use)))
         
     except Exception as e:
         # Report hook errors to Claude
@@ -6,46 +6,96 @@ ABOUTME: Reports linting errors back to Claude Code for immediate attention
 
 import json
 import sys
-import subprocess
 import os
-from pathlib import Path
+import time
 
-# Linter configurations for different file types
-LINTERS = {
-    # TypeScript/JavaScript
-    ('.ts', '.tsx'): {
-        'linters': [
-            (['npx', 'tsc', '--noEmit', '--skipLibCheck'], 'TypeScript compiler check'),
-            (['npx', 'eslint', '--format', 'json'], 'ESLint analysis')
-        ],
-        'formatters': [
-            (['npx', 'prettier', '--check'], 'Prettier format check')
-        ]
-    },
-    ('.js', '.jsx'): {
-        'linters': [
-            (['npx', 'eslint', '--format', 'json'], 'ESLint analysis')
-        ],
-        'formatters': [
-            (['npx', 'prettier', '--check'], 'Prettier format check')
-        ]
-    },
+# Optional helpers in ~/.claude/lib, imported by load_helpers() once a file actually needs linting:
+#   shared_cache  content-addressed cache shared by all worktrees
+#   hook_budget   latency budget manager (without it checks use a fixed 30s timeout)
+#   file_profile  generated/minified/large file detection (without it every file gets every check)
+#   tsc_service   per-project tsc watch service (without it tsc type-checks from scratch per edit)
+#   js_worker     warm ESLint/Prettier worker (without it both start fresh per edit)
+shared_cache = hook_budget = file_profile = tsc_service = js_worker = None
+helpers_loaded = False
+
+def load_helpers():
+    """Import the optional ~/.claude/lib helpers that are installed"""
+    global shared_cache, hook_budget, file_profile, tsc_service, js_worker, helpers_loaded
+    if helpers_loaded:
+        return
+    helpers_loaded = True
+    sys.path.insert(0, os.path.join(os.environ.get("CLAUDE_HOME", os.path.expanduser("~/.claude")), "lib"))
+    try:
+        import shared_cache
+    except ImportError:
+        pass
+    try:
+        import hook_budget
+    except ImportError:
+        pass
+    try:
+        import file_profile
+    except ImportError:
+        pass
+    try:
+        import tsc_service
+    except ImportError:
+        pass
+    try:
+        import js_worker
+    except ImportError:
+        pass
+
+# Extensions load_linters() has checks for; anything else returns before the table is built
+LINTED_EXTENSIONS = ('.ts', '.tsx', '.js', '.jsx', '.py')
+
+def load_linters():
+    """Linter configurations for different file types"""
+    return {
+        # TypeScript/JavaScript
+        ('.ts', '.tsx'): {
+            'linters': [
+                (['npx', 'tsc', '--noEmit', '--skipLibCheck'], 'TypeScript compiler check'),
+                (['npx', 'eslint', '--format', 'json'], 'ESLint analysis')
+            ],
+            'formatters': [
+                (['npx', 'prettier', '--check'], 'Prettier format check')
+            ]
+        },
+        ('.js', '.jsx'): {
+            'linters': [
+                (['npx', 'eslint', '--format', 'json'], 'ESLint analysis')
+            ],
+            'formatters': [
+                (['npx', 'prettier', '--check'], 'Prettier format check')
+            ]
+        },
     
-    # Python
-    ('.py',): {
-        'linters': [
-            (['flake8', '--format=json'], 'Flake8 style check'),
-            (['mypy', '--show-error-codes', '--no-error-summary'], 'MyPy type check'),
-            (['pylint', '--output-format=json'], 'Pylint analysis')
-        ],
-        'formatters': [
-            (['black', '--check', '--diff'], 'Black format check')
-        ]
+        # Python
+        ('.py',): {
+            'linters': [
+                (['flake8', '--format=json'], 'Flake8 style check'),
+                (['mypy', '--show-error-codes', '--no-error-summary'], 'MyPy type check'),
+                (['pylint', '--output-format=json'], 'Pylint analysis')
+            ],
+            'formatters': [
+                (['black', '--check', '--diff'], 'Black format check')
+            ]
+        }
     }
-}
+
+# Checks whose result depends on other files too; never served from the per-file cache
+CROSS_FILE_CHECKS = {'TypeScript compiler check', 'MyPy type check', 'Pylint analysis'}
+
+# Checks the warm JS worker answers, by worker operation
+JS_WORKER_OPS = {'ESLint analysis': 'lint', 'Prettier format check': 'check'}
+
+# Fast single-file checks that still run on large files
+LARGE_FILE_CHECKS = {'ESLint analysis', 'Flake8 style check'}
 
 def check_tool_available(tool_cmd):
     """Check if a linting tool is available in the system"""
+    import subprocess
     try:
         subprocess.run(['which', tool_cmd[0]], 
                       check=True, capture_output=True)
@@ -53,13 +103,14 @@ def check_tool_available(tool_cmd):
     except subprocess.CalledProcessError:
         return False
 
-def run_linter(file_path, linter_cmd, description):
+def run_linter(file_path, linter_cmd, description, timeout=30):
     """Run a single linter and return results"""
+    import subprocess
     try:
         # Add file path to command
         cmd = linter_cmd + [file_path]
         
-        result = subprocess.run(cmd, capture_output=True, text=True, timeout=30)
+        result = subprocess.run(cmd, capture_output=True, text=True, timeout=timeout)
         
         return {
             'tool': description,
@@ -73,8 +124,9 @@ def run_linter(file_path, linter_cmd, description):
             'tool': description,
             'success': False,
             'stdout': '',
-            'stderr': f'{description} timed out after 30 seconds',
-            'returncode': -1
+            'stderr': f'{description} timed out after {timeout:.0f} seconds',
+            'returncode': -1,
+            'timed_out': True
         }
     except Exception as e:
         return {
@@ -136,9 +188,13 @@ def lint_file(file_path):
     if not os.path.exists(file_path):
         return {"success": True, "message": "File not found for linting"}
     
+    if not file_path.endswith(LINTED_EXTENSIONS):
+        return {"success": True, "message": "No linters configured for this file type"}
+    load_helpers()
+    
     # Find applicable linters
     applicable_config = None
-    for extensions, config in LINTERS.items():
+    for extensions, config in load_linters().items():
         if any(file_path.endswith(ext) for ext in extensions):
             applicable_config = config
             break
@@ -146,30 +202,90 @@ def lint_file(file_path):
     if not applicable_config:
         return {"success": True, "message": "No linters configured for this file type"}
     
+    # Generated and minified files are not worth linting; large ones only get the fast checks
+    checks = applicable_config.get('linters', []) + applicable_config.get('formatters', [])
+    notes = []
+    profile = file_profile.profile_file(file_path) if file_profile else None
+    if profile and profile['kind'] in ('generated', 'minified'):
+        return {
+            "success": True,
+            "message": f"⏭️ {os.path.basename(file_path)}: Checks skipped ({profile['kind']} file: {profile['reason']})"
+        }
+    if profile and profile['kind'] == 'large':
+        skipped = [description for _, description in checks if description not in LARGE_FILE_CHECKS]
+        checks = [check for check in checks if check[1] in LARGE_FILE_CHECKS]
+        if skipped:
+            notes.append(f"📦 Large file ({profile['reason']}): skipped {', '.join(skipped)}")
+    
     all_errors = []
     linters_run = 0
     
-    # Run linters
-    for linter_cmd, description in applicable_config.get('linters', []):
-        if check_tool_available(linter_cmd):
-            result = run_linter(file_path, linter_cmd, description)
-            linters_run += 1
-            
+    # Latency budget: slow checks move to the background or are skipped
+    budget = hook_budget.Budget('linter_check', file_path) if hook_budget else None
+    if budget:
+        for result in budget.collect_background():
             if not result['success']:
-                errors = parse_linter_output(result, file_path)
-                all_errors.extend(errors)
+                all_errors.extend(f"[background] {error}" for error in parse_linter_output(result, file_path))
     
-    # Run formatters
-    for formatter_cmd, description in applicable_config.get('formatters', []):
-        if check_tool_available(formatter_cmd):
-            result = run_linter(file_path, formatter_cmd, description)
-            linters_run += 1
+    # Content and config fingerprints for the shared cache
+    blob = config = None
+    if shared_cache:
+        blob = shared_cache.file_blob(file_path)[0]
+        config = shared_cache.config_fingerprint(file_path)
+    
+    # Run linters, then formatters
+    for tool_cmd, description in checks:
+        cacheable = shared_cache is not None and description not in CROSS_FILE_CHECKS
+        tool_id = " ".join(tool_cmd)
+        version = shared_cache.tool_version(tool_cmd, file_path) if cacheable else None
+        
+        result = shared_cache.get_result(tool_id, version, file_path, blob, config) if cacheable else None
+        
+        # Ask the project's tsc watch service instead of compiling the project again
+        if result is None and description == 'TypeScript compiler check' and tsc_service:
+            result = tsc_service.check(file_path, budget.remaining() if budget else 30)
+            if result is not None and result.get('pending'):
+                notes.append("⏳ TypeScript compiler check still running in the project tsc service (results on the next edit)")
+                continue
+        
+        # The project's warm ESLint/Prettier worker; the CLI below when it is unavailable
+        if result is None and description in JS_WORKER_OPS and js_worker:
+            response = js_worker.request(JS_WORKER_OPS[description], file_path,
+                                         budget.remaining() if budget else 30, config=config)
+            if response is not None:
+                result = dict(response, tool=description)
+                if cacheable and result['returncode'] != -1:
+                    shared_cache.put_result(tool_id, version, file_path, result, blob, config)
+        
+        if result is None:
+            if not check_tool_available(tool_cmd):
+                continue
             
-            if not result['success']:
-                errors = parse_linter_output(result, file_path)
-                all_errors.extend(errors)
+            timeout = 30
+            if budget:
+                decision, timeout = budget.plan(tool_id, description)
+                if decision == 'background':
+                    budget.background(tool_id, description, tool_cmd + [file_path])
+                if decision != 'inline':
+                    continue
+            
+            started = time.time()
+            result = run_linter(file_path, tool_cmd, description, timeout)
+            if budget:
+                budget.record(tool_id, description, time.time() - started, result.get('timed_out', False))
+            # Timeouts and crashes (returncode -1) are not results worth sharing
+            if cacheable and result['returncode'] != -1:
+                shared_cache.put_result(tool_id, version, file_path, result, blob, config)
+        
+        linters_run += 1
+        if not result['success']:
+            errors = parse_linter_output(result, file_path)
+            all_errors.extend(errors)
     
     # Prepare response
+    if budget and budget.degraded:
+        notes.append(budget.summary())
+    degraded = "".join(f"\n{note}" for note in notes)
     if all_errors:
         filename = os.path.basename(file_path)
         error_summary = f"🚨 LINTING ERRORS in {filename}:\n" + "\n".join(f"  • {error}" for error in all_errors[:10])
@@ -178,13 +294,18 @@ def lint_file(file_path):
         
         return {
             "success": False,
-            "message": error_summary,
+            "message": error_summary + degraded,
             "error_count": len(all_errors)
         }
     elif linters_run > 0:
         return {
             "success": True,
-            "message": f"✅ {os.path.basename(file_path)}: All {linters_run} linting checks passed"
+            "message": f"✅ {os.path.basename(file_path)}: All {linters_run} linting checks passed" + degraded
+        }
+    elif degraded:
+        return {
+            "success": True,
+            "message": f"⏭️ {os.path.basename(file_path)}: No checks ran" + degraded
         }
     else:
         return {
@@ -192,36 +313,38 @@ def lint_file(file_path):
             "message": f"⚠️ {os.path.basename(file_path)}: No linters available for this file type"
         }
 
+def handle(tool_use):
+    """Lint the file a Write/Edit/MultiEdit touched (also the hook pipeline handler)"""
+    # Check if it's a file modification tool
+    if tool_use.get("tool") in ["Write", "Edit", "MultiEdit"]:
+        file_path = tool_use.get("input", {}).get("file_path")
+        
+        if file_path:
+            lint_result = lint_file(file_path)
+            
+            # Return result with message for Claude
+            response = {
+                "action": "allow",
+                "message": lint_result["message"]
+            }
+            
+            # Add Batman theming for consistency
+            if not lint_result["success"]:
+                response["message"] = f"🦇 Batcave Alert: {response['message']}"
+            else:
+                response["message"] = f"🦇 Batcave: {response['message']}"
+            
+            return response
+    
+    # Default response for non-file operations
+    return {"action": "allow"}
+
 def main():
     """Main entry point for the linter hook"""
     try:
         # Read tool use from stdin
         tool_use = json.load(sys.stdin)
-        
-        # Check if it's a file modification tool
-        if tool_use.get("tool") in ["Write", "Edit", "MultiEdit"]:
-            file_path = tool_use.get("input", {}).get("file_path")
-            
-            if file_path:
-                lint_result = lint_file(file_path)
-                
-                # Return result with message for Claude
-                response = {
-                    "action": "allow",
-                    "message": lint_result["message"]
-                }
-                
-                # Add Batman theming for consistency
-                if not lint_result["success"]:
-                    response["message"] = f"🦇 Batcave Alert: {response['message']}"
-                else:
-                    response["message"] = f"🦇 Batcave: {response['message']}"
-                
-                print(json.dumps(response))
-                return
-        
-        # Default response for non-file operations
-        print(json.dumps({"action": "allow"}))
+        print(json.dumps(handle(tool_use)))
         
     except Exception as e:
         # Report hook errors to Claude
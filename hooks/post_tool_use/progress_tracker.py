@@ -9,10 +9,11 @@ import sys
 import os
 import time
 from datetime import datetime
-from pathlib import Path
 
 # Progress tracking file location
 PROGRESS_FILE = os.path.expanduser("~/.claude/progress.json")
+# Append-only operation log streamed by scripts/session_analytics.py
+OPERATIONS_LOG = os.path.expanduser("~/.claude/operations.jsonl")
 
 def load_progress():
     """Load existing progress data."""
@@ -36,6 +37,28 @@ def save_progress(progress_data):
         # Silently fail if can't write progress
         pass
 
+def append_operation_log(session_id, tool_name, parameters, success, tool_data):
+    """Append one compact operation record to the JSONL log (one short write, no rewrite)."""
+    record = {
+        'ts': round(time.time(), 3),
+        'session': session_id,
+        'tool': tool_name,
+        'success': bool(success)
+    }
+    
+    file_path = parameters.get('file_path') or parameters.get('notebook_path') if isinstance(parameters, dict) else None
+    if file_path:
+        record['file'] = file_path
+    
+    if 'duration_ms' in tool_data:
+        record['duration_ms'] = tool_data['duration_ms']
+    
+    try:
+        with open(OPERATIONS_LOG, 'a') as f:
+            f.write(json.dumps(record, separators=(',', ':')) + '\n')
+    except IOError:
+        pass
+
 def track_operation(tool_data):
     """
     Track the progress of a tool operation.
@@ -103,6 +126,7 @@ def track_operation(tool_data):
     
     # Save progress
     save_progress(progress)
+    append_operation_log(current_session, tool_name, parameters, success, tool_data)
     
     # Generate Batman-themed progress message
     stats = session_data['stats']
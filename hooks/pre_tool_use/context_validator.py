@@ -7,11 +7,58 @@ Validates tool usage context to ensure appropriate tool selection and usage patt
 import json
 import sys
 import os
-from pathlib import Path
+
+# Directories whose files are never edited
+SENSITIVE_PATHS = ['/etc/', '/usr/bin/', '/usr/sbin/', '/bin/', '/sbin/']
+
+# Potentially problematic command patterns
+PROBLEMATIC_PATTERNS = [
+    'sudo su',
+    'chmod 777',
+    'chown root',
+    'dd if=/dev/zero',
+    'mkfs.',
+    'fdisk',
+    'parted'
+]
+
+# Files Write must not overwrite
+IMPORTANT_FILES = [
+    '/etc/passwd',
+    '/etc/shadow',
+    '/etc/hosts',
+    '/etc/fstab',
+    '~/.ssh/authorized_keys',
+    '~/.bashrc',
+    '~/.zshrc'
+]
+
+# Tools this validator inspects, and the parameters its verdict depends on
+VALIDATED_TOOLS = ['Read', 'Write', 'Edit', 'MultiEdit', 'Bash']
+VALIDATED_PARAMETERS = ['file_path', 'command']
+
+# Allow-verdict cache, loaded on the first validated call by load_verdicts()
+verdicts = None
+verdicts_loaded = False
+
+def load_verdicts():
+    """Verdict cache tied to these exact lists (~/.claude/lib, optional; without it every call is validated)"""
+    global verdicts, verdicts_loaded
+    if not verdicts_loaded:
+        verdicts_loaded = True
+        sys.path.insert(0, os.path.join(os.environ.get("CLAUDE_HOME", os.path.expanduser("~/.claude")), "lib"))
+        try:
+            import verdict_cache
+            verdicts = verdict_cache.VerdictCache(
+                "context_validator", verdict_cache.pattern_version(SENSITIVE_PATHS, PROBLEMATIC_PATTERNS, IMPORTANT_FILES)
+            )
+        except ImportError:
+            pass
+    return verdicts
 
 def validate_context(tool_data):
     """
-    Validate the context of tool usage to ensure appropriate patterns.
+    Validate the context of tool usage, answering repeats from the verdict cache.
     
     Args:
         tool_data: Dictionary containing tool invocation information
@@ -22,6 +69,31 @@ def validate_context(tool_data):
     tool_name = tool_data.get('tool_name', '')
     parameters = tool_data.get('parameters', {})
     
+    # Nothing to validate for other tools
+    if tool_name not in VALIDATED_TOOLS:
+        return {"action": "allow"}
+    
+    inspected = {key: parameters.get(key) for key in VALIDATED_PARAMETERS}
+    verdicts = load_verdicts()
+    if verdicts and verdicts.allowed(tool_name, inspected):
+        return {"action": "allow"}
+    
+    response = check_context(tool_name, parameters)
+    if verdicts:
+        verdicts.remember(tool_name, inspected, response)
+    return response
+
+def check_context(tool_name, parameters):
+    """
+    Validate the context of tool usage to ensure appropriate patterns.
+    
+    Args:
+        tool_name: Name of the invoked tool
+        parameters: Tool parameters
+        
+    Returns:
+        dict: Response with action and optional message
+    """
     # File operation context validation
     if tool_name in ['Read', 'Write', 'Edit', 'MultiEdit']:
         file_path = parameters.get('file_path', '')
@@ -34,8 +106,7 @@ def validate_context(tool_data):
             }
         
         # Warn about editing system files
-        sensitive_paths = ['/etc/', '/usr/bin/', '/usr/sbin/', '/bin/', '/sbin/']
-        if any(file_path.startswith(path) for path in sensitive_paths):
+        if any(file_path.startswith(path) for path in SENSITIVE_PATHS):
             return {
                 "action": "block",
                 "message": f"Blocked editing system file: {file_path}"
@@ -46,17 +117,7 @@ def validate_context(tool_data):
         command = parameters.get('command', '')
         
         # Check for potentially problematic command patterns
-        problematic_patterns = [
-            'sudo su',
-            'chmod 777',
-            'chown root',
-            'dd if=/dev/zero',
-            'mkfs.',
-            'fdisk',
-            'parted'
-        ]
-        
-        for pattern in problematic_patterns:
+        for pattern in PROBLEMATIC_PATTERNS:
             if pattern in command:
                 return {
                     "action": "block",
@@ -66,18 +127,8 @@ def validate_context(tool_data):
     # Validate Write operations don't overwrite important files
     if tool_name == 'Write':
         file_path = parameters.get('file_path', '')
-        important_files = [
-            '/etc/passwd',
-            '/etc/shadow',
-            '/etc/hosts',
-            '/etc/fstab',
-            '~/.ssh/authorized_keys',
-            '~/.bashrc',
-            '~/.zshrc'
-        ]
-        
         expanded_path = os.path.expanduser(file_path)
-        if expanded_path in important_files:
+        if expanded_path in IMPORTANT_FILES:
             return {
                 "action": "block",
                 "message": f"Blocked overwriting important system file: {file_path}"
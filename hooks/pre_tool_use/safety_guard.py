@@ -7,6 +7,7 @@ while allowing everything else in dangerous mode
 import json
 import sys
 import re
+import os
 
 DANGER_PATTERNS = [
     # Destructive file operations
@@ -37,12 +38,34 @@ DANGER_PATTERNS = [
     (r"nc\s+-l.*-e\s*/bin/(?:bash|sh)", "Reverse shell detected"),
 ]
 
+# Allow-verdict cache, loaded on the first Bash command by load_verdicts()
+verdicts = None
+verdicts_loaded = False
+
+def load_verdicts():
+    """Verdict cache tied to this exact pattern set (~/.claude/lib, optional; without it every command is scanned)"""
+    global verdicts, verdicts_loaded
+    if not verdicts_loaded:
+        verdicts_loaded = True
+        sys.path.insert(0, os.path.join(os.environ.get("CLAUDE_HOME", os.path.expanduser("~/.claude")), "lib"))
+        try:
+            import verdict_cache
+            verdicts = verdict_cache.VerdictCache("safety_guard", verdict_cache.pattern_version(DANGER_PATTERNS))
+        except ImportError:
+            pass
+    return verdicts
+
 def check_safety(tool_use):
     """Check if the tool use is safe to execute"""
     try:
         if tool_use.get("tool") == "Bash":
             command = tool_use.get("input", {}).get("command", "")
             
+            # Same command already passed this pattern set
+            verdicts = load_verdicts()
+            if verdicts and verdicts.allowed("Bash", {"command": command}):
+                return {"action": "allow"}
+            
             # Check against danger patterns
             for pattern, message in DANGER_PATTERNS:
                 if re.search(pattern, command, re.IGNORECASE):
@@ -50,6 +73,9 @@ def check_safety(tool_use):
                         "action": "block",
                         "message": f"🛡️ BLOCKED: {message}\nCommand: {command}"
                     }
+            
+            if verdicts:
+                verdicts.remember("Bash", {"command": command}, {"action": "allow"})
         
         # Allow all other commands
         return {"action": "allow"}
@@ -8,11 +8,12 @@ import json
 import sys
 import os
 from datetime import datetime
-from pathlib import Path
 
 # Log file location
 LOG_FILE = os.path.expanduser("~/.claude/session_logs.json")
 PROGRESS_FILE = os.path.expanduser("~/.claude/progress.json")
+# Append-only session summaries streamed by scripts/session_analytics.py
+SESSIONS_LOG = os.path.expanduser("~/.claude/session_logs.jsonl")
 
 def load_logs():
     """Load existing log data."""
@@ -46,6 +47,15 @@ def save_logs(log_data):
         # Silently fail if can't write logs
         pass
 
+def append_session_log(session_summary):
+    """Append the session summary (without its operation list) to the JSONL log."""
+    summary = {key: value for key, value in session_summary.items() if key != 'operations'}
+    try:
+        with open(SESSIONS_LOG, 'a') as f:
+            f.write(json.dumps(summary, separators=(',', ':')) + '\n')
+    except IOError:
+        pass
+
 def log_session_completion(stop_data):
     """
     Log the completion of a Claude Code session.
@@ -101,6 +111,7 @@ def log_session_completion(stop_data):
     
     # Save logs
     save_logs(logs)
+    append_session_log(session_summary)
     
     # Generate Batman-themed summary message
     stats = session_summary['stats']
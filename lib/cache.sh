@@ -5,8 +5,8 @@ source "${CLAUDE_HOME:-$HOME/.claude}/lib/utils.sh"
 
 # Cache configuration
 CACHE_DIR="${CLAUDE_HOME:-$HOME/.claude}/cache"
-DEFAULT_TTL="${DEFAULT_TTL:-3600}  # 1 hour"
-MAX_CACHE_SIZE="${MAX_CACHE_SIZE:-100}  # MB"
+DEFAULT_TTL="${DEFAULT_TTL:-3600}"  # 1 hour
+MAX_CACHE_SIZE="${MAX_CACHE_SIZE:-100}"  # MB
 CACHE_VERSION="${CACHE_VERSION:-1.0}"
 
 # Initialize cache system
@@ -58,8 +58,8 @@ cache_get_advanced() {
     
     # Check if cache exists and is valid
     if [[ -f "$cache_file" && -f "$meta_file" ]]; then
-        local created=$(json_get "$meta_file" "created")
-        local ttl=$(json_get "$meta_file" "ttl")
+        local created ttl
+        { read -r created; read -r ttl; } < <(json_get_many "$meta_file" "created" "ttl")
         local now=$(epoch_time)
         
         if [[ $((now - created)) -lt $ttl ]]; then
@@ -161,16 +161,13 @@ update_cache_stats() {
     
     case "$stat_type" in
         "hit")
-            local hits=$(json_get "$stats_file" "stats.hits")
-            json_set "$stats_file" "stats.hits" $((hits + 1))
+            json_incr "$stats_file" "stats.hits"
             ;;
         "miss")
-            local misses=$(json_get "$stats_file" "stats.misses")
-            json_set "$stats_file" "stats.misses" $((misses + 1))
+            json_incr "$stats_file" "stats.misses"
             ;;
         "eviction")
-            local evictions=$(json_get "$stats_file" "stats.evictions")
-            json_set "$stats_file" "stats.evictions" $((evictions + 1))
+            json_incr "$stats_file" "stats.evictions"
             ;;
     esac
 }
@@ -179,9 +176,11 @@ get_cache_stats() {
     local stats_file="$CACHE_DIR/cache.json"
     
     if [[ -f "$stats_file" ]]; then
-        local hits=$(json_get "$stats_file" "stats.hits")
-        local misses=$(json_get "$stats_file" "stats.misses")
-        local evictions=$(json_get "$stats_file" "stats.evictions")
+        local hits misses evictions
+        { read -r hits; read -r misses; read -r evictions; } < <(json_get_many "$stats_file" "stats.hits" "stats.misses" "stats.evictions")
+        hits=${hits:-0}
+        misses=${misses:-0}
+        evictions=${evictions:-0}
         local total=$((hits + misses))
         
         if [[ $total -gt 0 ]]; then
@@ -202,20 +201,28 @@ get_cache_stats() {
 # Specialized cache functions for different components
 
 # MCP response caching
+# Requests are fingerprinted on a normalized form so whitespace-only
+# variations of the same query share one cache entry
+normalize_mcp_request() {
+    echo "$*" | tr -s '[:space:]' ' ' | sed 's/^ //;s/ $//'
+}
+
 cache_mcp_response() {
     local server="$1"
     local query="$2"
     local response="$3"
     local ttl="${4:-1800}"  # 30 minutes for MCP responses
+    local method="${5:-query}"
     
-    cache_set_advanced "mcp" "$server" "$query" "$response" "$ttl"
+    cache_set_advanced "mcp" "$server" "$method:$(normalize_mcp_request "$query")" "$response" "$ttl"
 }
 
 get_cached_mcp_response() {
     local server="$1"
     local query="$2"
+    local method="${3:-query}"
     
-    cache_get_advanced "mcp" "$server" "$query"
+    cache_get_advanced "mcp" "$server" "$method:$(normalize_mcp_request "$query")"
 }
 
 # Persona context caching
@@ -311,7 +318,7 @@ fi
 # Export cache functions
 export -f init_cache generate_cache_key cache_get_advanced cache_set_advanced
 export -f cache_invalidate maintain_cache_size update_cache_stats get_cache_stats
-export -f cache_mcp_response get_cached_mcp_response
+export -f normalize_mcp_request cache_mcp_response get_cached_mcp_response
 export -f cache_persona_context get_cached_persona_context
 export -f cache_project_context get_cached_project_context
 export -f cache_command_result get_cached_command_result
@@ -208,6 +208,18 @@ calculate_complexity() {
     fi
 }
 
+# Domain keyword patterns, checked in priority order
+PROBLEM_DOMAIN_PATTERNS=(
+    "architecture:(architect|design|system|pattern|microservice|scalab|infrastruc)"
+    "performance:(performance|speed|optimiz|slow|fast|latency|throughput)"
+    "security:(security|vulnerabil|auth|encrypt|token|permission|attack)"
+    "frontend:(ui|frontend|react|vue|angular|component|css|html|responsive)"
+    "backend:(backend|api|server|database|sql|nosql|endpoint|service)"
+    "devops:(deploy|docker|kubernetes|ci/cd|pipeline|cloud|aws|azure|gcp)"
+    "testing:(test|testing|unit|integration|e2e|cypress|jest|spec)"
+    "data:(data|analytics|ml|ai|machine|learning|model|dataset)"
+)
+
 # Domain detection for appropriate persona selection
 detect_problem_domain() {
     local problem="$*"
@@ -216,35 +228,43 @@ detect_problem_domain() {
     # Convert to lowercase for matching
     local problem_lower=$(to_lower "$problem")
     
-    # Architecture keywords
-    if echo "$problem_lower" | grep -E "(architect|design|system|pattern|microservice|scalab|infrastruc)" >/dev/null; then
-        domain="architecture"
-    # Performance keywords
-    elif echo "$problem_lower" | grep -E "(performance|speed|optimiz|slow|fast|latency|throughput)" >/dev/null; then
-        domain="performance"
-    # Security keywords
-    elif echo "$problem_lower" | grep -E "(security|vulnerabil|auth|encrypt|token|permission|attack)" >/dev/null; then
-        domain="security"
-    # Frontend keywords
-    elif echo "$problem_lower" | grep -E "(ui|frontend|react|vue|angular|component|css|html|responsive)" >/dev/null; then
-        domain="frontend"
-    # Backend keywords
-    elif echo "$problem_lower" | grep -E "(backend|api|server|database|sql|nosql|endpoint|service)" >/dev/null; then
-        domain="backend"
-    # DevOps keywords
-    elif echo "$problem_lower" | grep -E "(deploy|docker|kubernetes|ci/cd|pipeline|cloud|aws|azure|gcp)" >/dev/null; then
-        domain="devops"
-    # Testing keywords
-    elif echo "$problem_lower" | grep -E "(test|testing|unit|integration|e2e|cypress|jest|spec)" >/dev/null; then
-        domain="testing"
-    # Data/Analytics keywords
-    elif echo "$problem_lower" | grep -E "(data|analytics|ml|ai|machine|learning|model|dataset)" >/dev/null; then
-        domain="data"
-    fi
+    # Builtin regex matching, no grep process per domain
+    for domain_entry in "${PROBLEM_DOMAIN_PATTERNS[@]}"; do
+        local pattern="${domain_entry#*:}"
+        if [[ "$problem_lower" =~ $pattern ]]; then
+            domain="${domain_entry%%:*}"
+            break
+        fi
+    done
     
     echo "$domain"
 }
 
+# Content key for the shared context cache (same content in any worktree -> same key):
+# tracked blob hashes, dirty/untracked state and the current manifest contents
+project_context_key() {
+    local project_dir="$1"
+    local manifests=()
+    
+    if ! git -C "$project_dir" rev-parse --is-inside-work-tree >/dev/null 2>&1; then
+        return 1
+    fi
+    
+    for manifest in package.json requirements.txt setup.py pyproject.toml Cargo.toml go.mod pom.xml build.gradle docker-compose.yml; do
+        if [[ -f "$project_dir/$manifest" ]]; then
+            manifests+=("$project_dir/$manifest")
+        fi
+    done
+    
+    {
+        git -C "$project_dir" ls-files -s
+        git -C "$project_dir" status --porcelain
+        if [[ ${#manifests[@]} -gt 0 ]]; then
+            git hash-object -- "${manifests[@]}"
+        fi
+    } | shasum -a 256 | cut -d' ' -f1
+}
+
 # Project context analysis
 analyze_project_context() {
     local project_dir="${1:-$PWD}"
@@ -252,9 +272,24 @@ analyze_project_context() {
     
     # Basic project info
     local project_name=$(basename "$project_dir")
-    local project_type=$(detect_project_type "$project_dir")
-    local tech_stack=$(analyze_tech_stack "$project_dir")
-    local complexity=$(calculate_complexity "$project_dir")
+    local project_type tech_stack complexity
+    
+    # The expensive scans read through the shared content-addressed cache
+    local context_key=$(project_context_key "$project_dir" || true)
+    local context_cache="$(get_cache_dir)/cas/context/$context_key"
+    
+    if [[ -n "$context_key" && -f "$context_cache" ]]; then
+        { read -r project_type; read -r tech_stack; read -r complexity; } < "$context_cache"
+    else
+        project_type=$(detect_project_type "$project_dir")
+        tech_stack=$(analyze_tech_stack "$project_dir")
+        complexity=$(calculate_complexity "$project_dir")
+        
+        if [[ -n "$context_key" ]]; then
+            ensure_directory "$(dirname "$context_cache")"
+            printf '%s\n%s\n%s\n' "$project_type" "$tech_stack" "$complexity" > "$context_cache"
+        fi
+    fi
     
     # Git context
     local git_branch=""
@@ -358,6 +393,6 @@ analyze_feature_needs() {
 }
 
 # Export functions
-export -f detect_project_type analyze_tech_stack calculate_complexity
+export -f project_context_key detect_project_type analyze_tech_stack calculate_complexity
 export -f detect_problem_domain analyze_project_context
 export -f analyze_feature_complexity analyze_feature_needs
\ No newline at end of file
@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+Batcave file profile
+Tells the post-tool hooks what kind of file was just edited, so a 2 MB
+generated JSON or a minified bundle is not pushed through prettier, eslint or
+tsc like a 50-line module. Only the file size and its first bytes are read.
+
+    generated  generator banner (@generated, "Code generated ... DO NOT EDIT.", ...),
+               a lock/bundle name or a build directory inside the repository
+    minified   long lines in a JS/CSS/JSON file (average over the sample)
+    large      bigger than CLAUDE_HOOK_LARGE_FILE_BYTES (default 256K)
+    normal     everything else
+
+Generated and minified files are left alone; large files get the fast,
+single-file checks only and are formatted around the edited region where the
+formatter supports ranges.
+
+Usage:
+    file_profile.py <file> [<file> ...]
+"""
+
+import os
+import re
+import sys
+
+LARGE_FILE_BYTES = int(os.environ.get("CLAUDE_HOOK_LARGE_FILE_BYTES", str(256 * 1024)))
+SAMPLE_BYTES = 64 * 1024
+HEADER_BYTES = 2048
+# Average line length (over the sample) above which a file counts as minified
+MINIFIED_LINE_LENGTH = 300
+
+# Banners generators write; a plain "do not edit" comment is not enough
+GENERATED_MARKERS = (
+    (re.compile(rb"@generated\b"), "@generated"),
+    (re.compile(rb"^\W*Code generated .* DO NOT EDIT\.\s*$", re.MULTILINE), "Code generated ... DO NOT EDIT."),
+    (re.compile(rb"Generated by the protocol buffer compiler\.\s+DO NOT EDIT!"), "protoc"),
+    (re.compile(rb"<auto-generated[\s>]"), "<auto-generated>"),
+)
+
+GENERATED_NAMES = (
+    "package-lock.json", "yarn.lock", "pnpm-lock.yaml", "poetry.lock", "cargo.lock", "gemfile.lock",
+    "composer.lock",
+)
+
+GENERATED_SUFFIXES = (
+    ".min.js", ".min.mjs", ".min.css", ".bundle.js", ".chunk.js", ".map", "_pb2.py", "_pb2_grpc.py",
+    ".pb.go", ".g.dart",
+)
+
+GENERATED_DIRECTORIES = {"node_modules", "dist", "vendor", "__generated__", ".next", ".nuxt"}
+
+# Extensions where one enormous line means a machine wrote the file
+MINIFIABLE_EXTENSIONS = {".js", ".mjs", ".cjs", ".jsx", ".ts", ".tsx", ".json", ".css", ".scss", ".sass", ".svg"}
+
+
+def _repository_path(file_path):
+    """file_path relative to its repository root, or None outside a repository"""
+    file_path = os.path.abspath(file_path)
+    directory = os.path.dirname(file_path)
+    while True:
+        if os.path.exists(os.path.join(directory, ".git")):
+            return os.path.relpath(file_path, directory)
+        parent = os.path.dirname(directory)
+        if parent == directory:
+            return None
+        directory = parent
+
+
+def _by_name(file_path):
+    """Generated-by-name reason, or None"""
+    name = os.path.basename(file_path).lower()
+    if name in GENERATED_NAMES:
+        return f"lock file {name}"
+    for suffix in GENERATED_SUFFIXES:
+        if name.endswith(suffix):
+            return f"{suffix} artifact"
+    # Only directories inside the repository count (a checkout may itself live under vendor/)
+    relative = _repository_path(file_path)
+    parts = set(relative.split(os.sep)[:-1]) if relative else set()
+    directories = sorted(parts & GENERATED_DIRECTORIES)
+    if directories:
+        return f"inside {directories[0]}/"
+    return None
+
+
+def profile_file(file_path):
+    """Return {"kind", "reason", "size"} for a file (kind is normal, large, generated or minified)"""
+    try:
+        size = os.path.getsize(file_path)
+    except OSError:
+        return {"kind": "normal", "reason": "", "size": 0}
+
+    reason = _by_name(file_path)
+    if reason:
+        return {"kind": "generated", "reason": reason, "size": size}
+
+    try:
+        with open(file_path, "rb") as handle:
+            sample = handle.read(SAMPLE_BYTES)
+    except OSError:
+        sample = b""
+
+    header = sample[:HEADER_BYTES]
+    for pattern, label in GENERATED_MARKERS:
+        if pattern.search(header):
+            return {"kind": "generated", "reason": f"'{label}' header", "size": size}
+
+    extension = os.path.splitext(file_path)[1].lower()
+    if extension in MINIFIABLE_EXTENSIONS and len(sample) >= HEADER_BYTES:
+        average = len(sample) / (sample.count(b"\n") + 1)
+        if average > MINIFIED_LINE_LENGTH:
+            return {"kind": "minified", "reason": f"average line {average:.0f} chars", "size": size}
+
+    if size > LARGE_FILE_BYTES:
+        return {"kind": "large", "reason": f"{size // 1024}K", "size": size}
+    return {"kind": "normal", "reason": "", "size": size}
+
+
+def edited_region(file_path, tool_input):
+    """Locate the text an Edit/MultiEdit wrote, as (start_char, end_char, start_line, end_line)
+
+    Returns None for Write (the whole file changed) or when the new text is not
+    found exactly once. Offsets are character offsets (what prettier's --range-* expect);
+    lines are 1-based and inclusive (what black's --line-ranges expect).
+    """
+    edits = tool_input.get("edits") or [tool_input]
+    snippets = [edit.get("new_string") for edit in edits if edit.get("new_string")]
+    if not snippets:
+        return None
+    try:
+        with open(file_path, encoding="utf-8") as handle:
+            content = handle.read()
+    except (OSError, UnicodeDecodeError):
+        return None
+
+    start = end = None
+    for snippet in snippets:
+        position = content.find(snippet)
+        if position < 0 or content.find(snippet, position + 1) >= 0:
+            return None
+        start = position if start is None else min(start, position)
+        end = position + len(snippet) if end is None else max(end, position + len(snippet))
+    start_line = content.count("\n", 0, start) + 1
+    end_line = content.count("\n", 0, end) + 1
+    return start, end, start_line, end_line
+
+
+def main():
+    """Command line entry point for checking how the hooks will treat a file"""
+    args = sys.argv[1:]
+    if not args:
+        print(__doc__.strip(), file=sys.stderr)
+        return 2
+    for path in args:
+        profile = profile_file(path)
+        print(f"{profile['kind']:<10} {profile['size'] // 1024:>6}K  {path}"
+              + (f"  ({profile['reason']})" if profile["reason"] else ""))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
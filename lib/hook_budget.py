@@ -0,0 +1,345 @@
+#!/usr/bin/env python3
+"""
+Batcave hook latency budget
+Decides, per check, whether a post-tool hook runs it inline, hands it to a
+background worker or skips it, so one slow linter can no longer stall the
+agent. Decisions come from the recorded runtime history of each tool on
+similar files (same extension and size bucket) and from two budgets:
+
+    CLAUDE_HOOK_BUDGET_SECONDS        wall time one hook may spend inline (default 10)
+    CLAUDE_HOOK_CHAIN_BUDGET_SECONDS  time all hooks for one edit may spend (default 20)
+
+Background results are picked up and reported by the next hook run for the
+same file, unless the file changed since the check started. A newer edit
+supersedes a check still running for the same file and tool. Hooks import
+this module from ~/.claude/lib; the CLI is used to run background checks and
+to inspect the history.
+
+Usage:
+    hook_budget.py stats
+    hook_budget.py run-background <spec-json>
+    hook_budget.py prune
+"""
+
+import fcntl
+import hashlib
+import json
+import math
+import os
+import signal
+import subprocess
+import sys
+import time
+
+CLAUDE_HOME = os.environ.get("CLAUDE_HOME", os.path.expanduser("~/.claude"))
+BUDGET_DIR = os.path.join(CLAUDE_HOME, "cache", "hook_budget")
+HISTORY_FILE = os.path.join(BUDGET_DIR, "history.json")
+CHAINS_DIR = os.path.join(BUDGET_DIR, "chains")
+BACKGROUND_DIR = os.path.join(BUDGET_DIR, "background")
+
+HOOK_BUDGET_SECONDS = float(os.environ.get("CLAUDE_HOOK_BUDGET_SECONDS", "10"))
+CHAIN_BUDGET_SECONDS = float(os.environ.get("CLAUDE_HOOK_CHAIN_BUDGET_SECONDS", "20"))
+# Hooks for the same file within this window belong to one chain
+CHAIN_WINDOW_SECONDS = 30
+# Checks expected to take longer than this are skipped rather than backgrounded
+BACKGROUND_LIMIT_SECONDS = 300
+# Chain reservation for a tool we have never timed (it runs inline with the remaining budget)
+DEFAULT_ESTIMATE_SECONDS = 2.0
+HISTORY_SAMPLES = 20
+MIN_BUCKET_SAMPLES = 3
+# Chain ledgers and uncollected background results older than this are removed, checked hourly
+STALE_SECONDS = 86400
+PRUNE_INTERVAL_SECONDS = 3600
+PRUNE_STAMP = os.path.join(BUDGET_DIR, "pruned")
+
+
+def _file_key(file_path):
+    return hashlib.sha1(os.path.abspath(file_path).encode()).hexdigest()[:16]
+
+
+def _tool_key(tool_id):
+    return hashlib.sha1(tool_id.encode()).hexdigest()[:12]
+
+
+def content_hash(file_path):
+    """Hash of the file's current content; None if it cannot be read"""
+    try:
+        with open(file_path, "rb") as handle:
+            return hashlib.sha1(handle.read()).hexdigest()
+    except OSError:
+        return None
+
+
+def size_bucket(file_path):
+    """Similar files share an extension and a power-of-two size bucket"""
+    try:
+        size = os.path.getsize(file_path)
+    except OSError:
+        size = 0
+    extension = os.path.splitext(file_path)[1].lower()
+    return f"{extension}:{int(math.log2(size // 1024 + 1))}"
+
+
+class _Locked:
+    """Exclusive flock on <path>.lock around a read-modify-write of a JSON file"""
+
+    def __init__(self, path):
+        self.path = path
+
+    def __enter__(self):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        self.lock = open(f"{self.path}.lock", "a")
+        fcntl.flock(self.lock, fcntl.LOCK_EX)
+        try:
+            with open(self.path) as handle:
+                self.data = json.load(handle)
+        except (OSError, ValueError):
+            self.data = {}
+        return self.data
+
+    def __exit__(self, exc_type, exc, tb):
+        try:
+            if exc_type is None:
+                temp_path = f"{self.path}.{os.getpid()}.tmp"
+                with open(temp_path, "w") as handle:
+                    json.dump(self.data, handle)
+                os.replace(temp_path, self.path)
+        finally:
+            self.lock.close()
+        return False
+
+
+def record_runtime(tool_id, bucket, seconds, timed_out=False):
+    """Add a runtime sample; timeouts are stored as lower bounds"""
+    try:
+        with _Locked(HISTORY_FILE) as history:
+            for key in (tool_id, f"{tool_id}|{bucket}"):
+                entry = history.setdefault(key, {"samples": [], "timeouts": 0})
+                entry["samples"] = (entry["samples"] + [round(seconds, 3)])[-HISTORY_SAMPLES:]
+                entry["timeouts"] = entry["timeouts"] + 1 if timed_out else 0
+    except OSError:
+        pass
+
+
+def estimate_runtime(history, tool_id, bucket):
+    """p90 of recent runtimes on similar files (falling back to all files); None if never timed"""
+    entry = history.get(f"{tool_id}|{bucket}")
+    if not entry or len(entry["samples"]) < MIN_BUCKET_SAMPLES:
+        entry = history.get(tool_id)
+    if not entry or not entry["samples"]:
+        return None
+    samples = sorted(entry["samples"])
+    estimate = samples[min(int(0.9 * len(samples)), len(samples) - 1)]
+    # A tool that keeps hitting its timeout is slower than any sample shows
+    return estimate * (2 ** entry.get("timeouts", 0))
+
+
+class Budget:
+    """Latency budget for one hook run over one file"""
+
+    def __init__(self, hook_name, file_path):
+        self.hook_name = hook_name
+        self.file_path = file_path
+        self.bucket = size_bucket(file_path)
+        self.started = time.time()
+        self.degraded = []
+        self.chain_file = os.path.join(CHAINS_DIR, f"{_file_key(file_path)}.json")
+        try:
+            with open(HISTORY_FILE) as handle:
+                self.history = json.load(handle)
+        except (OSError, ValueError):
+            self.history = {}
+        try:
+            if time.time() - os.path.getmtime(PRUNE_STAMP) > PRUNE_INTERVAL_SECONDS:
+                prune()
+        except OSError:
+            prune()
+
+    def _chain_add(self, seconds):
+        """Add (or with a negative value, give back) seconds to the chain ledger; returns total spent"""
+        try:
+            with _Locked(self.chain_file) as chain:
+                now = time.time()
+                if now - chain.get("updated", 0) > CHAIN_WINDOW_SECONDS:
+                    chain["spent"] = 0.0
+                chain["spent"] = max(chain.get("spent", 0.0) + seconds, 0.0)
+                chain["updated"] = now
+                return chain["spent"]
+        except OSError:
+            return 0.0
+
+    def remaining(self):
+        """Seconds left under both the hook and the chain budget"""
+        hook_left = HOOK_BUDGET_SECONDS - (time.time() - self.started)
+        chain_left = CHAIN_BUDGET_SECONDS - self._chain_add(0)
+        return max(min(hook_left, chain_left), 0.0)
+
+    def plan(self, tool_id, description, allow_background=True):
+        """Return ("inline", timeout), ("background", None) or ("skip", None)"""
+        estimate = estimate_runtime(self.history, tool_id, self.bucket)
+        remaining = self.remaining()
+
+        if estimate is None and remaining > 0:
+            # Never timed: run it inline, bounded by what is left, to learn its cost
+            self._chain_add(DEFAULT_ESTIMATE_SECONDS)
+            return "inline", remaining
+        if estimate is not None and estimate <= remaining:
+            self._chain_add(estimate)  # reserve, so parallel hooks see it
+            return "inline", remaining
+        if estimate is None:
+            estimate = DEFAULT_ESTIMATE_SECONDS
+        if allow_background and estimate <= BACKGROUND_LIMIT_SECONDS:
+            self.degraded.append(f"{description} moved to background (~{estimate:.0f}s, {remaining:.0f}s left)")
+            return "background", None
+        self.degraded.append(f"{description} skipped (~{estimate:.0f}s, {remaining:.0f}s left)")
+        return "skip", None
+
+    def record(self, tool_id, description, seconds, timed_out=False):
+        """Record an inline run and settle its chain reservation"""
+        estimate = estimate_runtime(self.history, tool_id, self.bucket)
+        self._chain_add(seconds - (DEFAULT_ESTIMATE_SECONDS if estimate is None else estimate))
+        record_runtime(tool_id, self.bucket, seconds, timed_out)
+        if timed_out:
+            self.degraded.append(f"{description} hit the {seconds:.0f}s budget")
+
+    def background(self, tool_id, description, cmd):
+        """Run a check detached, superseding one still running for this file and tool
+
+        Its result is reported by a later hook run.
+        """
+        spec = {"tool_id": tool_id, "description": description, "cmd": cmd,
+                "file_path": self.file_path, "bucket": self.bucket, "blob": content_hash(self.file_path)}
+        run_file = os.path.join(BACKGROUND_DIR, _file_key(self.file_path), f"{_tool_key(tool_id)}.run")
+        try:
+            with _Locked(run_file) as run:
+                if run.get("pid"):
+                    try:
+                        os.killpg(run["pid"], signal.SIGTERM)  # the worker leads its own session
+                    except OSError:
+                        pass
+                process = subprocess.Popen(
+                    [sys.executable, os.path.abspath(__file__), "run-background", json.dumps(spec)],
+                    stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+                    start_new_session=True)
+                run["pid"] = process.pid
+        except OSError:
+            self.degraded[-1] = f"{description} skipped (background start failed)"
+
+    def collect_background(self):
+        """Completed background results for this file's current content (each returned once)"""
+        directory = os.path.join(BACKGROUND_DIR, _file_key(self.file_path))
+        results = []
+        try:
+            names = sorted(os.listdir(directory))
+        except OSError:
+            return results
+        blob = content_hash(self.file_path)
+        for name in names:
+            if not name.endswith(".json"):
+                continue
+            path = os.path.join(directory, name)
+            try:
+                with open(path) as handle:
+                    result = json.load(handle)
+                os.unlink(path)
+            except (OSError, ValueError):
+                continue
+            # Checked an older version of the file; its findings may no longer apply
+            if result.get("blob") == blob:
+                results.append(result)
+        return results
+
+    def summary(self):
+        """One line describing degraded checks, or an empty string"""
+        if not self.degraded:
+            return ""
+        return "⏱️ Degraded checks: " + "; ".join(self.degraded)
+
+
+def run_background(spec):
+    """Worker entry: run one check with a generous timeout and store its result"""
+    started = time.time()
+    timed_out = False
+    try:
+        completed = subprocess.run(spec["cmd"], capture_output=True, text=True, timeout=BACKGROUND_LIMIT_SECONDS)
+        result = {"success": completed.returncode == 0, "stdout": completed.stdout.strip(),
+                  "stderr": completed.stderr.strip(), "returncode": completed.returncode}
+    except subprocess.TimeoutExpired:
+        timed_out = True
+        result = {"success": False, "stdout": "", "returncode": -1,
+                  "stderr": f"{spec['description']} timed out after {BACKGROUND_LIMIT_SECONDS} seconds"}
+    except OSError as e:
+        result = {"success": False, "stdout": "", "stderr": str(e), "returncode": -1}
+
+    elapsed = time.time() - started
+    record_runtime(spec["tool_id"], spec["bucket"], elapsed, timed_out)
+    result.update({"tool": spec["description"], "background_seconds": round(elapsed, 1), "blob": spec["blob"]})
+
+    directory = os.path.join(BACKGROUND_DIR, _file_key(spec["file_path"]))
+    path = os.path.join(directory, f"{_tool_key(spec['tool_id'])}.json")
+    with _Locked(os.path.join(directory, f"{_tool_key(spec['tool_id'])}.run")) as run:
+        # A newer edit started another run; that one reports
+        if run.get("pid") != os.getpid():
+            return
+        run.clear()
+        with open(f"{path}.tmp", "w") as handle:
+            json.dump(result, handle)
+        os.replace(f"{path}.tmp", path)
+
+
+def prune(max_age=STALE_SECONDS):
+    """Remove chain ledgers and uncollected background results not touched for max_age seconds"""
+    cutoff = time.time() - max_age
+    removed = 0
+    for root in (CHAINS_DIR, BACKGROUND_DIR):
+        for directory, _, files in os.walk(root, topdown=False):
+            for file_name in files:
+                path = os.path.join(directory, file_name)
+                # Lock files are never written, so they age with the file they guard
+                data_path = path[:-len(".lock")] if path.endswith(".lock") else path
+                try:
+                    if os.path.getmtime(data_path if os.path.exists(data_path) else path) < cutoff:
+                        os.unlink(path)
+                        removed += 1
+                except OSError:
+                    pass
+            if directory != root:
+                try:
+                    os.rmdir(directory)
+                except OSError:
+                    pass
+    try:
+        os.makedirs(BUDGET_DIR, exist_ok=True)
+        with open(PRUNE_STAMP, "w"):
+            pass
+    except OSError:
+        pass
+    return removed
+
+
+def main():
+    """Command line entry point"""
+    args = sys.argv[1:]
+    command = args[0] if args else "stats"
+
+    if command == "run-background" and len(args) == 2:
+        run_background(json.loads(args[1]))
+    elif command == "prune":
+        print(f"removed {prune()} entries")
+    elif command == "stats":
+        try:
+            with open(HISTORY_FILE) as handle:
+                history = json.load(handle)
+        except (OSError, ValueError):
+            history = {}
+        for key in sorted(k for k in history if "|" not in k):
+            samples = history[key]["samples"]
+            print(f"{key}: p90 {estimate_runtime(history, key, '') or 0:.2f}s over {len(samples)} runs")
+    else:
+        print(__doc__.strip(), file=sys.stderr)
+        return 2
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,279 @@
+#!/usr/bin/env python3
+"""
+Batcave hook profiler
+Opt-in profiling of real hook invocations. With CLAUDE_HOOK_PROFILE=1 in
+settings.json `env`, the dispatcher runs each hook event under cProfile and
+traces every subprocess it spawns (command, start offset, duration, exit
+code), including the async stages it forks off. Stage errors that are
+otherwise folded into "allow" messages are recorded too.
+
+Each invocation writes <timestamp>-<pid>-<event>.prof (pstats) and a .json
+sidecar to $CLAUDE_HOME/cache/hook_profiles/. Only the newest
+CLAUDE_HOOK_PROFILE_KEEP invocations (default 200) are kept.
+
+`collapse` merges the profiles into collapsed-stack lines ("frame;frame N",
+N in microseconds) for flamegraph.pl, speedscope or inferno.
+
+Usage:
+    hook_profile.py list [--last N]
+    hook_profile.py collapse [--last N] [--event EVENT] [-o FILE]
+    hook_profile.py spawns [--last N] [--event EVENT]
+    hook_profile.py clear
+"""
+
+import cProfile
+import json
+import os
+import pstats
+import subprocess
+import sys
+import time
+
+CLAUDE_HOME = os.environ.get("CLAUDE_HOME", os.path.expanduser("~/.claude"))
+PROFILE_DIR = os.path.join(CLAUDE_HOME, "cache", "hook_profiles")
+KEEP = int(os.environ.get("CLAUDE_HOOK_PROFILE_KEEP", "200"))
+# Deeper stacks are cut off in collapsed output (recursive call graphs never end)
+MAX_DEPTH = 64
+
+# Details of the invocation being profiled; the dispatcher adds the tool name and stage errors
+context = {}
+_spawns = []
+# Profiler of the run() in progress in this process (or inherited from the parent across fork)
+_active = None
+
+
+class TracedPopen(subprocess.Popen):
+    """subprocess.Popen that records the command and how long the child ran"""
+
+    def __init__(self, args, *popen_args, **popen_kwargs):
+        self._trace = {
+            "argv": [str(arg)[:200] for arg in args][:12] if isinstance(args, (list, tuple)) else str(args)[:200],
+            "offset_ms": round((time.time() - context.get("started", time.time())) * 1000, 2),
+            "duration_ms": None,
+            "returncode": None,
+        }
+        self._spawned = time.perf_counter()
+        _spawns.append(self._trace)
+        try:
+            super().__init__(args, *popen_args, **popen_kwargs)
+        except OSError as e:
+            self._trace["error"] = str(e)
+            raise
+
+    def _traced_exit(self):
+        if self.returncode is not None and self._trace["duration_ms"] is None:
+            self._trace["duration_ms"] = round((time.perf_counter() - self._spawned) * 1000, 2)
+            self._trace["returncode"] = self.returncode
+
+    def wait(self, timeout=None):
+        try:
+            return super().wait(timeout)
+        finally:
+            self._traced_exit()
+
+    def poll(self):
+        try:
+            return super().poll()
+        finally:
+            self._traced_exit()
+
+
+def run(name, function, *args):
+    """Call function(*args) under cProfile with subprocess tracing and save the profile
+
+    function is always called exactly once: when the profiler cannot start
+    (another profiling tool is active) it runs unprofiled and only the
+    subprocess trace is kept.
+    """
+    global _spawns, _active
+    outer_context, outer_spawns = dict(context), _spawns
+    context.clear()
+    context.update(name=name, started=time.time(), argv=sys.argv[1:])
+    _spawns = []
+    original_popen = subprocess.Popen
+    subprocess.Popen = TracedPopen
+
+    # A forked child inherits the parent's running profiler; Python 3.12+ allows only one at a time
+    outer = _active
+    if outer is not None:
+        outer.disable()
+    profiler = cProfile.Profile()
+    try:
+        profiler.enable()
+        _active = profiler
+    except ValueError as e:
+        context["profile_error"] = str(e)
+        profiler = None
+
+    started = time.perf_counter()
+    result = error = None
+    try:
+        result = function(*args)
+        return result
+    except BaseException as e:
+        error = e
+        raise
+    finally:
+        wall_ms = (time.perf_counter() - started) * 1000
+        if profiler is not None:
+            profiler.disable()
+        subprocess.Popen = original_popen
+        record = dict(context, wall_ms=round(wall_ms, 2), spawns=_spawns, exit=result)
+        if error is not None:
+            record["error"] = f"{type(error).__name__}: {error}"
+        save(profiler, record)
+
+        context.clear()
+        context.update(outer_context)
+        _spawns, _active = outer_spawns, outer
+        if outer is not None:
+            outer.enable()
+
+
+def save(profiler, record):
+    """Write one invocation's pstats and sidecar, then drop the oldest beyond KEEP"""
+    try:
+        os.makedirs(PROFILE_DIR, exist_ok=True)
+        stamp = time.strftime("%Y%m%d-%H%M%S", time.localtime(record["started"]))
+        base = os.path.join(PROFILE_DIR, f"{stamp}-{os.getpid()}-{record['name']}")
+        if profiler is not None:
+            profiler.dump_stats(f"{base}.prof")
+        temp_path = f"{base}.{os.getpid()}.tmp"
+        with open(temp_path, "w") as handle:
+            json.dump(record, handle, default=str)
+        os.replace(temp_path, f"{base}.json")
+        stale = invocations()[:-KEEP] if KEEP > 0 else []
+        for old in stale:
+            for suffix in (".prof", ".json"):
+                try:
+                    os.remove(old + suffix)
+                except OSError:
+                    pass
+    except OSError:
+        pass
+
+
+def invocations():
+    """Saved invocations, oldest first, as paths without extension"""
+    try:
+        names = os.listdir(PROFILE_DIR)
+    except OSError:
+        return []
+    return sorted(os.path.join(PROFILE_DIR, name[:-5]) for name in names if name.endswith(".json"))
+
+
+def load_record(base):
+    try:
+        with open(f"{base}.json") as handle:
+            return json.load(handle)
+    except (OSError, ValueError):
+        return None
+
+
+def frame_label(func):
+    """Flame-graph frame for a pstats function key (';' separates frames, so it is replaced)"""
+    file_name, line, name = func
+    label = name if file_name == "~" else f"{name} ({os.path.basename(file_name)}:{line})"
+    return label.replace(";", ",")
+
+
+def collapse_stats(stats, root, totals):
+    """Add one profile's stacks to totals ({stack: seconds})
+
+    cProfile keeps caller/callee edges, not whole stacks, so each function's
+    time is split over its call paths in proportion to the edge times.
+    """
+    callees = {}
+    for func, (_, _, _, _, callers) in stats.items():
+        for caller, edge in callers.items():
+            callees.setdefault(caller, []).append((func, edge[3]))
+
+    def walk(func, seconds, stack):
+        _, _, self_time, cumulative, _ = stats[func]
+        stack.append(frame_label(func))
+        scale = seconds / cumulative if cumulative else 0
+        own = self_time * scale
+        for callee, edge_time in callees.get(func, []):
+            if frame_label(callee) in stack:
+                continue  # recursive calls are already inside the outer call's times
+            if len(stack) >= MAX_DEPTH:
+                own += edge_time * scale
+            elif edge_time * scale > 1e-6:
+                walk(callee, edge_time * scale, stack)
+        key = ";".join(stack)
+        totals[key] = totals.get(key, 0) + own
+        stack.pop()
+
+    for func, (_, _, _, cumulative, callers) in stats.items():
+        if not callers:
+            walk(func, cumulative, [root])
+
+
+def select(args):
+    """Invocations matching --last/--event"""
+    bases = invocations()
+    if "--event" in args:
+        event = args[args.index("--event") + 1]
+        bases = [base for base in bases if (load_record(base) or {}).get("name", "").split("-")[0] == event]
+    if "--last" in args:
+        bases = bases[-int(args[args.index("--last") + 1]):]
+    return bases
+
+
+def main():
+    """Command line entry point"""
+    args = sys.argv[1:]
+    command = args[0] if args else "list"
+
+    if command == "list":
+        for base in select(args):
+            record = load_record(base)
+            if record:
+                durations = [spawn["duration_ms"] or 0 for spawn in record.get("spawns", [])]
+                errors = f", {len(record['errors'])} errors" if record.get("errors") else ""
+                print(f"{os.path.basename(base)}: {record.get('tool') or '-'} {record['wall_ms']:.1f}ms, "
+                      f"{len(durations)} spawns ({sum(durations):.1f}ms){errors}")
+    elif command == "collapse":
+        totals = {}
+        for base in select(args):
+            record = load_record(base)
+            try:
+                stats = pstats.Stats(f"{base}.prof").stats
+            except (OSError, ValueError, EOFError, TypeError):
+                continue
+            collapse_stats(stats, (record or {}).get("name", "hook"), totals)
+        lines = [f"{stack} {round(seconds * 1e6)}" for stack, seconds in sorted(totals.items())
+                 if round(seconds * 1e6) > 0]
+        if "-o" in args:
+            with open(args[args.index("-o") + 1], "w") as handle:
+                handle.write("\n".join(lines) + "\n")
+        else:
+            print("\n".join(lines))
+    elif command == "spawns":
+        by_command = {}
+        for base in select(args):
+            for spawn in (load_record(base) or {}).get("spawns", []):
+                argv = spawn["argv"]
+                program = os.path.basename(argv[0] if isinstance(argv, list) and argv else str(argv).split(" ")[0])
+                by_command.setdefault(program, []).append(spawn["duration_ms"])
+        for program, durations in sorted(by_command.items(), key=lambda item: -sum(d or 0 for d in item[1])):
+            finished = [d for d in durations if d is not None]
+            detached = len(durations) - len(finished)
+            print(f"{program}: {len(durations)} spawns, total {sum(finished):.1f}ms, "
+                  f"max {max(finished, default=0):.1f}ms" + (f", {detached} not waited for" if detached else ""))
+    elif command == "clear":
+        for base in invocations():
+            for suffix in (".prof", ".json"):
+                try:
+                    os.remove(base + suffix)
+                except OSError:
+                    pass
+        print("cleared")
+    else:
+        print(__doc__.strip(), file=sys.stderr)
+        return 2
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,202 @@
+#!/usr/bin/env node
+/*
+ * Batcave JS worker
+ * Long-lived ESLint/Prettier process for one project, so the post-tool hooks
+ * stop paying Node startup plus plugin and config loading on every edit.
+ * ESLint and Prettier are loaded from the project's own node_modules and keep
+ * their resolved configs between requests; both are rebuilt when the client
+ * reports a different config fingerprint. Started on demand by js_worker.py
+ * and stopped after CLAUDE_JS_WORKER_IDLE_SECONDS (default 1800) idle.
+ *
+ * Protocol: one JSON request line per connection on a Unix socket, one JSON
+ * response line back.
+ *   {"op": "lint",   "file": <path>, "config": <fingerprint>}
+ *   {"op": "check",  "file": <path>, "config": <fingerprint>}
+ *   {"op": "format", "file": <path>, "config": <fingerprint>, "range": [start, end]}
+ *   {"op": "shutdown"}
+ * Responses carry success/stdout/stderr/returncode like the CLI would, plus
+ * "output" for format, or {"unavailable": true} when the project lacks the tool.
+ *
+ * Usage:
+ *   node js_worker.js <project-root> <socket-path>
+ */
+
+'use strict';
+
+const fs = require('fs');
+const net = require('net');
+const path = require('path');
+const { createRequire } = require('module');
+
+const [projectRoot, socketPath] = process.argv.slice(2);
+const IDLE_MS = Number(process.env.CLAUDE_JS_WORKER_IDLE_SECONDS || 1800) * 1000;
+
+if (!projectRoot || !socketPath) {
+  console.error('usage: node js_worker.js <project-root> <socket-path>');
+  process.exit(2);
+}
+
+const projectRequire = createRequire(path.join(projectRoot, 'package.json'));
+
+// Tools come from the project, never from this worker's own location
+function loadProjectModule(name) {
+  try {
+    return projectRequire(name);
+  } catch (error) {
+    return null;
+  }
+}
+
+const eslintModule = loadProjectModule('eslint');
+const prettierModule = loadProjectModule('prettier');
+const prettier = prettierModule && (prettierModule.default || prettierModule);
+
+let configKey = null;
+let eslint = null;
+
+// Drop cached instances and configs when the project's tool config changed
+function refresh(config) {
+  if (config === configKey) {
+    return;
+  }
+  configKey = config;
+  eslint = null;
+  if (prettier && prettier.clearConfigCache) {
+    prettier.clearConfigCache();
+  }
+}
+
+async function getESLint() {
+  if (!eslint) {
+    // loadESLint (8.57+) picks flat or legacy config the way the CLI does
+    const ESLint = eslintModule.loadESLint
+      ? await eslintModule.loadESLint({ cwd: projectRoot })
+      : eslintModule.ESLint;
+    eslint = new ESLint({ cwd: projectRoot });
+  }
+  return eslint;
+}
+
+async function lint(request) {
+  if (!eslintModule || !(eslintModule.ESLint || eslintModule.loadESLint)) {
+    return { unavailable: true };
+  }
+  const results = await (await getESLint()).lintFiles([request.file]);
+  const errors = results.reduce((sum, result) => sum + result.errorCount, 0);
+  return {
+    success: errors === 0,
+    stdout: JSON.stringify(results),
+    stderr: '',
+    returncode: errors === 0 ? 0 : 1,
+  };
+}
+
+async function prettierOptions(file) {
+  const info = await prettier.getFileInfo(file, {
+    ignorePath: path.join(projectRoot, '.prettierignore'),
+  });
+  if (info.ignored || !info.inferredParser) {
+    return null;
+  }
+  const config = (await prettier.resolveConfig(file, { editorconfig: true })) || {};
+  return { ...config, filepath: file };
+}
+
+async function check(request) {
+  if (!prettier) {
+    return { unavailable: true };
+  }
+  const options = await prettierOptions(request.file);
+  const text = fs.readFileSync(request.file, 'utf8');
+  const formatted = options === null || (await prettier.check(text, options));
+  return {
+    success: formatted,
+    stdout: '',
+    stderr: formatted
+      ? ''
+      : `[warn] ${request.file}\n[warn] Code style issues found in the above file. Run Prettier with --write to fix.`,
+    returncode: formatted ? 0 : 1,
+  };
+}
+
+async function format(request) {
+  if (!prettier) {
+    return { unavailable: true };
+  }
+  const options = await prettierOptions(request.file);
+  const text = fs.readFileSync(request.file, 'utf8');
+  if (options === null) {
+    return { success: true, stdout: '', stderr: '', returncode: 0, output: text };
+  }
+  if (request.range) {
+    [options.rangeStart, options.rangeEnd] = request.range;
+  }
+  return { success: true, stdout: '', stderr: '', returncode: 0, output: await prettier.format(text, options) };
+}
+
+async function shutdown() {
+  return { success: true, shutdown: true };
+}
+
+const OPERATIONS = { lint, check, format, shutdown };
+
+async function handle(line) {
+  let request;
+  try {
+    request = JSON.parse(line);
+  } catch (error) {
+    return { success: false, stdout: '', stderr: `invalid request: ${error.message}`, returncode: -1 };
+  }
+  const operation = OPERATIONS[request.op];
+  if (!operation) {
+    return { success: false, stdout: '', stderr: `unknown op: ${request.op}`, returncode: -1 };
+  }
+  refresh(request.config);
+  try {
+    return await operation(request);
+  } catch (error) {
+    // Syntax errors and config errors are results, exactly as the CLI reports them
+    return { success: false, stdout: '', stderr: String(error.message || error), returncode: 2 };
+  }
+}
+
+let idleTimer = null;
+
+function resetIdleTimer(server) {
+  clearTimeout(idleTimer);
+  idleTimer = setTimeout(() => server.close(), IDLE_MS);
+}
+
+const server = net.createServer((connection) => {
+  let buffer = '';
+  connection.setEncoding('utf8');
+  connection.on('data', (chunk) => {
+    buffer += chunk;
+    const newline = buffer.indexOf('\n');
+    if (newline < 0) {
+      return;
+    }
+    resetIdleTimer(server);
+    handle(buffer.slice(0, newline)).then((response) => {
+      connection.end(`${JSON.stringify(response)}\n`, () => response.shutdown && server.close());
+    });
+  });
+  connection.on('error', () => {});
+});
+
+server.on('close', () => process.exit(0));
+
+// The client only starts a worker after failing to connect, so a leftover socket is stale
+fs.rmSync(socketPath, { force: true });
+server.listen(socketPath, () => resetIdleTimer(server));
+
+for (const signal of ['SIGTERM', 'SIGINT']) {
+  process.on(signal, () => server.close());
+}
+process.on('exit', () => {
+  try {
+    fs.unlinkSync(socketPath);
+  } catch (error) {
+    // already gone
+  }
+});
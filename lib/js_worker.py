@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+Batcave JS worker client
+Talks to the warm ESLint/Prettier worker (js_worker.js) of a file's project
+over a Unix socket, starting the worker on first use. Every failure (no node,
+no project, tool not installed in the project, worker crash or timeout)
+returns None so the hooks fall back to the CLI.
+
+Sockets live in $CLAUDE_HOME/cache/js_worker/<hash>.sock, one per project
+root (the nearest directory with a package.json).
+
+Usage:
+    js_worker.py lint|check|format <file>
+    js_worker.py status
+    js_worker.py stop
+"""
+
+import fcntl
+import hashlib
+import json
+import os
+import shutil
+import socket
+import subprocess
+import sys
+import time
+
+CLAUDE_HOME = os.environ.get("CLAUDE_HOME", os.path.expanduser("~/.claude"))
+WORKER_DIR = os.path.join(CLAUDE_HOME, "cache", "js_worker")
+WORKER_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "js_worker.js")
+# Loading ESLint plugins on a cold start can take a few seconds
+STARTUP_SECONDS = 10
+
+try:
+    import shared_cache
+except ImportError:
+    shared_cache = None
+
+
+def project_root(file_path):
+    """Nearest directory with a package.json, stopping at the repository root"""
+    directory = os.path.dirname(os.path.abspath(file_path))
+    while True:
+        if os.path.isfile(os.path.join(directory, "package.json")):
+            return directory
+        parent = os.path.dirname(directory)
+        if os.path.exists(os.path.join(directory, ".git")) or parent == directory:
+            return None
+        directory = parent
+
+
+def socket_path(root):
+    """Short socket name (Unix socket paths are limited to ~100 bytes)"""
+    return os.path.join(WORKER_DIR, hashlib.sha1(root.encode()).hexdigest()[:12] + ".sock")
+
+
+def _send(path, payload, timeout):
+    """One request/response round trip"""
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as connection:
+        connection.settimeout(timeout)
+        connection.connect(path)
+        connection.sendall(json.dumps(payload).encode() + b"\n")
+        chunks = []
+        while True:
+            chunk = connection.recv(65536)
+            if not chunk:
+                break
+            chunks.append(chunk)
+    return json.loads(b"".join(chunks))
+
+
+def _connectable(path):
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as connection:
+            connection.connect(path)
+        return True
+    except OSError:
+        return False
+
+
+def start_worker(root):
+    """Start the worker for a project (once, even when hooks race) and wait for its socket"""
+    path = socket_path(root)
+    os.makedirs(WORKER_DIR, exist_ok=True)
+    with open(f"{path}.lock", "a") as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        if _connectable(path):
+            return True
+        with open(f"{path}.log", "a") as log:
+            subprocess.Popen(["node", WORKER_SCRIPT, root, path], cwd=root, stdin=subprocess.DEVNULL,
+                             stdout=log, stderr=log, start_new_session=True)
+        deadline = time.time() + STARTUP_SECONDS
+        while time.time() < deadline:
+            if _connectable(path):
+                return True
+            time.sleep(0.02)
+    return False
+
+
+def request(op, file_path, timeout=30, **params):
+    """Run lint/check/format for a file in its project's worker; None means use the CLI"""
+    file_path = os.path.abspath(file_path)
+    root = project_root(file_path)
+    if root is None or not os.path.exists(WORKER_SCRIPT) or not shutil.which("node"):
+        return None
+
+    payload = dict(params, op=op, file=file_path)
+    if "config" not in payload or payload["config"] is None:
+        payload["config"] = shared_cache.config_fingerprint(file_path) if shared_cache else None
+
+    path = socket_path(root)
+    try:
+        try:
+            response = _send(path, payload, timeout)
+        except (FileNotFoundError, ConnectionRefusedError):
+            if not start_worker(root):
+                return None
+            response = _send(path, payload, timeout)
+    except (OSError, ValueError):
+        return None
+    if response.get("unavailable"):
+        return None
+    return response
+
+
+def workers():
+    """Socket paths of the workers that are up"""
+    try:
+        names = sorted(os.listdir(WORKER_DIR))
+    except OSError:
+        return []
+    return [os.path.join(WORKER_DIR, name) for name in names
+            if name.endswith(".sock") and _connectable(os.path.join(WORKER_DIR, name))]
+
+
+def main():
+    """Command line entry point"""
+    args = sys.argv[1:]
+    command = args[0] if args else "status"
+
+    if command in ("lint", "check", "format") and len(args) == 2:
+        response = request(command, args[1])
+        if response is None:
+            print(f"{args[1]}: no worker available (hooks use the CLI)", file=sys.stderr)
+            return 1
+        print(json.dumps(response, indent=2))
+        return response.get("returncode", 0)
+    elif command == "status":
+        for path in workers():
+            print(path)
+    elif command == "stop":
+        for path in workers():
+            try:
+                _send(path, {"op": "shutdown"}, timeout=5)
+                print(f"stopped {path}")
+            except (OSError, ValueError):
+                continue
+    else:
+        print(__doc__.strip(), file=sys.stderr)
+        return 2
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+"""
+Batcave JSON state tool
+Reads and writes many keys of a JSON state file in one process, so shell
+callers stop paying one jq fork and one full rewrite per key. Writes take an
+exclusive lock on <file>.lock and replace the file atomically.
+
+Keys are dotted paths (metrics.start_time). Assignments are key=value for
+strings and key:=<json> for numbers, booleans, arrays and objects.
+
+Usage:
+    json_state.py get <file> <key> [<key> ...]     # one line per key
+    json_state.py record <file> [<key>]            # whole record (or subtree) as JSON
+    json_state.py set <file> <assignment> [...]
+    json_state.py incr <file> <key>[=<n>] [...]
+    json_state.py append <file> <assignment> [...]
+    json_state.py merge <file> [<json>|-]          # deep merge an object
+    json_state.py batch <file> < ops               # "set|incr|append|merge <arg>" per line
+"""
+
+import fcntl
+import json
+import os
+import sys
+
+
+class StateError(Exception):
+    """Raised for malformed keys, assignments or operations"""
+
+
+def split_key(key):
+    """Split a dotted key into path parts"""
+    parts = [part for part in key.lstrip(".").split(".") if part]
+    if not parts:
+        raise StateError(f"invalid key: {key!r}")
+    return parts
+
+
+def lookup(record, key):
+    """Return the value at a dotted key, or None when any part is missing"""
+    value = record
+    for part in split_key(key):
+        if not isinstance(value, dict) or part not in value:
+            return None
+        value = value[part]
+    return value
+
+
+def parent_of(record, key):
+    """Return (container, last_part) for a dotted key, creating objects on the way"""
+    parts = split_key(key)
+    node = record
+    for part in parts[:-1]:
+        if not isinstance(node.get(part), dict):
+            node[part] = {}
+        node = node[part]
+    return node, parts[-1]
+
+
+def parse_assignment(assignment):
+    """Parse key=value (string) or key:=json (typed) into (key, value)"""
+    separator = assignment.find("=")
+    if separator > 0 and assignment[separator - 1] == ":":
+        key, raw = assignment[:separator - 1], assignment[separator + 1:]
+        try:
+            return key, json.loads(raw)
+        except ValueError:
+            raise StateError(f"invalid JSON for {key}: {raw!r}")
+    if separator <= 0:
+        raise StateError(f"invalid assignment: {assignment!r}")
+    return assignment[:separator], assignment[separator + 1:]
+
+
+def deep_merge(target, patch):
+    """Merge patch into target, recursing into nested objects"""
+    for key, value in patch.items():
+        if isinstance(value, dict) and isinstance(target.get(key), dict):
+            deep_merge(target[key], value)
+        else:
+            target[key] = value
+    return target
+
+
+def format_value(value):
+    """Render a value the way `jq -r '... // empty'` would, on a single line"""
+    if value is None:
+        return ""
+    if isinstance(value, str):
+        return value.replace("\n", "\\n")
+    return json.dumps(value, separators=(",", ":"))
+
+
+def load(path):
+    """Load a JSON object from disk (missing or empty files are {})"""
+    try:
+        with open(path) as handle:
+            content = handle.read()
+    except FileNotFoundError:
+        return {}
+    record = json.loads(content) if content.strip() else {}
+    if not isinstance(record, dict):
+        raise StateError(f"{path} does not hold a JSON object")
+    return record
+
+
+def apply_op(record, op, arg):
+    """Apply a single write operation to the in-memory record"""
+    if op == "set":
+        key, value = parse_assignment(arg)
+        node, last = parent_of(record, key)
+        node[last] = value
+    elif op == "incr":
+        key, _, step = arg.partition("=")
+        node, last = parent_of(record, key)
+        current = node.get(last) or 0
+        try:
+            node[last] = int(current) + int(step or 1)
+        except ValueError:
+            raise StateError(f"{key} is not a number: {current!r}")
+    elif op == "append":
+        key, value = parse_assignment(arg)
+        node, last = parent_of(record, key)
+        items = node.get(last)
+        node[last] = (items if isinstance(items, list) else []) + [value]
+    elif op == "merge":
+        patch = json.loads(arg)
+        if not isinstance(patch, dict):
+            raise StateError("merge expects a JSON object")
+        deep_merge(record, patch)
+    else:
+        raise StateError(f"unknown operation: {op}")
+
+
+def update(path, ops):
+    """Apply (op, arg) pairs to a state file under its lock, then replace it atomically"""
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+
+    with open(f"{path}.lock", "a") as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        record = load(path)
+        for op, arg in ops:
+            apply_op(record, op, arg)
+
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        try:
+            with open(temp_path, "w") as handle:
+                json.dump(record, handle, indent=2)
+                handle.write("\n")
+            os.replace(temp_path, path)
+        finally:
+            if os.path.exists(temp_path):
+                os.unlink(temp_path)
+    return record
+
+
+def read_batch(stream):
+    """Parse "op arg" lines from a batch stream"""
+    ops = []
+    for line in stream:
+        line = line.rstrip("\n")
+        if not line.strip() or line.lstrip().startswith("#"):
+            continue
+        op, _, arg = line.strip().partition(" ")
+        ops.append((op, arg))
+    return ops
+
+
+def main():
+    """Command line entry point used by utils.sh"""
+    args = sys.argv[1:]
+    if len(args) < 2:
+        print(__doc__.strip(), file=sys.stderr)
+        return 2
+
+    command, path, rest = args[0], args[1], args[2:]
+
+    try:
+        if command == "get":
+            record = load(path)
+            for key in rest:
+                print(format_value(lookup(record, key)))
+        elif command == "record":
+            record = load(path)
+            value = lookup(record, rest[0]) if rest else record
+            print(json.dumps(value if value is not None else {}, separators=(",", ":")))
+        elif command in ("set", "incr", "append"):
+            update(path, [(command, arg) for arg in rest])
+        elif command == "merge":
+            patch = rest[0] if rest and rest[0] != "-" else sys.stdin.read()
+            update(path, [("merge", patch)])
+        elif command == "batch":
+            update(path, read_batch(sys.stdin))
+        else:
+            print(__doc__.strip(), file=sys.stderr)
+            return 2
+    except (StateError, ValueError) as exc:
+        print(f"json_state: {exc}", file=sys.stderr)
+        return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,245 @@
+#!/usr/bin/env python3
+"""
+Batcave shared content-addressed cache
+One cache for every checkout and git worktree of a project. Entries are keyed
+by git blob hashes (the same ids `git hash-object` prints), so a file with the
+same content is only formatted or linted once no matter which worktree it
+lives in. The format and lint hooks import this module; worktree.sh runs
+`prune` each time it creates a worktree, so old entries expire.
+
+Layout under $CLAUDE_HOME/cache/cas:
+    objects/<xx>/<rest>       file contents by blob hash (formatter output)
+    results/<xx>/<rest>.json  tool results by blob + tool + tool version + config fingerprint
+
+Usage:
+    shared_cache.py hash <file> [<file> ...]
+    shared_cache.py stats
+    shared_cache.py prune [--days N]
+"""
+
+import glob
+import hashlib
+import json
+import os
+import shutil
+import sys
+import time
+
+CLAUDE_HOME = os.environ.get("CLAUDE_HOME", os.path.expanduser("~/.claude"))
+CAS_DIR = os.environ.get("CLAUDE_SHARED_CACHE", os.path.join(CLAUDE_HOME, "cache", "cas"))
+OBJECTS_DIR = os.path.join(CAS_DIR, "objects")
+RESULTS_DIR = os.path.join(CAS_DIR, "results")
+DEFAULT_MAX_AGE_DAYS = 14
+
+# Tool configuration that changes results for every file below it
+CONFIG_FILES = (
+    "package.json", "tsconfig.json",
+    ".eslintrc", ".eslintrc.js", ".eslintrc.cjs", ".eslintrc.json", ".eslintrc.yml", ".eslintrc.yaml",
+    "eslint.config.js", "eslint.config.mjs", "eslint.config.cjs", "eslint.config.ts", "eslint.config.mts",
+    "eslint.config.cts", ".eslintignore",
+    ".prettierrc", ".prettierrc.json", ".prettierrc.json5", ".prettierrc.yml", ".prettierrc.yaml",
+    ".prettierrc.toml", ".prettierrc.js", ".prettierrc.cjs", ".prettierrc.mjs", "prettier.config.js",
+    "prettier.config.cjs", "prettier.config.mjs", ".prettierignore", ".editorconfig",
+    "pyproject.toml", "setup.cfg", ".flake8", "tox.ini", ".pylintrc", "pylintrc", "mypy.ini", ".mypy.ini",
+    ".rubocop.yml", "rustfmt.toml", ".rustfmt.toml",
+)
+
+# Placeholder for the file path inside cached tool output (paths differ per worktree)
+PATH_TOKEN = "<<file>>"
+
+
+def blob_hash(data):
+    """Git blob id of some bytes (identical to `git hash-object`)"""
+    return hashlib.sha1(b"blob %d\0" % len(data) + data).hexdigest()
+
+
+def file_blob(path):
+    """Return (blob_hash, content) for a file"""
+    with open(path, "rb") as handle:
+        data = handle.read()
+    return blob_hash(data), data
+
+
+def config_fingerprint(file_path):
+    """Fingerprint the tool config files between a file and its repository root"""
+    directory = os.path.dirname(os.path.abspath(file_path))
+    parts = []
+    while True:
+        for name in CONFIG_FILES:
+            candidate = os.path.join(directory, name)
+            if os.path.isfile(candidate):
+                # Relative to the file so identical layouts in other worktrees match
+                relative = os.path.relpath(candidate, os.path.dirname(os.path.abspath(file_path)))
+                parts.append(f"{relative}={file_blob(candidate)[0]}")
+        parent = os.path.dirname(directory)
+        if os.path.exists(os.path.join(directory, ".git")) or parent == directory:
+            break
+        directory = parent
+    return hashlib.sha1("\n".join(parts).encode()).hexdigest()
+
+
+def tool_version(command, file_path):
+    """Identify the installed tool a command runs for file_path
+
+    Node tools resolve to the nearest node_modules package version and Python
+    console scripts to their dist-info version, so worktrees with the same
+    install share entries. Anything else falls back to the executable's path,
+    size and mtime. An upgrade therefore never serves results of the old tool.
+    """
+    program = command[1] if command[0] == "npx" and len(command) > 1 else command[0]
+    directory = os.path.dirname(os.path.abspath(file_path))
+    while True:
+        try:
+            with open(os.path.join(directory, "node_modules", program, "package.json")) as handle:
+                return f"{program}@{json.load(handle)['version']}"
+        except (OSError, ValueError, KeyError):
+            pass
+        parent = os.path.dirname(directory)
+        if os.path.exists(os.path.join(directory, ".git")) or parent == directory:
+            break
+        directory = parent
+
+    executable = shutil.which(program)
+    if executable is None:
+        return ""
+    executable = os.path.realpath(executable)
+    prefix = os.path.dirname(os.path.dirname(executable))
+    dist_info = glob.glob(os.path.join(prefix, "lib", "python*", "site-packages", f"{program}-*.dist-info"))
+    if dist_info:
+        return os.path.basename(sorted(dist_info)[-1])[:-len(".dist-info")]
+    try:
+        stat = os.stat(executable)
+    except OSError:
+        return ""
+    return f"{executable}:{stat.st_size}:{stat.st_mtime_ns}"
+
+
+def entry_key(tool, version, blob, config):
+    """Cache key for one tool (at one version) run over one blob under one config"""
+    return hashlib.sha1(f"{tool}\0{version}\0{blob}\0{config}".encode()).hexdigest()
+
+
+def _sharded(root, digest, suffix=""):
+    return os.path.join(root, digest[:2], digest[2:] + suffix)
+
+
+def _atomic_write(path, data):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    with open(temp_path, "wb") as handle:
+        handle.write(data)
+    os.replace(temp_path, path)
+
+
+def _localize(value, file_path):
+    if isinstance(value, str):
+        return value.replace(PATH_TOKEN, file_path)
+    return value
+
+
+def _portable(value, file_path):
+    if isinstance(value, str):
+        return value.replace(file_path, PATH_TOKEN)
+    return value
+
+
+def get_result(tool, version, file_path, blob=None, config=None):
+    """Cached result of `tool` for the current content of file_path, or None"""
+    try:
+        blob = blob or file_blob(file_path)[0]
+        config = config or config_fingerprint(file_path)
+        with open(_sharded(RESULTS_DIR, entry_key(tool, version, blob, config), ".json")) as handle:
+            result = json.load(handle)
+    except (OSError, ValueError):
+        return None
+    return {key: _localize(value, file_path) for key, value in result.items()}
+
+
+def put_result(tool, version, file_path, result, blob=None, config=None):
+    """Store a tool result; the file path is stored as a placeholder"""
+    try:
+        blob = blob or file_blob(file_path)[0]
+        config = config or config_fingerprint(file_path)
+        portable = {key: _portable(value, file_path) for key, value in result.items()}
+        _atomic_write(_sharded(RESULTS_DIR, entry_key(tool, version, blob, config), ".json"),
+                      json.dumps(portable).encode())
+    except OSError:
+        pass
+
+
+def get_formatted(tool, version, blob, config):
+    """Formatter output previously produced for this input blob, or None"""
+    try:
+        with open(_sharded(RESULTS_DIR, entry_key(tool, version, blob, config), ".json")) as handle:
+            output_blob = json.load(handle)["object"]
+        with open(_sharded(OBJECTS_DIR, output_blob), "rb") as handle:
+            return handle.read()
+    except (OSError, ValueError, KeyError):
+        return None
+
+
+def put_formatted(tool, version, blob, config, output):
+    """Record formatter output for an input blob (output stored by its own blob hash)"""
+    try:
+        output_blob = blob_hash(output)
+        object_path = _sharded(OBJECTS_DIR, output_blob)
+        if not os.path.exists(object_path):
+            _atomic_write(object_path, output)
+        _atomic_write(_sharded(RESULTS_DIR, entry_key(tool, version, blob, config), ".json"),
+                      json.dumps({"object": output_blob}).encode())
+        # Formatting is idempotent, so the output maps to itself as well
+        if output_blob != blob:
+            _atomic_write(_sharded(RESULTS_DIR, entry_key(tool, version, output_blob, config), ".json"),
+                          json.dumps({"object": output_blob}).encode())
+    except OSError:
+        pass
+
+
+def cache_stats():
+    """Entry counts and size of the shared cache"""
+    stats = {"objects": 0, "results": 0, "bytes": 0}
+    for name, root in (("objects", OBJECTS_DIR), ("results", RESULTS_DIR)):
+        for directory, _, files in os.walk(root):
+            for file_name in files:
+                stats[name] += 1
+                stats["bytes"] += os.path.getsize(os.path.join(directory, file_name))
+    return stats
+
+
+def prune(max_age_days=DEFAULT_MAX_AGE_DAYS):
+    """Remove entries not written for max_age_days"""
+    cutoff = time.time() - max_age_days * 86400
+    removed = 0
+    for root in (OBJECTS_DIR, RESULTS_DIR):
+        for directory, _, files in os.walk(root):
+            for file_name in files:
+                path = os.path.join(directory, file_name)
+                if os.path.getmtime(path) < cutoff:
+                    os.unlink(path)
+                    removed += 1
+    return removed
+
+
+def main():
+    """Command line entry point used by worktree.sh and context.sh"""
+    args = sys.argv[1:]
+    command = args[0] if args else "stats"
+
+    if command == "hash" and len(args) > 1:
+        for path in args[1:]:
+            print(f"{file_blob(path)[0]}  {path}")
+    elif command == "stats":
+        stats = cache_stats()
+        print(f"objects {stats['objects']} results {stats['results']} "
+              f"size {stats['bytes'] // 1024}K ({CAS_DIR})")
+    elif command == "prune":
+        days = int(args[args.index("--days") + 1]) if "--days" in args else DEFAULT_MAX_AGE_DAYS
+        print(f"removed {prune(days)} entries")
+    else:
+        print(__doc__.strip(), file=sys.stderr)
+        return 2
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
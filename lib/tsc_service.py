@@ -0,0 +1,322 @@
+#!/usr/bin/env python3
+"""
+Batcave TypeScript check service
+Keeps one `tsc --watch --incremental --noEmit` running per tsconfig.json, so
+the linter hook asks for the diagnostics of the file it just saw edited
+instead of type-checking the whole project from scratch on every edit. The
+compiler runs with the project's own tsconfig, caches its program in a
+.tsbuildinfo file (fast restarts) and is stopped after
+CLAUDE_TSC_SERVICE_IDLE_SECONDS (default 1800) without queries.
+
+State lives in $CLAUDE_HOME/cache/tsc/<project>-<hash>/:
+    state.json       diagnostics of the last completed compilation
+    tsbuildinfo      tsc incremental cache
+    service.lock     held by the running service
+    service.log      raw tsc output
+
+Usage:
+    tsc_service.py check <file>      # diagnostics for one file (starts the service)
+    tsc_service.py serve <tsconfig>  # run the service in the foreground
+    tsc_service.py status
+    tsc_service.py stop
+"""
+
+import fcntl
+import hashlib
+import json
+import os
+import re
+import shutil
+import signal
+import subprocess
+import sys
+import threading
+import time
+
+CLAUDE_HOME = os.environ.get("CLAUDE_HOME", os.path.expanduser("~/.claude"))
+SERVICE_ROOT = os.path.join(CLAUDE_HOME, "cache", "tsc")
+IDLE_SECONDS = int(os.environ.get("CLAUDE_TSC_SERVICE_IDLE_SECONDS", "1800"))
+POLL_SECONDS = 0.1
+# tsc starts a new compilation about 250ms after a change; files still missing from
+# the program after this long are not covered by the tsconfig
+PROGRAM_GRACE_SECONDS = 2
+
+DIAGNOSTIC_PATTERN = re.compile(r"^(?P<file>.+?)\((?P<line>\d+),(?P<column>\d+)\): "
+                                r"(?P<category>error|warning|message) (?P<code>TS\d+): (?P<text>.*)$")
+CYCLE_START_PATTERN = re.compile(r"Starting (incremental )?compilation")
+CYCLE_END_PATTERN = re.compile(r"Watching for file changes\.")
+
+
+def find_tsconfig(file_path):
+    """Nearest tsconfig.json above a file, stopping at the repository root"""
+    directory = os.path.dirname(os.path.abspath(file_path))
+    while True:
+        candidate = os.path.join(directory, "tsconfig.json")
+        if os.path.isfile(candidate):
+            return candidate
+        parent = os.path.dirname(directory)
+        if os.path.exists(os.path.join(directory, ".git")) or parent == directory:
+            return None
+        directory = parent
+
+
+def find_tsc(project_root):
+    """The project's own tsc (node_modules/.bin), else one on PATH; never npx"""
+    directory = project_root
+    while True:
+        candidate = os.path.join(directory, "node_modules", ".bin", "tsc")
+        if os.access(candidate, os.X_OK):
+            return candidate
+        parent = os.path.dirname(directory)
+        if parent == directory:
+            return shutil.which("tsc")
+        directory = parent
+
+
+def service_dir(tsconfig):
+    """Per-project state directory"""
+    project_root = os.path.dirname(tsconfig)
+    digest = hashlib.sha1(tsconfig.encode()).hexdigest()[:8]
+    return os.path.join(SERVICE_ROOT, f"{os.path.basename(project_root) or 'root'}-{digest}")
+
+
+def _write_json(path, data):
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    with open(temp_path, "w") as handle:
+        json.dump(data, handle)
+    os.replace(temp_path, path)
+
+
+def read_state(directory):
+    """Last completed compilation, or None before the first one finishes"""
+    try:
+        with open(os.path.join(directory, "state.json")) as handle:
+            return json.load(handle)
+    except (OSError, ValueError):
+        return None
+
+
+def is_running(directory):
+    """A running service holds service.lock for its whole lifetime"""
+    try:
+        with open(os.path.join(directory, "service.lock"), "a") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except BlockingIOError:
+        return True
+    except OSError:
+        return False
+    return False
+
+
+def ensure_running(tsconfig):
+    """Start the service for a tsconfig unless it is already up"""
+    directory = service_dir(tsconfig)
+    os.makedirs(directory, exist_ok=True)
+    if is_running(directory):
+        return
+    with open(os.path.join(directory, "service.log"), "a") as log:
+        subprocess.Popen([sys.executable, os.path.abspath(__file__), "serve", tsconfig],
+                         stdin=subprocess.DEVNULL, stdout=log, stderr=log, start_new_session=True)
+
+
+class _Compilation:
+    """Diagnostics and program files collected during one watch cycle"""
+
+    def __init__(self, project_root):
+        self.project_root = project_root
+        self.started_at = time.time()
+        self.diagnostics = {}
+        self.program = []
+        self.last_path = None
+
+    def feed(self, line):
+        match = DIAGNOSTIC_PATTERN.match(line)
+        if match:
+            path = os.path.normpath(os.path.join(self.project_root, match.group("file")))
+            self.diagnostics.setdefault(path, []).append(
+                f"{path}({match.group('line')},{match.group('column')}): "
+                f"{match.group('category')} {match.group('code')}: {match.group('text')}")
+            self.last_path = path
+        elif line.startswith((" ", "\t")) and self.last_path is not None:
+            # Continuation of a multi-line message
+            self.diagnostics[self.last_path][-1] += " " + line.strip()
+        elif os.path.isabs(line) and f"{os.sep}node_modules{os.sep}" not in line:
+            # --listFiles output: the project files this tsconfig covers
+            self.program.append(os.path.normpath(line))
+
+    def finish(self):
+        return {
+            "started_at": self.started_at,
+            "completed_at": time.time(),
+            "error_count": sum(len(entries) for entries in self.diagnostics.values()),
+            "diagnostics": self.diagnostics,
+            "program": self.program,
+        }
+
+
+def serve(tsconfig):
+    """Run tsc in watch mode and publish each completed compilation to state.json"""
+    tsconfig = os.path.abspath(tsconfig)
+    project_root = os.path.dirname(tsconfig)
+    directory = service_dir(tsconfig)
+    os.makedirs(directory, exist_ok=True)
+
+    lock = open(os.path.join(directory, "service.lock"), "a")
+    try:
+        fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except BlockingIOError:
+        return 0  # another hook started it first
+
+    tsc = find_tsc(project_root)
+    if tsc is None:
+        print(f"tsc_service: no tsc for {project_root}", file=sys.stderr)
+        return 1
+
+    with open(os.path.join(directory, "service.json"), "w") as handle:
+        json.dump({"pid": os.getpid(), "tsconfig": tsconfig, "tsc": tsc, "started": time.time()}, handle)
+    query_marker = os.path.join(directory, "last_query")
+    if not os.path.exists(query_marker):
+        open(query_marker, "a").close()
+
+    cmd = [tsc, "--watch", "--noEmit", "--incremental", "--preserveWatchOutput", "--pretty", "false",
+           "--listFiles", "--tsBuildInfoFile", os.path.join(directory, "tsbuildinfo"), "--project", tsconfig]
+    process = subprocess.Popen(cmd, cwd=project_root, stdin=subprocess.DEVNULL,
+                               stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True)
+    signal.signal(signal.SIGTERM, lambda *_: process.terminate())
+
+    def stop_when_idle():
+        while process.poll() is None:
+            time.sleep(30)
+            try:
+                idle = time.time() - os.path.getmtime(query_marker)
+            except OSError:
+                idle = IDLE_SECONDS
+            if idle >= IDLE_SECONDS or not os.path.exists(tsconfig):
+                process.terminate()
+
+    threading.Thread(target=stop_when_idle, daemon=True).start()
+
+    compilation = None
+    for raw_line in process.stdout:
+        line = raw_line.rstrip("\n")
+        if CYCLE_START_PATTERN.search(line):
+            compilation = _Compilation(project_root)
+        elif CYCLE_END_PATTERN.search(line) and compilation is not None:
+            _write_json(os.path.join(directory, "state.json"), compilation.finish())
+            compilation = None
+        elif compilation is not None and line:
+            compilation.feed(line)
+
+    process.wait()
+    try:
+        os.unlink(os.path.join(directory, "service.json"))
+    except OSError:
+        pass
+    return 0
+
+
+def check(file_path, timeout):
+    """Diagnostics for a file from its project's service, in run_linter's result shape
+
+    Returns None when the file has no tsconfig or tsc, or is not part of the
+    tsconfig's program (the caller falls back to the per-file CLI). A result
+    with "pending" set means the compilation covering this edit did not finish
+    within the timeout.
+    """
+    file_path = os.path.abspath(file_path)
+    tsconfig = find_tsconfig(file_path)
+    if tsconfig is None or find_tsc(os.path.dirname(tsconfig)) is None:
+        return None
+
+    directory = service_dir(tsconfig)
+    ensure_running(tsconfig)
+    query_marker = os.path.join(directory, "last_query")
+    open(query_marker, "a").close()
+    os.utime(query_marker, None)
+
+    try:
+        edited_at = os.path.getmtime(file_path)
+    except OSError:
+        return None
+
+    deadline = time.time() + timeout
+    while True:
+        state = read_state(directory)
+        if state is not None:
+            # Only a compilation that started after the edit has seen it
+            if state["started_at"] >= edited_at:
+                break
+            if file_path not in state["program"] and time.time() - edited_at > PROGRAM_GRACE_SECONDS:
+                return None
+        if time.time() >= deadline:
+            return {"tool": "TypeScript compiler check", "success": True, "pending": True,
+                    "stdout": "", "stderr": "", "returncode": 0}
+        time.sleep(POLL_SECONDS)
+
+    if file_path not in state["program"]:
+        return None
+    entries = state["diagnostics"].get(file_path, [])
+    return {
+        "tool": "TypeScript compiler check",
+        "success": not entries,
+        "stdout": "\n".join(entries),
+        "stderr": "",
+        "returncode": 2 if entries else 0,
+        "project_errors": state["error_count"],
+    }
+
+
+def services():
+    """(directory, service info) for every running service"""
+    try:
+        names = sorted(os.listdir(SERVICE_ROOT))
+    except OSError:
+        return []
+    running = []
+    for name in names:
+        directory = os.path.join(SERVICE_ROOT, name)
+        if not is_running(directory):
+            continue
+        try:
+            with open(os.path.join(directory, "service.json")) as handle:
+                running.append((directory, json.load(handle)))
+        except (OSError, ValueError):
+            continue
+    return running
+
+
+def main():
+    """Command line entry point"""
+    args = sys.argv[1:]
+    command = args[0] if args else "status"
+
+    if command == "serve" and len(args) == 2:
+        return serve(args[1])
+    elif command == "check" and len(args) == 2:
+        result = check(args[1], timeout=120)
+        if result is None:
+            print(f"{args[1]}: not part of a TypeScript project with tsc installed", file=sys.stderr)
+            return 1
+        if result.get("pending"):
+            print("compilation still running", file=sys.stderr)
+            return 1
+        if result["stdout"]:
+            print(result["stdout"])
+        return 0 if result["success"] else 2
+    elif command == "status":
+        for directory, info in services():
+            state = read_state(directory) or {}
+            print(f"{info['tsconfig']}: pid {info['pid']}, "
+                  f"{state.get('error_count', '?')} errors in {len(state.get('program', []))} files")
+    elif command == "stop":
+        for directory, info in services():
+            os.kill(info["pid"], signal.SIGTERM)
+            print(f"stopped {info['tsconfig']}")
+    else:
+        print(__doc__.strip(), file=sys.stderr)
+        return 2
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
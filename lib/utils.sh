@@ -4,6 +4,7 @@
 # Configuration
 CLAUDE_HOME="${CLAUDE_HOME:-$HOME/.claude}"
 CLAUDE_VERSION="3.0.0"
+JSON_STATE="${JSON_STATE:-$CLAUDE_HOME/lib/json_state.py}"
 
 # Colors for Batman theme
 export BLACK='\033[0;30m'
@@ -87,13 +88,140 @@ json_set() {
     local key="$2"
     local value="$3"
     
-    ensure_directory "$(dirname "$file")"
+    if json_state_available; then
+        json_state set "$file" "$key=$value"
+        return
+    fi
     
-    if [[ -f "$file" ]]; then
-        jq ".$key = \"$value\"" "$file" > "${file}.tmp" && mv "${file}.tmp" "$file"
+    json_apply_with_jq "$file" '(getpath($key | split("."))) = $value' "$key=$value"
+}
+
+# Batched JSON state access (lib/json_state.py: one process, locked, atomic replace)
+json_state() {
+    python3 -S "$JSON_STATE" "$@"
+}
+
+json_state_available() {
+    [[ -f "$JSON_STATE" ]] && command -v python3 >/dev/null 2>&1
+}
+
+# Read several keys with one jq process, one line per key (missing keys are empty lines)
+json_get_many() {
+    local file="$1"
+    shift
+    
+    if [[ ! -f "$file" ]]; then
+        printf '%.0s\n' "$@"
+        return 0
+    fi
+    
+    jq -r '. as $record | $ARGS.positional[]
+        | split(".") as $path | $record | getpath($path)
+        | if . == null then "" elif type == "string" then . else tojson end' \
+        "$file" --args "$@" 2>/dev/null
+}
+
+# Fetch a whole record (or one subtree) as compact JSON
+json_record() {
+    local file="$1"
+    local key="${2:-}"
+    
+    if [[ ! -f "$file" ]]; then
+        echo "{}"
+    elif [[ -n "$key" ]]; then
+        jq -c --arg key "$key" 'getpath($key | split(".")) // {}' "$file" 2>/dev/null
     else
-        echo "{\"$key\": \"$value\"}" > "$file"
+        jq -c '.' "$file" 2>/dev/null
+    fi
+}
+
+# Write several keys in one locked update: key=string or key:=json
+json_set_many() {
+    local file="$1"
+    shift
+    
+    if json_state_available; then
+        json_state set "$file" "$@"
+        return
+    fi
+    
+    local assignment
+    for assignment in "$@"; do
+        json_apply_with_jq "$file" '(getpath($key | split("."))) = $value' "$assignment"
+    done
+}
+
+# Increment counters in one locked update: key or key=step
+json_incr() {
+    local file="$1"
+    shift
+    
+    if json_state_available; then
+        json_state incr "$file" "$@"
+        return
+    fi
+    
+    local counter
+    for counter in "$@"; do
+        local step="${counter#*=}"
+        [[ "$counter" == *=* ]] || step=1
+        json_apply_with_jq "$file" '(getpath($key | split("."))) |= ((. // 0 | tonumber) + ($value | tonumber))' "${counter%%=*}=$step"
+    done
+}
+
+# Append values to arrays in one locked update: key=string or key:=json
+json_append() {
+    local file="$1"
+    shift
+    
+    if json_state_available; then
+        json_state append "$file" "$@"
+        return
+    fi
+    
+    local assignment
+    for assignment in "$@"; do
+        json_apply_with_jq "$file" '(getpath($key | split("."))) |= ((. // []) + [$value])' "$assignment"
+    done
+}
+
+# Deep-merge a JSON object into a record (commit a whole record at once)
+json_commit() {
+    local file="$1"
+    local patch="$2"
+    
+    if json_state_available; then
+        json_state merge "$file" "$patch"
+        return
     fi
+    
+    ensure_directory "$(dirname "$file")"
+    [[ -f "$file" ]] || echo "{}" > "$file"
+    
+    local temp_file=$(mktemp "${file}.XXXXXX")
+    jq --argjson patch "$patch" '. * $patch' "$file" > "$temp_file" && mv "$temp_file" "$file"
+}
+
+# jq fallback for the batch writers when python3 is unavailable
+json_apply_with_jq() {
+    local file="$1"
+    local filter="$2"
+    local assignment="$3"
+    
+    local key="${assignment%%=*}"
+    local value="${assignment#*=}"
+    local value_arg="--arg"
+    
+    if [[ "$key" == *: ]]; then
+        key="${key%:}"
+        value_arg="--argjson"
+    fi
+    
+    ensure_directory "$(dirname "$file")"
+    [[ -f "$file" ]] || echo "{}" > "$file"
+    
+    local temp_file=$(mktemp "${file}.XXXXXX")
+    jq --arg key "$key" "$value_arg" value "$value" "$filter" "$file" > "$temp_file" && mv "$temp_file" "$file"
 }
 
 # Process management
@@ -261,8 +389,8 @@ cache_is_valid() {
         return 1
     fi
     
-    local created=$(json_get "$meta_file" "created")
-    local ttl=$(json_get "$meta_file" "ttl")
+    local created ttl
+    { read -r created; read -r ttl; } < <(json_get_many "$meta_file" "created" "ttl")
     local now=$(epoch_time)
     
     if [[ $((now - created)) -lt $ttl ]]; then
@@ -293,6 +421,8 @@ trap 'handle_error $LINENO "$BASH_COMMAND"' ERR
 export -f log_info log_warn log_error log_batman
 export -f batman_greet batman_working batman_complete batman_error
 export -f ensure_directory safe_write json_get json_set
+export -f json_state json_state_available json_get_many json_record
+export -f json_set_many json_incr json_append json_commit json_apply_with_jq
 export -f is_running kill_process trim to_lower to_upper
 export -f contains join_array timestamp epoch_time
 export -f is_git_repo git_current_branch git_is_clean
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Batcave pre-tool verdict cache
+Remembers "allow" verdicts of the pre-tool safety hooks, so the `npm test`,
+`git status` and Read paths an agent repeats all session skip the pattern
+scan. Entries are keyed by hook, tool name, a hash of the parameters the hook
+inspects and the hook's pattern-set version. Changing DANGER_PATTERNS or the
+sensitive-path lists therefore invalidates old verdicts by itself. "block"
+verdicts are never stored and always recomputed.
+
+Only hashes are written to disk, never the commands or paths themselves.
+The cache holds at most CLAUDE_VERDICT_CACHE_SIZE entries (default 1024); the
+oldest are dropped first.
+
+Usage:
+    verdict_cache.py stats
+    verdict_cache.py clear
+"""
+
+import hashlib
+import json
+import os
+import sys
+import time
+
+CLAUDE_HOME = os.environ.get("CLAUDE_HOME", os.path.expanduser("~/.claude"))
+CACHE_FILE = os.path.join(CLAUDE_HOME, "cache", "verdicts.json")
+MAX_ENTRIES = int(os.environ.get("CLAUDE_VERDICT_CACHE_SIZE", "1024"))
+
+# Loaded once per process; the dispatcher runs both pre-tool hooks against the same copy
+_entries = None
+
+
+def pattern_version(*pattern_sets):
+    """Version string for the patterns a hook checks (changes when any of them changes)"""
+    return hashlib.sha1(json.dumps(pattern_sets, sort_keys=True, default=str).encode()).hexdigest()[:12]
+
+
+def _load():
+    global _entries
+    if _entries is None:
+        try:
+            with open(CACHE_FILE) as handle:
+                _entries = json.load(handle)
+        except (OSError, ValueError):
+            _entries = {}
+    return _entries
+
+
+def _save(entries):
+    try:
+        os.makedirs(os.path.dirname(CACHE_FILE), exist_ok=True)
+        temp_path = f"{CACHE_FILE}.{os.getpid()}.tmp"
+        with open(temp_path, "w") as handle:
+            json.dump(entries, handle)
+        os.replace(temp_path, CACHE_FILE)
+    except OSError:
+        pass
+
+
+class VerdictCache:
+    """Allow-verdict cache for one hook and one pattern-set version"""
+
+    def __init__(self, hook_name, version):
+        self.prefix = f"{hook_name}\0{version}\0"
+
+    def key(self, tool_name, parameters):
+        """Hash of the normalized tool name and the parameters the hook looks at"""
+        fingerprint = json.dumps(parameters, sort_keys=True, separators=(",", ":"))
+        return hashlib.sha1(f"{self.prefix}{tool_name.strip()}\0{fingerprint}".encode()).hexdigest()
+
+    def allowed(self, tool_name, parameters):
+        """True when the same call was allowed under the same patterns before"""
+        return self.key(tool_name, parameters) in _load()
+
+    def remember(self, tool_name, parameters, verdict):
+        """Store a verdict if it is a plain allow; blocks are never cached"""
+        if verdict != {"action": "allow"}:
+            return
+        entries = _load()
+        entries[self.key(tool_name, parameters)] = round(time.time(), 1)
+        if len(entries) > MAX_ENTRIES:
+            for key in sorted(entries, key=entries.get)[:len(entries) - MAX_ENTRIES]:
+                del entries[key]
+        _save(entries)
+
+
+def main():
+    """Command line entry point"""
+    args = sys.argv[1:]
+    command = args[0] if args else "stats"
+
+    if command == "stats":
+        print(f"{len(_load())} cached allow verdicts (max {MAX_ENTRIES}) in {CACHE_FILE}")
+    elif command == "clear":
+        _save({})
+        print("cleared")
+    else:
+        print(__doc__.strip(), file=sys.stderr)
+        return 2
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
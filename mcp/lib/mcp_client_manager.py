@@ -0,0 +1,773 @@
+#!/usr/bin/env python3
+"""
+Wayne Tech MCP Client Manager
+Keeps warm pools of stdio MCP connections per server behind a Unix socket,
+so mcp_utils.sh queries skip server spawn and handshake costs.
+
+Usage:
+    mcp_client_manager.py start|stop|status
+    mcp_client_manager.py warm <server> [<server> ...]
+    mcp_client_manager.py health [--json]
+    mcp_client_manager.py query <server> <query> [--tool <name>]
+    mcp_client_manager.py call <server> <method> [<params-json>]
+    mcp_client_manager.py cache-stats [--json]
+    mcp_client_manager.py serve          # run the manager in the foreground
+"""
+
+import asyncio
+import fcntl
+import glob
+import hashlib
+import itertools
+import json
+import os
+import socket
+import subprocess
+import sys
+import time
+from collections import OrderedDict, defaultdict
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+CLAUDE_HOME = os.environ.get("CLAUDE_HOME", os.path.expanduser("~/.claude"))
+MCP_HOME = os.path.join(CLAUDE_HOME, "mcp")
+SOCKET_PATH = os.environ.get("MCP_MANAGER_SOCKET", os.path.join(MCP_HOME, "manager.sock"))
+PID_FILE = os.path.join(MCP_HOME, "manager.pid")
+LOG_FILE = os.path.join(MCP_HOME, "logs", "manager.log")
+RESPONSE_CACHE_DIR = os.path.join(CLAUDE_HOME, "cache", "mcp", "responses")
+
+# Server definitions are merged from these files, later files winning.
+# Per-server files under mcp/servers carry capabilities and cache TTLs.
+CONFIG_FILES = sorted(glob.glob(os.path.join(MCP_HOME, "servers", "*.json"))) + [
+    os.path.join(CLAUDE_HOME, "mcp-servers-config.json"),
+    os.path.join(MCP_HOME, "config.json"),
+    os.environ.get("MCP_CLIENT_CONFIG", ""),
+]
+
+PROTOCOL_VERSION = "2024-11-05"
+CLIENT_INFO = {"name": "wayne-tech-mcp-manager", "version": "1.0"}
+
+DEFAULT_POOL_SETTINGS = {
+    "pool_size": 2,
+    "request_timeout": 30,
+    "handshake_timeout": 20,
+    "restart_backoff_initial": 1,
+    "restart_backoff_max": 60,
+    "cache_enabled": True,
+    "cache_ttl": 1800,
+    "cache_max_entries": 2000,
+}
+
+# Argument names tried, in order, for a query when the tool requires none in particular
+QUERY_ARGUMENTS = ("query", "q", "libraryName", "prompt", "text", "input", "url")
+
+# Only read-style methods are safe to serve from cache. Tool calls may have side
+# effects (writes, navigation), so they are cached only when their tool, or
+# "tools/call" for the whole server, is listed in the server's cache_ttl_methods.
+CACHEABLE_METHODS = {
+    "tools/call", "tools/list",
+    "resources/read", "resources/list",
+    "prompts/get", "prompts/list",
+}
+
+
+class MCPError(Exception):
+    """Error returned by an MCP server or raised by the connection layer"""
+
+
+def load_config() -> Dict[str, Any]:
+    """Load server launch specs and pool settings from the known config files"""
+    servers: Dict[str, Dict[str, Any]] = {}
+    settings = dict(DEFAULT_POOL_SETTINGS)
+
+    for path in CONFIG_FILES:
+        if not path or not os.path.exists(path):
+            continue
+        try:
+            with open(path, "r") as f:
+                data = json.load(f)
+        except (json.JSONDecodeError, IOError):
+            continue
+
+        entries = data.get("servers", {})
+        if "name" in data and "servers" not in data:
+            entries = {data["name"]: data}
+        if isinstance(entries, list):
+            entries = {entry.get("name"): entry for entry in entries if entry.get("name")}
+
+        for name, spec in entries.items():
+            merged = dict(servers.get(name, {}))
+            merged.update(spec)
+            servers[name] = merged
+
+        global_settings = data.get("global_settings", {})
+        settings.update(data.get("pool", {}))
+        settings.update(global_settings.get("pool", {}))
+        settings.update({key: value for key, value in global_settings.items() if key.startswith("cache_")})
+
+    # Only stdio servers with a launch command can be pooled
+    servers = {
+        name: spec for name, spec in servers.items()
+        if spec.get("command") and spec.get("transport", "stdio") == "stdio"
+        and spec.get("enabled", True)
+    }
+
+    return {"servers": servers, "settings": settings}
+
+
+class ResponseCache:
+    """Fingerprinted MCP response cache with per-server/per-method TTLs.
+
+    Identical requests that arrive while one is already in flight wait on
+    that request instead of going upstream again.
+    """
+
+    def __init__(self, directory: str, default_ttl: float, max_entries: int):
+        self.directory = directory
+        self.default_ttl = float(default_ttl)
+        self.max_entries = int(max_entries)
+        self.memory: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self.in_flight: Dict[str, asyncio.Future] = {}
+        self.stats = {"hits": 0, "misses": 0, "coalesced": 0, "stores": 0, "evictions": 0}
+        self.server_stats: Dict[str, Dict[str, int]] = defaultdict(lambda: {"hits": 0, "misses": 0, "coalesced": 0})
+
+    def fingerprint(self, server: str, method: str, params: Dict[str, Any]) -> str:
+        """Key order is canonicalized; argument values are hashed exactly as sent"""
+        canonical = json.dumps([server, method, params], sort_keys=True, separators=(",", ":"))
+        return hashlib.sha256(canonical.encode()).hexdigest()
+
+    def ttl_for(self, spec: Dict[str, Any], method: str, params: Dict[str, Any]) -> float:
+        """Most specific TTL wins: tool/method override, then server, then default
+
+        Tool calls are never cached unless allowlisted in cache_ttl_methods.
+        """
+        config = spec.get("config", {})
+        method_ttls = config.get("cache_ttl_methods", spec.get("cache_ttl_methods", {}))
+        tool = params.get("name") if method == "tools/call" else None
+
+        for key in (tool, method):
+            if key and key in method_ttls:
+                return float(method_ttls[key])
+        if method == "tools/call":
+            return 0.0
+        return float(config.get("cache_ttl", spec.get("cache_ttl", self.default_ttl)))
+
+    def _path(self, fingerprint: str) -> str:
+        return os.path.join(self.directory, fingerprint[:2], fingerprint + ".json")
+
+    def get(self, fingerprint: str) -> Optional[Dict[str, Any]]:
+        entry = self.memory.get(fingerprint)
+        if entry is None:
+            try:
+                with open(self._path(fingerprint), "r") as f:
+                    entry = json.load(f)
+            except (IOError, json.JSONDecodeError):
+                return None
+
+        if entry["expires_at"] <= time.time():
+            self.memory.pop(fingerprint, None)
+            return None
+
+        self.memory[fingerprint] = entry
+        self.memory.move_to_end(fingerprint)
+        self._evict()
+        return entry["result"]
+
+    def put(self, fingerprint: str, server: str, method: str, result: Dict[str, Any], ttl: float):
+        entry = {"expires_at": time.time() + ttl, "server": server, "method": method, "result": result}
+        self.memory[fingerprint] = entry
+        self.memory.move_to_end(fingerprint)
+        self.stats["stores"] += 1
+        self._evict()
+
+        path = self._path(fingerprint)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            temp_path = f"{path}.{os.getpid()}.tmp"
+            with open(temp_path, "w") as f:
+                json.dump(entry, f)
+            os.replace(temp_path, path)
+        except IOError:
+            pass  # The in-memory copy still serves this daemon
+
+    def _evict(self):
+        while len(self.memory) > self.max_entries:
+            self.memory.popitem(last=False)
+            self.stats["evictions"] += 1
+
+    async def fetch(self, server: str, spec: Dict[str, Any], method: str, params: Dict[str, Any],
+                    loader: Callable[[], Awaitable[Dict[str, Any]]]) -> Dict[str, Any]:
+        """Serve from cache, join an identical in-flight request, or load upstream"""
+        ttl = self.ttl_for(spec, method, params) if method in CACHEABLE_METHODS else 0
+        if ttl <= 0:
+            return await loader()
+
+        fingerprint = self.fingerprint(server, method, params)
+        cached = self.get(fingerprint)
+        if cached is not None:
+            self._count(server, "hits")
+            return cached
+
+        if fingerprint in self.in_flight:
+            self._count(server, "coalesced")
+            return await asyncio.shield(self.in_flight[fingerprint])
+
+        self._count(server, "misses")
+        future = asyncio.get_running_loop().create_future()
+        self.in_flight[fingerprint] = future
+        try:
+            result = await loader()
+            if not result.get("isError"):
+                self.put(fingerprint, server, method, result, ttl)
+            future.set_result(result)
+            return result
+        except BaseException as e:
+            future.set_exception(e)
+            future.exception()  # Mark retrieved when nobody else was waiting
+            raise
+        finally:
+            self.in_flight.pop(fingerprint, None)
+
+    def _count(self, server: str, stat: str):
+        self.stats[stat] += 1
+        self.server_stats[server][stat] += 1
+
+    def report(self) -> Dict[str, Any]:
+        def hit_rate(stats):
+            served = stats["hits"] + stats["coalesced"]
+            total = served + stats["misses"]
+            return round(served * 100 / total, 1) if total else 0.0
+
+        return {
+            **self.stats,
+            "hit_rate": hit_rate(self.stats),
+            "entries": len(self.memory),
+            "in_flight": len(self.in_flight),
+            "servers": {name: {**stats, "hit_rate": hit_rate(stats)}
+                        for name, stats in self.server_stats.items()},
+        }
+
+
+class StdioConnection:
+    """A single JSON-RPC session with a stdio MCP server process"""
+
+    def __init__(self, name: str, spec: Dict[str, Any], on_exit):
+        self.name = name
+        self.spec = spec
+        self.on_exit = on_exit
+        self.process: Optional[asyncio.subprocess.Process] = None
+        self.pending: Dict[int, asyncio.Future] = {}
+        self.ids = itertools.count(1)
+        self.alive = False
+        self.closing = False
+        self.reader_task: Optional[asyncio.Task] = None
+        self.server_info: Dict[str, Any] = {}
+
+    @property
+    def in_flight(self) -> int:
+        return len(self.pending)
+
+    async def open(self, handshake_timeout: float):
+        """Spawn the server and perform the MCP initialize handshake"""
+        env = dict(os.environ)
+        env.update(self.spec.get("env", {}))
+        cwd = self.spec.get("config", {}).get("working_directory") or self.spec.get("cwd")
+
+        self.process = await asyncio.create_subprocess_exec(
+            self.spec["command"], *self.spec.get("args", []),
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.DEVNULL,
+            env=env,
+            cwd=cwd,
+            limit=16 * 1024 * 1024,
+        )
+        self.alive = True
+        self.reader_task = asyncio.create_task(self._read_loop())
+
+        result = await self.request("initialize", {
+            "protocolVersion": PROTOCOL_VERSION,
+            "capabilities": {},
+            "clientInfo": CLIENT_INFO,
+        }, handshake_timeout)
+        self.server_info = result.get("serverInfo", {})
+        await self._send({"jsonrpc": "2.0", "method": "notifications/initialized"})
+
+    async def _send(self, message: Dict[str, Any]):
+        if not self.alive or self.process is None or self.process.stdin is None:
+            raise MCPError(f"{self.name}: connection is closed")
+        self.process.stdin.write((json.dumps(message) + "\n").encode())
+        await self.process.stdin.drain()
+
+    async def request(self, method: str, params: Dict[str, Any], timeout: float) -> Dict[str, Any]:
+        """Send a request and wait for its response; many may be in flight at once"""
+        request_id = next(self.ids)
+        future = asyncio.get_running_loop().create_future()
+        self.pending[request_id] = future
+
+        try:
+            await self._send({"jsonrpc": "2.0", "id": request_id, "method": method, "params": params})
+            response = await asyncio.wait_for(future, timeout)
+        finally:
+            self.pending.pop(request_id, None)
+
+        if "error" in response:
+            error = response["error"]
+            raise MCPError(f"{self.name}: {error.get('message', 'unknown error')} ({error.get('code')})")
+        return response.get("result", {})
+
+    async def _read_loop(self):
+        assert self.process is not None and self.process.stdout is not None
+        try:
+            while True:
+                line = await self.process.stdout.readline()
+                if not line:
+                    break
+                try:
+                    message = json.loads(line)
+                except json.JSONDecodeError:
+                    continue  # Servers sometimes log to stdout; ignore noise
+
+                if "method" in message and "id" in message:
+                    await self._answer_server_request(message)
+                elif "id" in message:
+                    future = self.pending.get(message["id"])
+                    if future and not future.done():
+                        future.set_result(message)
+        except (ConnectionError, asyncio.CancelledError):
+            pass
+        finally:
+            self._mark_dead()
+
+    async def _answer_server_request(self, message: Dict[str, Any]):
+        """Reply to server-initiated requests so the server never blocks on us"""
+        if message["method"] == "ping":
+            reply = {"jsonrpc": "2.0", "id": message["id"], "result": {}}
+        else:
+            reply = {"jsonrpc": "2.0", "id": message["id"],
+                     "error": {"code": -32601, "message": "Method not found"}}
+        try:
+            await self._send(reply)
+        except (MCPError, ConnectionError):
+            pass
+
+    def _mark_dead(self):
+        if not self.alive:
+            return
+        self.alive = False
+        for future in self.pending.values():
+            if not future.done():
+                future.set_exception(MCPError(f"{self.name}: server exited"))
+        self.pending.clear()
+        if not self.closing:
+            self.on_exit(self)
+
+    async def close(self):
+        self.closing = True
+        self.alive = False
+        if self.process and self.process.returncode is None:
+            self.process.terminate()
+            try:
+                await asyncio.wait_for(self.process.wait(), 5)
+            except asyncio.TimeoutError:
+                self.process.kill()
+        if self.reader_task:
+            self.reader_task.cancel()
+
+
+class ServerPool:
+    """A fixed number of warm connections to one server, restarted with backoff"""
+
+    def __init__(self, name: str, spec: Dict[str, Any], settings: Dict[str, Any]):
+        self.name = name
+        self.spec = spec
+        self.size = int(spec.get("pool_size", settings["pool_size"]))
+        self.request_timeout = float(spec.get("timeout", settings["request_timeout"]))
+        self.handshake_timeout = float(settings["handshake_timeout"])
+        self.backoff_initial = float(settings["restart_backoff_initial"])
+        self.backoff_max = float(settings["restart_backoff_max"])
+
+        self.slots: List[Optional[StdioConnection]] = [None] * self.size
+        self.opening: Dict[int, asyncio.Task] = {}
+        self.restart_tasks: Dict[int, asyncio.Task] = {}
+        self.failures = 0
+        self.restarts = 0
+        self.requests = 0
+        self.last_error = ""
+        self.query_tool: Optional[str] = spec.get("query_tool")
+        self.tools: Optional[Dict[str, Dict[str, Any]]] = None
+        self.closed = False
+
+    @property
+    def live(self) -> List[StdioConnection]:
+        return [conn for conn in self.slots if conn is not None and conn.alive]
+
+    async def warm(self) -> bool:
+        """Open every empty slot concurrently; True if at least one is live"""
+        await asyncio.gather(*(
+            asyncio.shield(self._open(index)) for index, conn in enumerate(self.slots)
+            if (conn is None or not conn.alive) and index not in self.restart_tasks
+        ))
+        return bool(self.live)
+
+    def _open(self, index: int) -> asyncio.Task:
+        """The single in-flight open of a slot; concurrent warms and restarts await the same task"""
+        task = self.opening.get(index)
+        if task is None or task.done():
+            task = asyncio.ensure_future(self._open_slot(index))
+            self.opening[index] = task
+            task.add_done_callback(lambda done: self.opening.pop(index, None) if self.opening.get(index) is done else None)
+        return task
+
+    async def _open_slot(self, index: int):
+        current = self.slots[index]
+        if self.closed or (current is not None and current.alive):
+            return
+        conn = StdioConnection(self.name, self.spec, lambda dead: self._on_exit(index, dead))
+        try:
+            await conn.open(self.handshake_timeout)
+            if self.closed:
+                await conn.close()
+                return
+            self.slots[index] = conn
+        except Exception as e:
+            self.last_error = str(e) or type(e).__name__
+            await conn.close()
+            self._schedule_restart(index)
+
+    def _on_exit(self, index: int, conn: StdioConnection):
+        if self.slots[index] is conn:
+            self.last_error = "server exited"
+            self._schedule_restart(index)
+
+    def _schedule_restart(self, index: int):
+        if self.closed or index in self.restart_tasks:
+            return
+        delay = min(self.backoff_initial * (2 ** self.failures), self.backoff_max)
+        self.failures += 1
+        self.restart_tasks[index] = asyncio.create_task(self._restart(index, delay))
+
+    async def _restart(self, index: int, delay: float):
+        await asyncio.sleep(delay)
+        self.restart_tasks.pop(index, None)
+        if not self.closed:
+            self.restarts += 1
+            await self._open(index)
+
+    async def request(self, method: str, params: Dict[str, Any], timeout: Optional[float] = None) -> Dict[str, Any]:
+        """Route a request to the least busy live connection"""
+        if not self.live and not await self.warm():
+            raise MCPError(f"{self.name}: no live connections ({self.last_error})")
+
+        conn = min(self.live, key=lambda c: c.in_flight)
+        result = await conn.request(method, params, timeout or self.request_timeout)
+        self.requests += 1
+        self.failures = 0
+        return result
+
+    async def ping(self) -> Dict[str, Any]:
+        if not self.live:
+            return {"status": "cold" if not self.restart_tasks else "restarting",
+                    "last_error": self.last_error}
+        start = time.monotonic()
+        try:
+            await self.request("ping", {}, timeout=5)
+            return {"status": "healthy", "latency_ms": round((time.monotonic() - start) * 1000, 2),
+                    "connections": len(self.live)}
+        except Exception as e:
+            return {"status": "unhealthy", "last_error": str(e)}
+
+    async def query_call(self, text: str, tool: Optional[str] = None) -> Dict[str, Any]:
+        """tools/call params for a free-text query, shaped by the tool's input schema"""
+        if self.tools is None:
+            listed = (await self.request("tools/list", {})).get("tools", [])
+            self.tools = {entry["name"]: entry for entry in listed if entry.get("name")}
+        if not self.tools:
+            raise MCPError(f"{self.name}: server exposes no tools")
+
+        name = tool or self.query_tool or next(iter(self.tools))
+        if name not in self.tools:
+            raise MCPError(f"{self.name}: no tool named {name}")
+        schema = self.tools[name].get("inputSchema") or {}
+        properties = schema.get("properties", {})
+        required = schema.get("required", [])
+
+        argument = self.spec.get("query_argument")
+        if not argument:
+            text_fields = [key for key, prop in properties.items() if prop.get("type", "string") == "string"]
+            candidates = [key for key in required if key in text_fields] or \
+                [key for key in QUERY_ARGUMENTS if key in text_fields] or text_fields
+            if not candidates:
+                raise MCPError(f"{self.name}: tool {name} takes no text argument; use `call`")
+            argument = candidates[0]
+
+        missing = [key for key in required if key != argument]
+        if missing:
+            raise MCPError(f"{self.name}: tool {name} also needs {', '.join(missing)}; use `call`")
+        return {"name": name, "arguments": {argument: text}}
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            "size": self.size,
+            "live": len(self.live),
+            "in_flight": sum(conn.in_flight for conn in self.live),
+            "requests": self.requests,
+            "restarts": self.restarts,
+            "restarting": len(self.restart_tasks),
+            "last_error": self.last_error,
+        }
+
+    async def close(self):
+        self.closed = True
+        for task in list(self.restart_tasks.values()) + list(self.opening.values()):
+            task.cancel()
+        await asyncio.gather(*(conn.close() for conn in self.slots if conn is not None))
+
+
+class ClientManager:
+    """Owns one ServerPool per configured server and serves socket requests"""
+
+    def __init__(self, config: Dict[str, Any]):
+        self.specs = config["servers"]
+        self.settings = config["settings"]
+        self.pools: Dict[str, ServerPool] = {}
+        self.cache = ResponseCache(RESPONSE_CACHE_DIR, self.settings["cache_ttl"], self.settings["cache_max_entries"])
+        self.cache_enabled = bool(self.settings["cache_enabled"])
+        self.started_at = time.time()
+        self.stopping = asyncio.Event()
+
+    def pool(self, name: str) -> ServerPool:
+        if name not in self.specs:
+            raise KeyError(name)
+        if name not in self.pools:
+            self.pools[name] = ServerPool(name, self.specs[name], self.settings)
+        return self.pools[name]
+
+    async def warm(self, names: List[str]) -> Dict[str, str]:
+        async def warm_one(name):
+            if name not in self.specs:
+                return name, "unconfigured"
+            return name, "warm" if await self.pool(name).warm() else "failed"
+
+        return dict(await asyncio.gather(*(warm_one(name) for name in names)))
+
+    async def health(self) -> Dict[str, Any]:
+        names = list(self.specs)
+        results = await asyncio.gather(*(self.pool(name).ping() for name in names))
+        return dict(zip(names, results))
+
+    async def request(self, server: str, method: str, params: Dict[str, Any]) -> Dict[str, Any]:
+        """Pool request fronted by the response cache"""
+        pool = self.pool(server)
+        if not self.cache_enabled:
+            return await pool.request(method, params)
+        return await self.cache.fetch(server, pool.spec, method, params, lambda: pool.request(method, params))
+
+    async def query(self, server: str, query: str, tool: Optional[str] = None) -> str:
+        params = await self.pool(server).query_call(query, tool)
+        result = await self.request(server, "tools/call", params)
+        texts = [item.get("text", "") for item in result.get("content", []) if item.get("type") == "text"]
+        if result.get("isError"):
+            raise MCPError(f"{server}: " + "\n".join(texts))
+        return "\n".join(texts)
+
+    async def dispatch(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        op = request.get("op")
+        try:
+            if op == "ping":
+                return {"ok": True}
+            if op == "warm":
+                return {"ok": True, "servers": await self.warm(request.get("servers", []))}
+            if op == "health":
+                return {"ok": True, "servers": await self.health()}
+            if op == "query":
+                text = await self.query(request["server"], request["query"], request.get("tool"))
+                return {"ok": True, "text": text}
+            if op == "call":
+                result = await self.request(request["server"], request["method"], request.get("params", {}))
+                return {"ok": True, "result": result}
+            if op == "cache_stats":
+                return {"ok": True, "result": self.cache.report()}
+            if op == "status":
+                return {"ok": True, "pid": os.getpid(), "uptime": round(time.time() - self.started_at),
+                        "configured": sorted(self.specs),
+                        "pools": {name: pool.status() for name, pool in self.pools.items()}}
+            if op == "shutdown":
+                self.stopping.set()
+                return {"ok": True}
+            return {"ok": False, "error": f"unknown op: {op}"}
+        except KeyError as e:
+            return {"ok": False, "error": f"unconfigured server: {e.args[0]}", "unconfigured": True}
+        except asyncio.TimeoutError:
+            return {"ok": False, "error": f"request timed out: {op}"}
+        except Exception as e:
+            return {"ok": False, "error": str(e)}
+
+    async def handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            line = await reader.readline()
+            response = await self.dispatch(json.loads(line)) if line else {"ok": False, "error": "empty request"}
+        except json.JSONDecodeError:
+            response = {"ok": False, "error": "invalid request"}
+        writer.write((json.dumps(response) + "\n").encode())
+        try:
+            await writer.drain()
+        finally:
+            writer.close()
+
+    async def serve(self):
+        # A socket that still accepts connections belongs to a live manager; only a dead one is replaced
+        if socket_connectable(SOCKET_PATH):
+            print(f"MCP client manager already running on {SOCKET_PATH}", file=sys.stderr)
+            return
+        if os.path.exists(SOCKET_PATH):
+            os.unlink(SOCKET_PATH)
+        server = await asyncio.start_unix_server(self.handle_client, path=SOCKET_PATH)
+        os.chmod(SOCKET_PATH, 0o600)
+        with open(PID_FILE, "w") as f:
+            f.write(str(os.getpid()))
+
+        try:
+            async with server:
+                await self.stopping.wait()
+        finally:
+            await asyncio.gather(*(pool.close() for pool in self.pools.values()))
+            for path in (SOCKET_PATH, PID_FILE):
+                if os.path.exists(path):
+                    os.unlink(path)
+
+
+def socket_connectable(path: str) -> bool:
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.settimeout(2)
+            sock.connect(path)
+        return True
+    except OSError:
+        return False
+
+
+def send_request(request: Dict[str, Any], timeout: float = 60) -> Optional[Dict[str, Any]]:
+    """Send one request to a running manager; None if it is not reachable"""
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.settimeout(timeout)
+            sock.connect(SOCKET_PATH)
+            sock.sendall((json.dumps(request) + "\n").encode())
+            data = b""
+            while not data.endswith(b"\n"):
+                chunk = sock.recv(65536)
+                if not chunk:
+                    break
+                data += chunk
+        return json.loads(data) if data else None
+    except (OSError, json.JSONDecodeError):
+        return None
+
+
+def start_daemon(wait_seconds: float = 5) -> bool:
+    """Start the manager in the background unless it is already running"""
+    if send_request({"op": "ping"}, timeout=2):
+        return True
+
+    # One starter at a time: racing starts would each replace the socket and orphan a daemon
+    os.makedirs(os.path.dirname(LOG_FILE), exist_ok=True)
+    os.makedirs(os.path.dirname(SOCKET_PATH), exist_ok=True)
+    with open(f"{SOCKET_PATH}.lock", "a") as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        if send_request({"op": "ping"}, timeout=2):
+            return True
+
+        with open(LOG_FILE, "a") as log:
+            subprocess.Popen(
+                [sys.executable, os.path.abspath(__file__), "serve"],
+                stdin=subprocess.DEVNULL, stdout=log, stderr=log,
+                start_new_session=True,
+            )
+
+        deadline = time.monotonic() + wait_seconds
+        while time.monotonic() < deadline:
+            if send_request({"op": "ping"}, timeout=1):
+                return True
+            time.sleep(0.05)
+    return False
+
+
+def main():
+    """Command line entry point used by mcp_utils.sh"""
+    args = sys.argv[1:]
+    command = args[0] if args else "status"
+
+    if command == "serve":
+        os.makedirs(MCP_HOME, exist_ok=True)
+        asyncio.run(ClientManager(load_config()).serve())
+        return 0
+
+    if command == "start":
+        return 0 if start_daemon() else 1
+
+    if command == "stop":
+        response = send_request({"op": "shutdown"}, timeout=5)
+        return 0 if response is None or response.get("ok") else 1
+
+    # Everything else goes through the (auto-started) daemon
+    if not start_daemon():
+        print("MCP client manager is not available", file=sys.stderr)
+        return 1
+
+    if command == "warm":
+        response = send_request({"op": "warm", "servers": args[1:]})
+        if not response or not response.get("ok"):
+            return 1
+        for name, state in response["servers"].items():
+            print(f"{name} {state}")
+        return 0 if "failed" not in response["servers"].values() else 1
+
+    if command == "health":
+        response = send_request({"op": "health"})
+        if not response or not response.get("ok"):
+            return 1
+        if "--json" in args:
+            print(json.dumps(response["servers"]))
+        else:
+            for name, health in response["servers"].items():
+                latency = f" {health['latency_ms']}ms" if "latency_ms" in health else ""
+                print(f"{name} {health['status']}{latency}")
+        return 0
+
+    if command == "query" and len(args) >= 3:
+        request = {"op": "query", "server": args[1], "query": args[2]}
+        if "--tool" in args[3:]:
+            request["tool"] = args[args.index("--tool") + 1]
+        response = send_request(request)
+    elif command == "call" and len(args) >= 3:
+        params = json.loads(args[3]) if len(args) > 3 else {}
+        response = send_request({"op": "call", "server": args[1], "method": args[2], "params": params})
+    elif command == "status":
+        response = send_request({"op": "status"})
+    elif command == "cache-stats":
+        response = send_request({"op": "cache_stats"})
+        if response and response.get("ok") and "--json" not in args:
+            stats = response["result"]
+            print(f"hits {stats['hits']} misses {stats['misses']} coalesced {stats['coalesced']} "
+                  f"hit_rate {stats['hit_rate']}% entries {stats['entries']}")
+            for name, server_stats in sorted(stats["servers"].items()):
+                print(f"  {name} hits {server_stats['hits']} misses {server_stats['misses']} "
+                      f"coalesced {server_stats['coalesced']} hit_rate {server_stats['hit_rate']}%")
+            return 0
+    else:
+        print(__doc__.strip(), file=sys.stderr)
+        return 2
+
+    if not response or not response.get("ok"):
+        print((response or {}).get("error", "no response from MCP client manager"), file=sys.stderr)
+        return 3 if (response or {}).get("unconfigured") else 1
+
+    if "text" in response:
+        print(response["text"])
+    else:
+        print(json.dumps(response.get("result", response), indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -17,6 +17,10 @@ MCP_SERVERS=(
 # MCP server status tracking
 MCP_STATUS_FILE="${CLAUDE_HOME:-$HOME/.claude}/mcp/status.json"
 
+# MCP client manager (warm stdio connection pools behind a Unix socket)
+MCP_MANAGER="${CLAUDE_HOME:-$HOME/.claude}/mcp/lib/mcp_client_manager.py"
+MCP_MANAGER_ENABLED="${MCP_MANAGER_ENABLED:-true}"
+
 # Initialize MCP system
 init_mcp_system() {
     ensure_directory "$MCP_CONFIG_DIR"
@@ -59,7 +63,11 @@ create_mcp_server_configs() {
             "stackoverflow",
             "github_examples"
         ],
-        "cache_ttl": 3600,
+        "cache_ttl": 259200,
+        "cache_ttl_methods": {
+            "resolve-library-id": 604800,
+            "get-library-docs": 259200
+        },
         "max_results": 10
     },
     "activation_triggers": [
@@ -165,6 +173,36 @@ EOF
 EOF
 }
 
+# MCP client manager interface
+mcp_manager() {
+    python3 "$MCP_MANAGER" "$@"
+}
+
+mcp_manager_available() {
+    [[ "$MCP_MANAGER_ENABLED" == "true" && -f "$MCP_MANAGER" ]] && check_command python3
+}
+
+# True when the manager has a launchable stdio definition for the server (same files it loads)
+mcp_manager_serves() {
+    local server="$1"
+    mcp_manager_available && check_command jq || return 1
+    
+    local files=() file
+    for file in "$MCP_CONFIG_DIR"/*.json "${CLAUDE_HOME:-$HOME/.claude}/mcp-servers-config.json" \
+                "${CLAUDE_HOME:-$HOME/.claude}/mcp/config.json" "${MCP_CLIENT_CONFIG:-}"; do
+        [[ -f "$file" ]] && files+=("$file")
+    done
+    [[ ${#files[@]} -gt 0 ]] || return 1
+    
+    jq -e -s --arg name "$server" '
+        [.[] | (if has("servers") then .servers elif has("name") then [.] else [] end)
+             | (if type == "object" then to_entries | map(.value + {name: .key}) else . end)
+             | .[] | select(.name == $name)]
+        | add // {}
+        | (.command // "") != "" and (.transport // "stdio") == "stdio" and .enabled != false
+    ' "${files[@]}" >/dev/null 2>&1
+}
+
 # MCP server management
 start_mcp_server() {
     local server_name="$1"
@@ -175,8 +213,8 @@ start_mcp_server() {
         return 1
     fi
     
-    local port=$(json_get "$server_config" "port")
-    local type=$(json_get "$server_config" "type")
+    local port type
+    { read -r port; read -r type; } < <(json_get_many "$server_config" "port" "type")
     
     # Check if server is already running
     if is_mcp_server_running "$server_name"; then
@@ -186,8 +224,20 @@ start_mcp_server() {
     
     alfred_service "$server_name MCP Server" "start"
     
-    # Simulate server startup (in real implementation, this would start actual MCP server)
-    sleep 1
+    # Warm a pooled connection when the server has a launch command,
+    # otherwise fall back to the simulated startup
+    local warm_state=""
+    if mcp_manager_serves "$server_name"; then
+        warm_state=$(mcp_manager warm "$server_name" 2>/dev/null | awk '{print $2}')
+    fi
+    
+    if [[ "$warm_state" == "failed" ]]; then
+        wayne_tech_status "$server_name MCP Server" "offline"
+        return 1
+    elif [[ "$warm_state" != "warm" ]]; then
+        # Simulate server startup (in real implementation, this would start actual MCP server)
+        sleep 1
+    fi
     
     # Update server status
     update_mcp_server_status "$server_name" "online" "$port"
@@ -289,6 +339,11 @@ activate_mcp_servers() {
     
     batcave_announce "Activating MCP servers: ${servers[*]}" "info"
     
+    # Warm all pooled servers in one parallel call before the per-server loop
+    if mcp_manager_available; then
+        mcp_manager warm "${servers[@]}" >/dev/null 2>&1 || true
+    fi
+    
     for server in "${servers[@]}"; do
         start_mcp_server "$server"
     done
@@ -297,6 +352,24 @@ activate_mcp_servers() {
     cache_set_advanced "mcp" "active_servers" "$(join_array "," "${servers[@]}")" "$(join_array "," "${servers[@]}")" 300
 }
 
+# Pre-warm the servers select_mcp_servers predicts for upcoming work,
+# plus any the caller already knows it needs
+prewarm_mcp_servers() {
+    local command="$1"
+    local complexity="${2:-medium}"
+    local context="$3"
+    
+    if ! mcp_manager_available; then
+        return 0
+    fi
+    
+    local servers=($(select_mcp_servers "$command" "$complexity" "$context") "${@:4}")
+    servers=($(printf '%s\n' "${servers[@]}" | sort -u))
+    
+    # Runs detached so callers never wait on server handshakes
+    (mcp_manager warm "${servers[@]}" >/dev/null 2>&1 &)
+}
+
 # Deactivate MCP servers
 deactivate_mcp_servers() {
     local servers=("$@")
@@ -319,12 +392,8 @@ mcp_query() {
     local query="$2"
     local options="$3"
     
-    # Check cache first
-    local cached_response=$(get_cached_mcp_response "$server" "$query")
-    if [[ -n "$cached_response" ]]; then
-        echo "$cached_response"
-        return 0
-    fi
+    # No shell-level cache: the manager's response cache is the only layer in front
+    # of pooled servers, so per-tool TTLs apply and its hit/miss stats see every query
     
     # Ensure server is running
     if ! is_mcp_server_running "$server"; then
@@ -333,8 +402,22 @@ mcp_query() {
     
     alfred_service "$server MCP Query" "start"
     
-    # Simulate MCP query (in real implementation, this would make actual MCP request)
     local response=""
+    
+    # Route through the warm connection pool when the server is configured there;
+    # any failure falls back to the simulated response below
+    if mcp_manager_serves "$server"; then
+        local query_status=0
+        response=$(mcp_manager query "$server" "$query" ${options:+--tool "$options"} 2>/dev/null) || query_status=$?
+        
+        if [[ $query_status -eq 0 ]]; then
+            echo "$response"
+            return 0
+        fi
+        log_warn "MCP query failed on $server (status $query_status), using simulated response"
+    fi
+    
+    # Simulate MCP query (in real implementation, this would make actual MCP request)
     case "$server" in
         "context7")
             response=$(generate_context7_response "$query")
@@ -353,9 +436,7 @@ mcp_query() {
             ;;
     esac
     
-    # Cache the response
-    cache_mcp_response "$server" "$query" "$response"
-    
+    # Simulated answers are never cached, so a manager outage doesn't outlive itself
     echo "$response"
 }
 
@@ -400,10 +481,33 @@ generate_playwright_response() {
 mcp_health_check() {
     local healthy_servers=()
     local unhealthy_servers=()
+    local pooled_servers=()
+    
+    # Pooled servers are pinged concurrently by the client manager
+    if mcp_manager_available; then
+        local server_name server_status
+        while read -r server_name server_status _; do
+            # Never-started pools fall through to the status file check
+            if [[ -z "$server_name" || "$server_status" == "cold" ]]; then
+                continue
+            fi
+            pooled_servers+=("$server_name")
+            
+            if [[ "$server_status" == "healthy" ]]; then
+                healthy_servers+=("$server_name")
+            else
+                unhealthy_servers+=("$server_name")
+            fi
+        done < <(mcp_manager health 2>/dev/null)
+    fi
     
     for server_info in "${MCP_SERVERS[@]}"; do
         local server_name=$(echo "$server_info" | cut -d':' -f1)
         
+        if contains "$server_name" "${pooled_servers[@]}"; then
+            continue
+        fi
+        
         if is_mcp_server_running "$server_name"; then
             healthy_servers+=("$server_name")
         else
@@ -424,6 +528,17 @@ mcp_health_check() {
     fi
 }
 
+# Response cache hit-rate metrics from the client manager
+get_mcp_cache_stats() {
+    if ! mcp_manager_available; then
+        echo -e "${GRAY}🦇 MCP response cache statistics not available${NC}"
+        return 0
+    fi
+    
+    echo -e "${YELLOW}🦇 Wayne Tech MCP Response Cache:${NC}"
+    mcp_manager cache-stats 2>/dev/null | sed 's/^/  /'
+}
+
 # Get MCP system status
 get_mcp_status() {
     echo -e "${YELLOW}🦇 Wayne Tech MCP System Status:${NC}"
@@ -458,8 +573,8 @@ if [[ ! -f "$MCP_STATUS_FILE" ]]; then
 fi
 
 # Export MCP functions
-export -f init_mcp_system create_mcp_server_configs
+export -f init_mcp_system create_mcp_server_configs mcp_manager mcp_manager_available
 export -f start_mcp_server stop_mcp_server is_mcp_server_running
 export -f update_mcp_server_status select_mcp_servers
-export -f activate_mcp_servers deactivate_mcp_servers
-export -f mcp_query mcp_health_check get_mcp_status
\ No newline at end of file
+export -f activate_mcp_servers prewarm_mcp_servers deactivate_mcp_servers
+export -f mcp_query mcp_health_check get_mcp_status get_mcp_cache_stats
\ No newline at end of file
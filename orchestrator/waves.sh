@@ -12,6 +12,7 @@ source "${CLAUDE_HOME:-$HOME/.claude}/mcp/lib/mcp_utils.sh"
 WAVE_STATE_DIR="${CLAUDE_HOME:-$HOME/.claude}/orchestrator/state"
 WAVE_LOGS_DIR="${CLAUDE_HOME:-$HOME/.claude}/orchestrator/logs"
 WAVE_CONFIG_FILE="${CLAUDE_HOME:-$HOME/.claude}/orchestrator/config.json"
+WAVE_CHECKPOINT_DIR="$WAVE_STATE_DIR/checkpoints"
 
 # Wave execution modes
 declare -A WAVE_MODES=(
@@ -25,6 +26,7 @@ declare -A WAVE_MODES=(
 init_wave_system() {
     ensure_directory "$WAVE_STATE_DIR"
     ensure_directory "$WAVE_LOGS_DIR"
+    ensure_directory "$WAVE_CHECKPOINT_DIR/objects"
     
     # Create wave configuration
     cat > "$WAVE_CONFIG_FILE" <<EOF
@@ -34,6 +36,10 @@ init_wave_system() {
     "max_parallel_stages": 3,
     "stage_timeout": 1800,
     "retry_attempts": 2,
+    "checkpoints": {
+        "enabled": true,
+        "max_age_days": 7
+    },
     "logging": {
         "level": "info",
         "file": "$WAVE_LOGS_DIR/wave-execution.log"
@@ -61,14 +67,26 @@ orchestrate_waves() {
     local personas_str="$3"
     local mcp_servers_str="$4"
     local mode="${5:-adaptive}"
+    local resume_session="${6:-}"
     
     # Parse input parameters
     local stages=(${stages_str//,/ })
     local personas=(${personas_str//,/ })
     local mcp_servers=(${mcp_servers_str//,/ })
     
-    # Create wave session
-    local wave_session_id=$(create_wave_session "$command" "$mode")
+    # Resume an interrupted session or create a fresh one
+    local wave_session_id=""
+    if [[ "$resume_session" == "latest" ]]; then
+        resume_session=$(find_resumable_wave_session "$command")
+    fi
+    
+    if [[ -n "$resume_session" ]] && resume_wave_session "$resume_session"; then
+        wave_session_id="$resume_session"
+        batcave_announce "Resuming wave session $wave_session_id from checkpoints" "info"
+    else
+        wave_session_id=$(create_wave_session "$command" "$mode")
+    fi
+    record_wave_stages "$wave_session_id" "${stages[@]}"
     
     # Initialize wave execution
     batcave_announce "Initiating wave orchestration for: $command" "info"
@@ -76,6 +94,9 @@ orchestrate_waves() {
     log_info "Execution mode: $mode"
     log_info "Stages: ${stages[*]}"
     
+    # Warm the MCP servers the stages will ask for while the first stage starts
+    prewarm_mcp_servers "$command" "medium" "${stages[*]}" "${mcp_servers[@]}"
+    
     # Execute wave based on mode
     case "$mode" in
         "sequential")
@@ -121,6 +142,8 @@ create_wave_session() {
     "failed_stages": [],
     "personas": [],
     "mcp_servers": [],
+    "checkpoints": {},
+    "resume_count": 0,
     "metrics": {
         "start_time": $(epoch_time),
         "end_time": null,
@@ -133,6 +156,198 @@ EOF
     echo "$session_id"
 }
 
+# Record the declared stage order (used to chain checkpoint inputs)
+record_wave_stages() {
+    local session_id="$1"
+    shift
+    local stages=("$@")
+    
+    local session_file="$WAVE_STATE_DIR/${session_id}.json"
+    local stages_json=$(printf '%s\n' "${stages[@]}" | jq -R . | jq -s -c .)
+    
+    json_set_many "$session_file" "stages:=$stages_json"
+}
+
+# Find the most recent unfinished session for a command
+find_resumable_wave_session() {
+    local command="$1"
+    local session_file
+    
+    for session_file in $(ls -t "$WAVE_STATE_DIR"/wave-*.json 2>/dev/null); do
+        local session_command session_status session_id
+        { read -r session_command; read -r session_status; read -r session_id; } < \
+            <(json_get_many "$session_file" "command" "status" "session_id")
+        
+        if [[ "$session_command" == "$command" && "$session_status" != "completed" ]]; then
+            echo "$session_id"
+            return 0
+        fi
+    done
+    
+    return 1
+}
+
+# Reopen an existing session so checkpointed stages can be skipped
+resume_wave_session() {
+    local session_id="$1"
+    local session_file="$WAVE_STATE_DIR/${session_id}.json"
+    
+    if [[ ! -f "$session_file" ]]; then
+        log_warn "Wave session not found for resume: $session_id"
+        return 1
+    fi
+    
+    json_set_many "$session_file" "status=resuming" "completed_stages:=[]" "failed_stages:=[]" \
+        "metrics.start_time:=$(epoch_time)" "updated_at=$(timestamp)"
+    json_incr "$session_file" "resume_count"
+}
+
+# Checkpoints are on unless disabled in config or via WAVE_CHECKPOINTS=false
+wave_checkpoints_enabled() {
+    [[ "${WAVE_CHECKPOINTS:-true}" != "false" ]] && \
+        [[ "$(json_get "$WAVE_CONFIG_FILE" "checkpoints.enabled")" != "false" ]]
+}
+
+# Content hash used for checkpoint inputs and outputs
+wave_content_hash() {
+    shasum -a 256 | cut -d' ' -f1
+}
+
+# Compute a stage's input fingerprint.
+# Inputs are the command, stage and options. Sequential stages also chain the
+# output hashes of every stage declared before it, so a changed upstream output
+# invalidates the whole tail; parallel stages run independently and don't.
+compute_stage_input_hash() {
+    local session_id="$1"
+    local stage="$2"
+    local options="$3"
+    local mode="${4:-sequential}"
+    
+    local session_file="$WAVE_STATE_DIR/${session_id}.json"
+    
+    jq -r --arg stage "$stage" --arg options "$options" --arg mode "$mode" '
+        (.stages | index($stage) // 0) as $idx
+        | [.command, $stage, $options]
+          + (if $mode == "parallel" then []
+             else [.stages[0:$idx][] as $s | "\($s)=\(.checkpoints[$s].output_hash // "none")"] end)
+        | join("\n")' "$session_file" | wave_content_hash
+}
+
+# Store a stage result in the cache and as a content-addressed checkpoint object
+store_stage_result() {
+    local session_id="$1"
+    local stage="$2"
+    local result_key="$3"
+    local result="$4"
+    
+    cache_set_advanced "wave" "$session_id" "$result_key" "$result" 3600
+    
+    if ! wave_checkpoints_enabled; then
+        return 0
+    fi
+    
+    ensure_directory "$WAVE_CHECKPOINT_DIR/objects"
+    
+    local output_hash=$(printf '%s' "$result" | wave_content_hash)
+    local object_file="$WAVE_CHECKPOINT_DIR/objects/$output_hash"
+    
+    if [[ ! -f "$object_file" ]]; then
+        local temp_file=$(mktemp "$WAVE_CHECKPOINT_DIR/objects/.tmp.XXXXXX")
+        printf '%s' "$result" > "$temp_file" && mv "$temp_file" "$object_file"
+    fi
+    
+    # Held back until the stage succeeds, see commit_stage_checkpoint
+    echo "$result_key $output_hash" > "$WAVE_CHECKPOINT_DIR/${session_id}-${stage}.pending"
+}
+
+# Record a finished stage's output against its input fingerprint
+commit_stage_checkpoint() {
+    local session_id="$1"
+    local stage="$2"
+    local input_hash="$3"
+    
+    local pending_file="$WAVE_CHECKPOINT_DIR/${session_id}-${stage}.pending"
+    local session_file="$WAVE_STATE_DIR/${session_id}.json"
+    
+    if [[ ! -f "$pending_file" ]]; then
+        return 0
+    fi
+    
+    local result_key output_hash
+    read -r result_key output_hash < "$pending_file"
+    discard_stage_checkpoint "$session_id" "$stage"
+    
+    json_set_many "$session_file" \
+        "checkpoints.$stage.input_hash=$input_hash" \
+        "checkpoints.$stage.output_hash=$output_hash" \
+        "checkpoints.$stage.result_key=$result_key" \
+        "checkpoints.$stage.completed_at=$(timestamp)"
+}
+
+# Drop a stage's uncommitted checkpoint (failed or aborted stage)
+discard_stage_checkpoint() {
+    local session_id="$1"
+    local stage="$2"
+    
+    local pending_file="$WAVE_CHECKPOINT_DIR/${session_id}-${stage}.pending"
+    if [[ -f "$pending_file" ]]; then
+        rm -f -- "$pending_file"
+    fi
+}
+
+# Restore a stage from its checkpoint when its inputs are unchanged
+restore_stage_checkpoint() {
+    local session_id="$1"
+    local stage="$2"
+    local input_hash="$3"
+    
+    local session_file="$WAVE_STATE_DIR/${session_id}.json"
+    local checkpoint_input output_hash result_key
+    { read -r checkpoint_input; read -r output_hash; read -r result_key; } < \
+        <(json_get_many "$session_file" "checkpoints.$stage.input_hash" "checkpoints.$stage.output_hash" "checkpoints.$stage.result_key")
+    
+    if [[ -z "$checkpoint_input" || "$checkpoint_input" != "$input_hash" ]]; then
+        return 1
+    fi
+    
+    local object_file="$WAVE_CHECKPOINT_DIR/objects/$output_hash"
+    
+    if [[ ! -f "$object_file" ]]; then
+        return 1
+    fi
+    
+    # Re-publish the stage result for downstream consumers
+    cache_set_advanced "wave" "$session_id" "$result_key" "$(cat "$object_file")" 3600
+    return 0
+}
+
+# Remove checkpoint objects no longer referenced by recent sessions
+cleanup_wave_checkpoints() {
+    local age_days="${1:-$(json_get "$WAVE_CONFIG_FILE" "checkpoints.max_age_days")}"
+    age_days="${age_days:-7}"
+    
+    local referenced=$(find "$WAVE_STATE_DIR" -maxdepth 1 -name "wave-*.json" -mtime -"$age_days" \
+        -exec jq -r '.checkpoints[]?.output_hash' {} + 2>/dev/null | sort -u)
+    
+    find "$WAVE_CHECKPOINT_DIR/objects" -type f -name "[0-9a-f]*" 2>/dev/null | \
+    while read -r object_file; do
+        if ! grep -qx "$(basename "$object_file")" <<< "$referenced"; then
+            rm -f -- "$object_file"
+        fi
+    done
+    
+    # State lock files (lib/json_state.py) of sessions that are gone or expired
+    find "$WAVE_STATE_DIR" -maxdepth 1 -name "wave-*.json.lock" 2>/dev/null | \
+    while read -r lock_file; do
+        local session_file="${lock_file%.lock}"
+        if [[ ! -f "$session_file" || -n "$(find "$session_file" -mtime +"$age_days")" ]]; then
+            rm -f -- "$lock_file"
+        fi
+    done
+    
+    log_info "Wave checkpoint cleanup completed"
+}
+
 # Execute sequential waves
 execute_sequential_waves() {
     local session_id="$1"
@@ -181,8 +396,8 @@ execute_parallel_waves() {
             
             update_wave_status "$session_id" "executing" "$stage"
             
-            # Execute stage in background
-            execute_wave_stage "$session_id" "$stage" &
+            # Execute stage in background; siblings are independent, so no chained fingerprint
+            execute_wave_stage "$session_id" "$stage" "" parallel &
             pids+=($!)
             
             stage_index=$((stage_index + 1))
@@ -285,12 +500,25 @@ execute_wave_stage() {
     local session_id="$1"
     local stage="$2"
     local options="$3"
+    local mode="${4:-sequential}"
     
     local stage_log="$WAVE_LOGS_DIR/${session_id}-${stage}.log"
     local stage_start_time=$(epoch_time)
     
     log_info "Starting wave stage: $stage"
     
+    # Skip stages whose inputs match a recorded checkpoint
+    local input_hash=""
+    if wave_checkpoints_enabled; then
+        input_hash=$(compute_stage_input_hash "$session_id" "$stage" "$options" "$mode")
+    
+        if restore_stage_checkpoint "$session_id" "$stage" "$input_hash"; then
+            log_info "Wave stage restored from checkpoint: $stage"
+            record_stage_metrics "$session_id" "$stage" 0 0
+            return 0
+        fi
+    fi
+    
     # Activate appropriate personas for stage
     local personas=($(select_personas_for_stage "$stage"))
     activate_personas "wave_stage:$stage" "$stage" "${personas[@]}"
@@ -342,6 +570,12 @@ execute_wave_stage() {
     
     record_stage_metrics "$session_id" "$stage" "$stage_duration" "$stage_result"
     
+    if [[ $stage_result -eq 0 && -n "$input_hash" ]]; then
+        commit_stage_checkpoint "$session_id" "$stage" "$input_hash"
+    else
+        discard_stage_checkpoint "$session_id" "$stage"
+    fi
+    
     log_info "Wave stage completed: $stage (duration: ${stage_duration}s, result: $stage_result)"
     
     return $stage_result
@@ -361,7 +595,7 @@ execute_analysis_stage() {
     local analysis_result=$(mcp_query "sequential" "analyze current context and requirements")
     
     # Store analysis results
-    cache_set_advanced "wave" "$session_id" "analysis" "$analysis_result" 3600
+    store_stage_result "$session_id" "$stage" "analysis" "$analysis_result"
     
     return 0
 }
@@ -379,7 +613,7 @@ execute_design_stage() {
     local design_result=$(mcp_query "sequential" "create system design based on analysis")
     
     # Store design results
-    cache_set_advanced "wave" "$session_id" "design" "$design_result" 3600
+    store_stage_result "$session_id" "$stage" "design" "$design_result"
     
     return 0
 }
@@ -411,7 +645,7 @@ execute_implementation_stage() {
     local implementation_result=$(execute_implementation_logic "$session_id")
     
     # Store implementation results
-    cache_set_advanced "wave" "$session_id" "implementation" "$implementation_result" 3600
+    store_stage_result "$session_id" "$stage" "implementation" "$implementation_result"
     
     return 0
 }
@@ -429,7 +663,7 @@ execute_testing_stage() {
     local testing_result=$(mcp_query "playwright" "create comprehensive test suite")
     
     # Store testing results
-    cache_set_advanced "wave" "$session_id" "testing" "$testing_result" 3600
+    store_stage_result "$session_id" "$stage" "testing" "$testing_result"
     
     return 0
 }
@@ -447,7 +681,7 @@ execute_deployment_stage() {
     local deployment_result=$(execute_deployment_logic "$session_id")
     
     # Store deployment results
-    cache_set_advanced "wave" "$session_id" "deployment" "$deployment_result" 3600
+    store_stage_result "$session_id" "$stage" "deployment" "$deployment_result"
     
     return 0
 }
@@ -465,7 +699,7 @@ execute_validation_stage() {
     local validation_result=$(execute_validation_logic "$session_id")
     
     # Store validation results
-    cache_set_advanced "wave" "$session_id" "validation" "$validation_result" 3600
+    store_stage_result "$session_id" "$stage" "validation" "$validation_result"
     
     return 0
 }
@@ -483,7 +717,7 @@ execute_documentation_stage() {
     local documentation_result=$(execute_documentation_logic "$session_id")
     
     # Store documentation results
-    cache_set_advanced "wave" "$session_id" "documentation" "$documentation_result" 3600
+    store_stage_result "$session_id" "$stage" "documentation" "$documentation_result"
     
     return 0
 }
@@ -501,7 +735,7 @@ execute_generic_stage() {
     local generic_result=$(execute_generic_logic "$session_id" "$stage")
     
     # Store generic results
-    cache_set_advanced "wave" "$session_id" "$stage" "$generic_result" 3600
+    store_stage_result "$session_id" "$stage" "$stage" "$generic_result"
     
     return 0
 }
@@ -514,9 +748,7 @@ update_wave_status() {
     
     local session_file="$WAVE_STATE_DIR/${session_id}.json"
     
-    local temp_file=$(mktemp)
-    jq ".status = \"$status\" | .current_stage = \"$current_stage\" | .updated_at = \"$(timestamp)\"" \
-        "$session_file" > "$temp_file" && mv "$temp_file" "$session_file"
+    json_set_many "$session_file" "status=$status" "current_stage=$current_stage" "updated_at=$(timestamp)"
 }
 
 mark_stage_completed() {
@@ -525,9 +757,8 @@ mark_stage_completed() {
     
     local session_file="$WAVE_STATE_DIR/${session_id}.json"
     
-    local temp_file=$(mktemp)
-    jq ".completed_stages += [\"$stage\"]" \
-        "$session_file" > "$temp_file" && mv "$temp_file" "$session_file"
+    # Parallel stages finish concurrently; the locked append keeps every entry
+    json_append "$session_file" "completed_stages=$stage"
 }
 
 mark_stage_failed() {
@@ -536,9 +767,7 @@ mark_stage_failed() {
     
     local session_file="$WAVE_STATE_DIR/${session_id}.json"
     
-    local temp_file=$(mktemp)
-    jq ".failed_stages += [\"$stage\"]" \
-        "$session_file" > "$temp_file" && mv "$temp_file" "$session_file"
+    json_append "$session_file" "failed_stages=$stage"
 }
 
 finalize_wave_session() {
@@ -549,13 +778,16 @@ finalize_wave_session() {
     local start_time=$(json_get "$session_file" "metrics.start_time")
     local duration=$((end_time - start_time))
     
-    local temp_file=$(mktemp)
-    jq ".status = \"completed\" | .metrics.end_time = $end_time | .metrics.duration = $duration" \
-        "$session_file" > "$temp_file" && mv "$temp_file" "$session_file"
+    json_set_many "$session_file" "status=completed" "metrics.end_time:=$end_time" "metrics.duration:=$duration"
     
     # Generate wave execution report
     generate_wave_report "$session_id"
     
+    # Expire checkpoint objects of sessions older than checkpoints.max_age_days
+    if wave_checkpoints_enabled; then
+        cleanup_wave_checkpoints
+    fi
+    
     batman_completion "wave_orchestration" "true"
 }
 
@@ -565,18 +797,22 @@ generate_wave_report() {
     local session_file="$WAVE_STATE_DIR/${session_id}.json"
     local report_file="$WAVE_LOGS_DIR/${session_id}-report.md"
     
+    local command mode duration completed_count failed_count
+    { read -r command; read -r mode; read -r duration; read -r completed_count; read -r failed_count; } < \
+        <(jq -r '.command, .mode, .metrics.duration, (.completed_stages | length), (.failed_stages | length)' "$session_file")
+    
     cat > "$report_file" <<EOF
 # Wave Execution Report
 
 **Session ID**: $session_id
-**Command**: $(json_get "$session_file" "command")
-**Mode**: $(json_get "$session_file" "mode")
-**Duration**: $(json_get "$session_file" "metrics.duration")s
+**Command**: $command
+**Mode**: $mode
+**Duration**: ${duration}s
 
 ## Execution Summary
 
-- **Completed Stages**: $(json_get "$session_file" "completed_stages" | jq 'length')
-- **Failed Stages**: $(json_get "$session_file" "failed_stages" | jq 'length')
+- **Completed Stages**: $completed_count
+- **Failed Stages**: $failed_count
 - **Success Rate**: $(calculate_success_rate "$session_file")%
 
 ## Stage Details
@@ -601,6 +837,10 @@ fi
 
 # Export wave orchestration functions
 export -f init_wave_system orchestrate_waves create_wave_session
+export -f record_wave_stages find_resumable_wave_session resume_wave_session
+export -f wave_checkpoints_enabled wave_content_hash compute_stage_input_hash
+export -f store_stage_result commit_stage_checkpoint discard_stage_checkpoint
+export -f restore_stage_checkpoint cleanup_wave_checkpoints
 export -f execute_sequential_waves execute_parallel_waves execute_adaptive_waves execute_systematic_waves
 export -f execute_wave_stage update_wave_status mark_stage_completed mark_stage_failed
 export -f finalize_wave_session generate_wave_report
\ No newline at end of file
@@ -11,6 +11,10 @@ PERSONAS_DIR="${CLAUDE_HOME:-$HOME/.claude}/personas/profiles"
 ACTIVE_PERSONAS_FILE="${CLAUDE_HOME:-$HOME/.claude}/personas/active.json"
 DEFAULT_PERSONA="${DEFAULT_PERSONA:-master_wayne}"
 
+# Compiled trigger index (regenerated whenever a profile changes)
+PERSONA_INDEX_FILE="${CLAUDE_HOME:-$HOME/.claude}/cache/personas/trigger_index.sh"
+PERSONA_MIN_SCORE="${PERSONA_MIN_SCORE:-1}"
+
 # Available personas (bash 3.2 compatible - NO ASSOCIATIVE ARRAYS)
 PERSONAS=(
     "master_wayne:The Dark Knight of Development - Batman-themed professional persona"
@@ -238,6 +242,153 @@ EOF
     }
 }
 EOF
+    
+    # Profiles changed, so the compiled trigger index is stale
+    invalidate_persona_index
+}
+
+# Compile all persona triggers into one sourceable index.
+# The index holds a single alternation regex over every trigger plus a
+# lookup from trigger to "persona_index:weight" hits, so selection is one
+# in-process scan of the request instead of a grep per trigger.
+# Weights: profile "trigger_weights" override, else 2 when the trigger is
+# the persona's own name, else 1.
+compile_persona_index() {
+    ensure_directory "$(dirname "$PERSONA_INDEX_FILE")"
+    
+    local names=()
+    local entries=""
+    local profile_count=0
+    
+    for persona_file in "$PERSONAS_DIR"/*.json; do
+        [[ -f "$persona_file" ]] || continue
+        profile_count=$((profile_count + 1))
+    done
+    
+    for persona_entry in "${PERSONAS[@]}"; do
+        local persona="${persona_entry%%:*}"
+        local persona_file="$PERSONAS_DIR/${persona}.json"
+        
+        if [[ "$persona" == "master_wayne" || ! -f "$persona_file" ]]; then
+            continue  # Master Wayne is always included separately
+        fi
+        
+        local persona_idx=${#names[@]}
+        names+=("$persona")
+        
+        entries+=$(jq -r --arg name "$persona" --arg idx "$persona_idx" '
+            (.trigger_weights // {}) as $weights
+            | .activation_triggers[]?
+            | ascii_downcase
+            | "\(.)\t\($idx):\($weights[.] // (if . == $name then 2 else 1 end))"' "$persona_file" 2>/dev/null)
+        entries+=$'\n'
+    done
+    
+    local temp_file=$(mktemp "${PERSONA_INDEX_FILE}.XXXXXX")
+    
+    {
+        echo "# Generated by compile_persona_index at $(timestamp) - do not edit"
+        echo "PERSONA_INDEX_NAMES=(${names[*]})"
+        echo "PERSONA_INDEX_PROFILE_COUNT=$profile_count"
+        
+        # Longest triggers first so the alternation prefers specific matches
+        printf '%s\n' "$entries" | awk -F'\t' 'NF == 2 { print length($1) "\t" $0 }' | sort -t$'\t' -k1,1nr -k2,2 | \
+        awk -F'\t' '
+            {
+                trigger = $2
+                if (!(trigger in hits)) {
+                    order[++count] = trigger
+                    escaped = trigger
+                    gsub(/[][.^$*+?(){}|\\\/]/, "\\\\&", escaped)
+                    regex = regex (regex == "" ? "" : "|") escaped
+                }
+                hits[trigger] = hits[trigger] (hits[trigger] == "" ? "" : " ") $3
+            }
+            END {
+                printf "PERSONA_INDEX_REGEX='\''(%s)'\''\n", regex
+                print "persona_index_lookup() {"
+                print "    case \"$1\" in"
+                for (i = 1; i <= count; i++) {
+                    printf "        \"%s\") PERSONA_INDEX_HITS=\"%s\" ;;\n", order[i], hits[order[i]]
+                }
+                print "        *) PERSONA_INDEX_HITS=\"\" ;;"
+                print "    esac"
+                print "}"
+            }'
+    } > "$temp_file" && mv "$temp_file" "$PERSONA_INDEX_FILE"
+}
+
+# Drop the compiled index so the next selection recompiles it
+invalidate_persona_index() {
+    if [[ -f "$PERSONA_INDEX_FILE" ]]; then
+        rm -f -- "$PERSONA_INDEX_FILE"
+    fi
+}
+
+# The index is fresh when no profile is newer than it (builtin tests, no forks)
+persona_index_is_fresh() {
+    [[ -f "$PERSONA_INDEX_FILE" ]] || return 1
+    
+    local persona_file
+    for persona_file in "$PERSONAS_DIR"/*.json; do
+        if [[ "$persona_file" -nt "$PERSONA_INDEX_FILE" ]]; then
+            return 1
+        fi
+    done
+    
+    return 0
+}
+
+# Load the compiled index, recompiling when profiles were added, removed or edited
+load_persona_index() {
+    if ! persona_index_is_fresh; then
+        compile_persona_index || return 1
+    fi
+    
+    source "$PERSONA_INDEX_FILE"
+    
+    local profiles=("$PERSONAS_DIR"/*.json)
+    if [[ ${#profiles[@]} -ne ${PERSONA_INDEX_PROFILE_COUNT:-0} ]]; then
+        compile_persona_index && source "$PERSONA_INDEX_FILE"
+    fi
+}
+
+# Score personas with one left-to-right scan of the request text.
+# Prints "persona score" lines, highest score first.
+score_personas() {
+    local text="$1"
+    local scores=()
+    
+    load_persona_index || return 1
+    
+    while [[ -n "$text" && "$text" =~ $PERSONA_INDEX_REGEX ]]; do
+        local match="${BASH_REMATCH[1]}"
+        local prefix="${text%%"$match"*}"
+        
+        persona_index_lookup "$match"
+        for hit in $PERSONA_INDEX_HITS; do
+            local persona_idx="${hit%%:*}"
+            scores[$persona_idx]=$(( ${scores[$persona_idx]:-0} + ${hit#*:} ))
+        done
+        
+        # Continue one character past the match start so overlapping triggers still count
+        text="${text:$(( ${#prefix} + 1 ))}"
+    done
+    
+    # Order by score (insertion sort over at most a dozen personas)
+    local ranked=()
+    for persona_idx in "${!scores[@]}"; do
+        local position=${#ranked[@]}
+        while [[ $position -gt 0 && ${scores[${ranked[$((position - 1))]}]} -lt ${scores[$persona_idx]} ]]; do
+            ranked[$position]=${ranked[$((position - 1))]}
+            position=$((position - 1))
+        done
+        ranked[$position]=$persona_idx
+    done
+    
+    for persona_idx in "${ranked[@]}"; do
+        echo "${PERSONA_INDEX_NAMES[$persona_idx]} ${scores[$persona_idx]}"
+    done
 }
 
 # Activate personas based on context
@@ -278,29 +429,15 @@ auto_select_personas() {
     local command="$2"
     local selected=()
     
-    # Analyze context for persona triggers
+    # Analyze context for persona triggers using the compiled index
     local context_lower=$(to_lower "$context $command")
     
-    # Parse personas from array (bash 3.2 compatible)
-    for persona_entry in "${PERSONAS[@]}"; do
-        local persona=$(echo "$persona_entry" | cut -d':' -f1)
-        
-        if [[ "$persona" == "master_wayne" ]]; then
-            continue  # Always included separately
+    local persona score
+    while read -r persona score; do
+        if [[ -n "$persona" && $score -ge $PERSONA_MIN_SCORE ]]; then
+            selected+=("$persona")
         fi
-        
-        local persona_file="$PERSONAS_DIR/${persona}.json"
-        if [[ -f "$persona_file" ]]; then
-            local triggers=$(json_get "$persona_file" "activation_triggers" | jq -r '.[]?' 2>/dev/null)
-            
-            for trigger in $triggers; do
-                if echo "$context_lower" | grep -q "$trigger"; then
-                    selected+=("$persona")
-                    break
-                fi
-            done
-        fi
-    done
+    done < <(score_personas "$context_lower")
     
     # Default personas for common commands
     case "$command" in
@@ -529,6 +666,8 @@ fi
 
 # Export persona functions
 export -f init_persona_system create_persona_profiles activate_personas
+export -f compile_persona_index invalidate_persona_index persona_index_is_fresh
+export -f load_persona_index score_personas
 export -f auto_select_personas activate_persona force_persona deactivate_all_personas
 export -f update_active_personas get_active_personas get_primary_persona
 export -f inject_persona_context get_persona_mcp_preferences
@@ -13,6 +13,15 @@ NC='\033[0m'
 # Configuration
 TASK_COUNT=${1:-3}
 SESSION_NAME="claude-squad"
+SCRIPT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
+TASK_QUEUE="$SCRIPT_DIR/task_queue.py"
+TODO_FILE="$PWD/todo.md"
+
+# Report queue progress and per-worker throughput
+if [ "$TASK_COUNT" = "stats" ]; then
+    python3 "$TASK_QUEUE" --todo "$TODO_FILE" stats "${@:2}"
+    exit $?
+fi
 
 # Check if tmux is installed
 if ! command -v tmux &> /dev/null; then
@@ -52,25 +61,20 @@ else
     tmux select-layout -t "$SESSION_NAME:0" tiled
 fi
 
-# Read todo items if todo.md exists
-TODO_ITEMS=()
-if [ -f "todo.md" ]; then
-    while IFS= read -r line; do
-        # Look for unchecked items (- [ ])
-        if [[ $line =~ ^-[[:space:]]\[[[:space:]]\][[:space:]].+ ]]; then
-            # Extract the task description
-            task=$(echo "$line" | sed 's/^-[[:space:]]\[[[:space:]]\][[:space:]]//')
-            TODO_ITEMS+=("$task")
-        fi
-    done < "todo.md"
+# Queue unchecked todo items (- [ ]) in the task broker
+QUEUED_TASKS=0
+if [ -f "$TODO_FILE" ] && command -v python3 &> /dev/null; then
+    if ! QUEUED_TASKS=$(python3 "$TASK_QUEUE" --todo "$TODO_FILE" load); then
+        echo -e "${YELLOW}⚠️  Could not queue $TODO_FILE; panes fall back to /execute todo${NC}"
+        QUEUED_TASKS=0
+    fi
 fi
 
-# Launch Claude in each pane
+# Launch a worker in each pane; workers pull the next task as they finish,
+# so no pane sits idle while another still has a backlog
 for ((i=0; i<$TASK_COUNT; i++)); do
-    if [ ${#TODO_ITEMS[@]} -gt $i ]; then
-        # Use specific todo item
-        TASK="${TODO_ITEMS[$i]}"
-        tmux send-keys -t "$SESSION_NAME:0.$i" "claude /ship \"$TASK\" --dangerous" C-m
+    if [ "${QUEUED_TASKS:-0}" -gt 0 ]; then
+        tmux send-keys -t "$SESSION_NAME:0.$i" "python3 \"$TASK_QUEUE\" --todo \"$TODO_FILE\" worker squad-$i" C-m
     else
         # Generic execution
         tmux send-keys -t "$SESSION_NAME:0.$i" "claude /execute todo --dangerous" C-m
@@ -89,6 +93,9 @@ tmux set -t "$SESSION_NAME" pane-border-format "#[fg=cyan]Claude Instance #P"
 
 # Attach to the session
 echo -e "${GREEN}✅ Claude Squad launched with $TASK_COUNT instances${NC}"
+if [ "${QUEUED_TASKS:-0}" -gt 0 ]; then
+    echo -e "${BLUE}📋 $QUEUED_TASKS todo items queued; check progress with: $0 stats${NC}"
+fi
 echo -e "${YELLOW}Tip: Use Ctrl+B then arrow keys to navigate between panes${NC}"
 echo -e "${YELLOW}     Use Ctrl+B then 'z' to zoom into a pane${NC}"
 echo -e "${YELLOW}     Use Ctrl+B then 'd' to detach${NC}"
@@ -0,0 +1,451 @@
+#!/usr/bin/env python3
+"""
+Batcave Session Analytics
+Streams the append-only operation and session stores written by the
+progress_tracker and session_logger hooks, without ever loading them whole:
+the JSONL files are mmap'd and decoded line by line into compact columns
+(array module), then aggregated with NumPy when it is installed and with
+plain Python otherwise.
+
+Reports per-tool durations (as measured by the hooks) and gaps between
+operations (which include model think time), failure clusters, operations
+per minute and files touched per session.
+
+Usage:
+    session_analytics.py [report] [--since DAYS] [--session ID] [--json]
+    session_analytics.py import        # merge older progress.json / session_logs.json history (once)
+"""
+
+import json
+import math
+import mmap
+import os
+import sys
+import time
+from array import array
+from datetime import datetime
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+CLAUDE_HOME = os.environ.get("CLAUDE_HOME", os.path.expanduser("~/.claude"))
+OPERATIONS_LOG = os.path.join(CLAUDE_HOME, "operations.jsonl")
+SESSIONS_LOG = os.path.join(CLAUDE_HOME, "session_logs.jsonl")
+PROGRESS_FILE = os.path.join(CLAUDE_HOME, "progress.json")
+SESSION_LOG_FILE = os.path.join(CLAUDE_HOME, "session_logs.json")
+# Written once `import` has merged the legacy stores; later runs are no-ops
+LEGACY_IMPORT_MARKER = os.path.join(CLAUDE_HOME, "cache", "analytics_legacy_imported")
+
+# Gaps longer than this are idle time, not part of the working rhythm
+IDLE_GAP_SECONDS = 600
+# Failures of the same tool closer than this belong to one cluster
+CLUSTER_WINDOW_SECONDS = 120
+
+
+class Interner:
+    """Maps strings to dense integer ids so columns stay numeric"""
+
+    def __init__(self):
+        self.ids = {}
+        self.values = []
+
+    def __call__(self, value):
+        if value not in self.ids:
+            self.ids[value] = len(self.values)
+            self.values.append(value)
+        return self.ids[value]
+
+
+class OperationColumns:
+    """Column store for operations: one typed array per field"""
+
+    def __init__(self):
+        self.timestamp = array("d")
+        self.duration_ms = array("d")
+        self.gap_ms = array("d")
+        self.tool = array("l")
+        self.session = array("l")
+        self.success = array("b")
+        self.file = array("l")
+        self.tools = Interner()
+        self.sessions = Interner()
+        self.files = Interner()
+        self._last_seen = {}
+
+    def __len__(self):
+        return len(self.timestamp)
+
+    def append(self, record):
+        """Add one operation record with its measured duration (when the hook had one) and
+        the gap since the session's previous operation, which includes model think time"""
+        timestamp = float(record.get("ts", 0))
+        session = self.sessions(record.get("session", ""))
+
+        previous = self._last_seen.get(session)
+        gap = timestamp - previous if previous is not None else math.inf
+        # Out-of-order records would give negative gaps; they are left out like idle ones
+        self.gap_ms.append(gap * 1000 if 0 <= gap <= IDLE_GAP_SECONDS else math.nan)
+        self._last_seen[session] = max(timestamp, previous) if previous is not None else timestamp
+
+        duration = record.get("duration_ms")
+        file_path = record.get("file")
+        self.timestamp.append(timestamp)
+        self.duration_ms.append(float(duration) if duration is not None else math.nan)
+        self.tool.append(self.tools(record.get("tool", "")))
+        self.session.append(session)
+        self.success.append(1 if record.get("success", True) else 0)
+        self.file.append(self.files(file_path) if file_path else -1)
+
+
+def iter_jsonl(path, since=None, contains=None):
+    """Yield JSON records from a JSONL file through mmap, one line at a time.
+    Lines without the `contains` bytes are skipped before decoding."""
+    if not os.path.exists(path) or os.path.getsize(path) == 0:
+        return
+    with open(path, "rb") as handle, mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        position = seek_timestamp(data, since) if since else 0
+        size = len(data)
+        while position < size:
+            end = data.find(b"\n", position)
+            if end == -1:
+                end = size
+            line = data[position:end]
+            position = end + 1
+            if not line.strip() or (contains and contains not in line):
+                continue
+            try:
+                yield json.loads(line)
+            except ValueError:
+                continue  # torn or partial write
+
+
+def _timestamp_at(data, offset):
+    """Timestamp of the first complete record at or after a byte offset"""
+    if offset > 0:
+        offset = data.find(b"\n", offset - 1) + 1
+        if offset == 0:
+            return None, len(data)
+    end = data.find(b"\n", offset)
+    end = len(data) if end == -1 else end
+    try:
+        return float(json.loads(data[offset:end]).get("ts", 0)), offset
+    except ValueError:
+        return None, offset
+
+
+def seek_timestamp(data, since):
+    """Binary search the append-ordered log for the first record at or after `since`"""
+    low, high = 0, len(data)
+    while high - low > 4096:
+        middle = (low + high) // 2
+        timestamp, offset = _timestamp_at(data, middle)
+        if timestamp is None or timestamp >= since:
+            high = middle
+        else:
+            low = offset
+    return _timestamp_at(data, low)[1]
+
+
+def load_operations(since=None, session=None):
+    """Stream the operations log into columns"""
+    columns = OperationColumns()
+    contains = json.dumps(session).encode() if session else None
+    for record in iter_jsonl(OPERATIONS_LOG, since, contains):
+        if session and record.get("session") != session:
+            continue
+        if since and record.get("ts", 0) < since:
+            continue
+        columns.append(record)
+    return columns
+
+
+def _percentile(sorted_values, fraction):
+    if not sorted_values:
+        return None
+    index = min(int(round(fraction * (len(sorted_values) - 1))), len(sorted_values) - 1)
+    return sorted_values[index]
+
+
+def _timing(values):
+    """p50/p95/mean in ms of sorted values (None when there are none)"""
+    if not values:
+        return {"p50_ms": None, "p95_ms": None, "mean_ms": None}
+    return {
+        "p50_ms": round(_percentile(values, 0.5), 1),
+        "p95_ms": round(_percentile(values, 0.95), 1),
+        "mean_ms": round(sum(values) / len(values), 1),
+    }
+
+
+def tool_timings(columns):
+    """Per tool: operation count, failures, measured duration and gap since the previous operation"""
+    stats = {}
+    if np is not None:
+        tool = np.frombuffer(columns.tool, dtype=np.int_)
+        duration = np.frombuffer(columns.duration_ms, dtype=np.float64)
+        gap = np.frombuffer(columns.gap_ms, dtype=np.float64)
+        success = np.frombuffer(columns.success, dtype=np.int8)
+        for tool_id, name in enumerate(columns.tools.values):
+            mask = tool == tool_id
+            durations = duration[mask]
+            gaps = gap[mask]
+            stats[name] = {
+                "operations": int(mask.sum()),
+                "failures": int((success[mask] == 0).sum()),
+                "duration": _timing(np.sort(durations[~np.isnan(durations)]).tolist()),
+                "gap": _timing(np.sort(gaps[~np.isnan(gaps)]).tolist()),
+            }
+        return stats
+
+    per_tool = {}
+    for tool_id, duration, gap, success in zip(columns.tool, columns.duration_ms, columns.gap_ms, columns.success):
+        entry = per_tool.setdefault(tool_id, [0, 0, [], []])
+        entry[0] += 1
+        entry[1] += 1 - success
+        if not math.isnan(duration):
+            entry[2].append(duration)
+        if not math.isnan(gap):
+            entry[3].append(gap)
+    for tool_id, (operations, failures, durations, gaps) in per_tool.items():
+        stats[columns.tools.values[tool_id]] = {
+            "operations": operations,
+            "failures": failures,
+            "duration": _timing(sorted(durations)),
+            "gap": _timing(sorted(gaps)),
+        }
+    return stats
+
+
+def operations_per_minute(columns):
+    """Average operations per active minute and the busiest minute"""
+    if not len(columns):
+        return {"active_minutes": 0, "average": 0, "peak": 0, "peak_minute": None}
+
+    if np is not None:
+        minutes = (np.frombuffer(columns.timestamp, dtype=np.float64) // 60).astype(np.int64)
+        unique, counts = np.unique(minutes, return_counts=True)
+        peak_index = int(counts.argmax())
+        active, peak, peak_minute = int(unique.size), int(counts[peak_index]), int(unique[peak_index])
+    else:
+        counts = {}
+        for timestamp in columns.timestamp:
+            minute = int(timestamp // 60)
+            counts[minute] = counts.get(minute, 0) + 1
+        peak_minute = max(counts, key=counts.get)
+        active, peak = len(counts), counts[peak_minute]
+
+    return {
+        "active_minutes": active,
+        "average": round(len(columns) / active, 2),
+        "peak": peak,
+        "peak_minute": datetime.fromtimestamp(peak_minute * 60).isoformat(timespec="minutes"),
+    }
+
+
+def files_per_session(columns):
+    """Distinct files touched by each session"""
+    if np is not None and len(columns):
+        session = np.frombuffer(columns.session, dtype=np.int_).astype(np.int64)
+        files = np.frombuffer(columns.file, dtype=np.int_).astype(np.int64)
+        touched = files >= 0
+        pairs = np.unique(session[touched] * (len(columns.files.values) + 1) + files[touched])
+        per_session = np.bincount(pairs // (len(columns.files.values) + 1),
+                                  minlength=len(columns.sessions.values))
+        counts = {columns.sessions.values[index]: int(count) for index, count in enumerate(per_session)}
+    else:
+        seen = {}
+        for session, file_id in zip(columns.session, columns.file):
+            if file_id >= 0:
+                seen.setdefault(session, set()).add(file_id)
+        counts = {name: len(seen.get(index, ())) for index, name in enumerate(columns.sessions.values)}
+    return counts
+
+
+def failure_clusters(columns, window=CLUSTER_WINDOW_SECONDS):
+    """Group failures of the same tool in the same session that happen within `window` seconds"""
+    if np is not None and len(columns):
+        failed = np.flatnonzero(np.frombuffer(columns.success, dtype=np.int8) == 0).tolist()
+    else:
+        failed = [index for index, success in enumerate(columns.success) if not success]
+
+    open_clusters = {}
+    clusters = []
+    for index in failed:
+        key = (columns.session[index], columns.tool[index])
+        timestamp = columns.timestamp[index]
+        cluster = open_clusters.get(key)
+        if cluster and timestamp - cluster["end"] <= window:
+            cluster["failures"] += 1
+            cluster["end"] = timestamp
+        else:
+            cluster = {"session": columns.sessions.values[key[0]], "tool": columns.tools.values[key[1]],
+                       "failures": 1, "start": timestamp, "end": timestamp}
+            open_clusters[key] = cluster
+            clusters.append(cluster)
+
+    clusters = [cluster for cluster in clusters if cluster["failures"] > 1]
+    clusters.sort(key=lambda cluster: cluster["failures"], reverse=True)
+    for cluster in clusters:
+        cluster["span_seconds"] = round(cluster["end"] - cluster["start"], 1)
+        cluster["start"] = datetime.fromtimestamp(cluster["start"]).isoformat(timespec="seconds")
+        del cluster["end"]
+    return clusters
+
+
+def build_report(since=None, session=None):
+    """All analytics for the selected operations"""
+    started = time.time()
+    columns = load_operations(since, session)
+    files = files_per_session(columns)
+    return {
+        "operations": len(columns),
+        "sessions": len(columns.sessions.values),
+        "engine": "numpy" if np is not None else "python",
+        "tools": tool_timings(columns),
+        "operations_per_minute": operations_per_minute(columns),
+        "files_per_session": {
+            "average": round(sum(files.values()) / len(files), 2) if files else 0,
+            "max": max(files.values()) if files else 0,
+            "sessions": files,
+        },
+        "failure_clusters": failure_clusters(columns)[:10],
+        "elapsed_ms": round((time.time() - started) * 1000, 1),
+    }
+
+
+def print_report(report):
+    """Human readable analytics report"""
+    print(f"🦇 Batcave Analytics: {report['operations']} operations across {report['sessions']} sessions "
+          f"({report['engine']}, {report['elapsed_ms']}ms)")
+
+    print("\nPer-tool timing (ms; duration as measured by the hook, gap since the previous operation"
+          " including think time):")
+    for name, stats in sorted(report["tools"].items(), key=lambda item: -item[1]["operations"]):
+        duration, gap = stats["duration"], stats["gap"]
+        print(f"  {name or '?':<14} ops {stats['operations']:>7}  fail {stats['failures']:>5}  "
+              f"duration p50 {duration['p50_ms']} p95 {duration['p95_ms']}  "
+              f"gap p50 {gap['p50_ms']} p95 {gap['p95_ms']} mean {gap['mean_ms']}")
+
+    rate = report["operations_per_minute"]
+    print(f"\nOperations per minute: {rate['average']} average over {rate['active_minutes']} active minutes, "
+          f"peak {rate['peak']} at {rate['peak_minute']}")
+
+    files = report["files_per_session"]
+    print(f"Files touched per session: {files['average']} average, {files['max']} max")
+
+    if report["failure_clusters"]:
+        print("\nFailure clusters:")
+        for cluster in report["failure_clusters"]:
+            print(f"  {cluster['tool']} x{cluster['failures']} in {cluster['span_seconds']}s "
+                  f"({cluster['session']}, {cluster['start']})")
+
+
+def _epoch(value):
+    try:
+        return datetime.fromisoformat(value).timestamp()
+    except (TypeError, ValueError):
+        return 0.0
+
+
+def _first_value(path, field, convert=float):
+    """Converted `field` of the first record in a JSONL log (None when the log is empty)"""
+    for record in iter_jsonl(path):
+        return convert(record.get(field, 0))
+    return None
+
+
+def _merge_older(path, records):
+    """Put records (already sorted, all older than the log) in front of a JSONL log.
+    Lines appended by hooks while the copy runs are carried over before the swap."""
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    with open(temp_path, "wb") as merged:
+        for record in records:
+            merged.write(json.dumps(record, separators=(",", ":")).encode() + b"\n")
+        if os.path.exists(path):
+            with open(path, "rb") as current:
+                while True:
+                    chunk = current.read(1 << 20)
+                    if not chunk:
+                        break
+                    merged.write(chunk)
+    os.replace(temp_path, path)
+
+
+def import_legacy():
+    """One-time merge of the whole-file JSON stores into the JSONL logs.
+
+    progress_tracker and session_logger have written both stores since the
+    JSONL logs exist, so only legacy records older than each log's first
+    entry are imported; they go in front, keeping the logs in time order.
+    """
+    if os.path.exists(LEGACY_IMPORT_MARKER):
+        return 0
+
+    imported = 0
+    if os.path.exists(PROGRESS_FILE):
+        with open(PROGRESS_FILE) as handle:
+            progress = json.load(handle)
+        first = _first_value(OPERATIONS_LOG, "ts")
+        records = []
+        for session_id, session in progress.get("sessions", {}).items():
+            for operation in session.get("operations", []):
+                parameters = operation.get("parameters") or {}
+                record = {"ts": _epoch(operation.get("timestamp")), "session": session_id,
+                          "tool": operation.get("tool_name", ""), "success": operation.get("success", True)}
+                file_path = parameters.get("file_path") or parameters.get("notebook_path")
+                if file_path:
+                    record["file"] = file_path
+                if first is None or record["ts"] < first:
+                    records.append(record)
+        records.sort(key=lambda record: record["ts"])
+        if records:
+            _merge_older(OPERATIONS_LOG, records)
+        imported = len(records)
+
+    if os.path.exists(SESSION_LOG_FILE):
+        with open(SESSION_LOG_FILE) as handle:
+            sessions = json.load(handle).get("sessions", [])
+        first = _first_value(SESSIONS_LOG, "end_time", _epoch)
+        summaries = [{key: value for key, value in session.items() if key != "operations"}
+                     for session in sessions if first is None or _epoch(session.get("end_time")) < first]
+        summaries.sort(key=lambda summary: _epoch(summary.get("end_time")))
+        if summaries:
+            _merge_older(SESSIONS_LOG, summaries)
+
+    os.makedirs(os.path.dirname(LEGACY_IMPORT_MARKER), exist_ok=True)
+    with open(LEGACY_IMPORT_MARKER, "w") as marker:
+        marker.write(datetime.now().isoformat(timespec="seconds") + "\n")
+    return imported
+
+
+def main():
+    """Command line entry point"""
+    args = sys.argv[1:]
+    command = args[0] if args and not args[0].startswith("--") else "report"
+
+    if command == "import":
+        if os.path.exists(LEGACY_IMPORT_MARKER):
+            print(f"legacy history already imported (remove {LEGACY_IMPORT_MARKER} to import again)")
+        else:
+            print(f"imported {import_legacy()} operations into {OPERATIONS_LOG}")
+        return 0
+
+    if command != "report":
+        print(__doc__.strip(), file=sys.stderr)
+        return 2
+
+    since = time.time() - float(args[args.index("--since") + 1]) * 86400 if "--since" in args else None
+    session = args[args.index("--session") + 1] if "--session" in args else None
+    report = build_report(since, session)
+
+    if "--json" in args:
+        print(json.dumps(report, indent=2))
+    else:
+        print_report(report)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,310 @@
+#!/usr/bin/env python3
+"""
+Claude Squad task broker
+A SQLite-backed queue of todo.md items that squad panes pull from, so a pane
+that finishes early takes the next item instead of sitting idle. Claims are
+leases: a worker heartbeats while its task runs, and items whose lease expires
+(crashed or killed pane) go back to the queue. Completed items are checked off
+in todo.md with an atomic rewrite.
+
+Usage:
+    task_queue.py [--todo PATH] load                 # import unchecked todo items
+    task_queue.py [--todo PATH] claim <worker>       # prints "<id>\\t<task>"
+    task_queue.py [--todo PATH] heartbeat <id> <worker>
+    task_queue.py [--todo PATH] complete <id> <worker>
+    task_queue.py [--todo PATH] fail <id> <worker>
+    task_queue.py [--todo PATH] worker <worker>      # pull and run tasks until drained
+    task_queue.py [--todo PATH] stats [--json]       # queue state and per-worker throughput
+"""
+
+import fcntl
+import hashlib
+import json
+import os
+import re
+import shlex
+import sqlite3
+import subprocess
+import sys
+import threading
+import time
+
+CLAUDE_HOME = os.environ.get("CLAUDE_HOME", os.path.expanduser("~/.claude"))
+SQUAD_DIR = os.path.join(CLAUDE_HOME, "squad")
+LEASE_SECONDS = int(os.environ.get("SQUAD_LEASE_SECONDS", "1800"))
+MAX_ATTEMPTS = int(os.environ.get("SQUAD_MAX_ATTEMPTS", "2"))
+IDLE_POLL_SECONDS = 5
+TASK_COMMAND = os.environ.get("SQUAD_TASK_COMMAND", "claude /ship {task} --dangerous")
+
+TODO_PATTERN = re.compile(r"^-\s\[\s\]\s(.+)$")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS tasks (
+    id INTEGER PRIMARY KEY,
+    text TEXT UNIQUE NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending',
+    worker TEXT,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    lease_expires REAL,
+    claimed_at REAL,
+    completed_at REAL
+);
+CREATE TABLE IF NOT EXISTS runs (
+    task_id INTEGER NOT NULL,
+    worker TEXT NOT NULL,
+    status TEXT NOT NULL,
+    started_at REAL NOT NULL,
+    finished_at REAL NOT NULL
+);
+"""
+
+
+def queue_path(todo_path):
+    """One queue per todo.md, named after its project directory"""
+    todo_path = os.path.abspath(todo_path)
+    project = os.path.basename(os.path.dirname(todo_path)) or "root"
+    digest = hashlib.sha1(todo_path.encode()).hexdigest()[:8]
+    return os.environ.get("SQUAD_QUEUE_DB", os.path.join(SQUAD_DIR, f"{project}-{digest}.db"))
+
+
+def connect(todo_path):
+    """Open the queue database (autocommit; writers use BEGIN IMMEDIATE)"""
+    path = queue_path(todo_path)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    db = sqlite3.connect(path, timeout=30, isolation_level=None)
+    db.execute("PRAGMA journal_mode=WAL")
+    db.executescript(SCHEMA)
+    return db
+
+
+class transaction:
+    """BEGIN IMMEDIATE ... COMMIT, so claims never race between panes"""
+
+    def __init__(self, db):
+        self.db = db
+
+    def __enter__(self):
+        self.db.execute("BEGIN IMMEDIATE")
+        return self.db
+
+    def __exit__(self, exc_type, exc, tb):
+        self.db.execute("ROLLBACK" if exc_type else "COMMIT")
+        return False
+
+
+def read_unchecked(todo_path):
+    """Return the unchecked `- [ ]` items of a todo file, in order"""
+    if not os.path.exists(todo_path):
+        return []
+    with open(todo_path) as handle:
+        return [match.group(1).strip() for match in map(TODO_PATTERN.match, handle) if match]
+
+
+def load_tasks(db, todo_path):
+    """Sync the queue with todo.md; expired leases are released, live ones kept"""
+    items = read_unchecked(todo_path)
+    with transaction(db):
+        requeue_expired(db, time.time())
+        for text in items:
+            db.execute("INSERT INTO tasks (text) VALUES (?) ON CONFLICT(text) DO UPDATE "
+                       "SET status = 'pending', attempts = 0 WHERE status NOT IN ('pending', 'leased')",
+                       (text,))
+        # Items checked off or deleted by hand are no longer queued
+        placeholders = ",".join("?" * len(items)) or "''"
+        db.execute(f"UPDATE tasks SET status = 'removed' WHERE status = 'pending' "
+                   f"AND text NOT IN ({placeholders})", items)
+    return len(items)
+
+
+def requeue_expired(db, now):
+    """Return expired leases to the queue (or fail them after MAX_ATTEMPTS)"""
+    db.execute("UPDATE tasks SET status = CASE WHEN attempts >= ? THEN 'failed' ELSE 'pending' END, "
+               "worker = NULL, lease_expires = NULL WHERE status = 'leased' AND lease_expires < ?",
+               (MAX_ATTEMPTS, now))
+
+
+def claim_task(db, worker):
+    """Lease the oldest pending task; returns (id, text) or None"""
+    now = time.time()
+    with transaction(db):
+        requeue_expired(db, now)
+        row = db.execute("SELECT id, text FROM tasks WHERE status = 'pending' ORDER BY id LIMIT 1").fetchone()
+        if row is None:
+            return None
+        db.execute("UPDATE tasks SET status = 'leased', worker = ?, attempts = attempts + 1, "
+                   "lease_expires = ?, claimed_at = ? WHERE id = ?",
+                   (worker, now + LEASE_SECONDS, now, row[0]))
+    return row
+
+
+def outstanding_leases(db):
+    """Number of tasks currently leased to some worker"""
+    return db.execute("SELECT COUNT(*) FROM tasks WHERE status = 'leased'").fetchone()[0]
+
+
+def heartbeat(db, task_id, worker):
+    """Extend a lease; False when the lease was lost (expired and requeued)"""
+    with transaction(db):
+        updated = db.execute("UPDATE tasks SET lease_expires = ? WHERE id = ? AND worker = ? "
+                             "AND status = 'leased'", (time.time() + LEASE_SECONDS, task_id, worker))
+    return updated.rowcount == 1
+
+
+def finish_task(db, todo_path, task_id, worker, succeeded):
+    """Record a finished run; successful tasks are checked off in todo.md"""
+    now = time.time()
+    with transaction(db):
+        row = db.execute("SELECT text, claimed_at, attempts, status, worker FROM tasks WHERE id = ?",
+                         (task_id,)).fetchone()
+        if row is None:
+            return False
+        text, claimed_at, attempts, current_status, current_worker = row
+        reclaimed = current_status == "leased" and current_worker != worker
+        if succeeded:
+            status = "done"
+        else:
+            status = "failed" if attempts >= MAX_ATTEMPTS else "pending"
+        # A failed run whose lease expired and was picked up by another pane is left to that pane
+        if succeeded or not reclaimed:
+            db.execute("UPDATE tasks SET status = ?, worker = NULL, lease_expires = NULL, completed_at = ? "
+                       "WHERE id = ?", (status, now, task_id))
+        db.execute("INSERT INTO runs VALUES (?, ?, ?, ?, ?)",
+                   (task_id, worker, "done" if succeeded else "failed", claimed_at or now, now))
+    if succeeded:
+        check_off(todo_path, text)
+    return True
+
+
+def check_off(todo_path, text):
+    """Mark the first matching unchecked item done, rewriting todo.md atomically"""
+    if not os.path.exists(todo_path):
+        return
+    # The lock lives next to the queue, not in the project
+    with open(f"{queue_path(todo_path)}.todo.lock", "a") as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        with open(todo_path) as handle:
+            lines = handle.readlines()
+        for index, line in enumerate(lines):
+            match = TODO_PATTERN.match(line.rstrip("\n"))
+            if match and match.group(1).strip() == text:
+                lines[index] = line.replace("[ ]", "[x]", 1)
+                break
+        else:
+            return
+        temp_path = f"{todo_path}.{os.getpid()}.tmp"
+        with open(temp_path, "w") as handle:
+            handle.writelines(lines)
+        os.replace(temp_path, todo_path)
+
+
+def queue_stats(db):
+    """Queue counts plus per-worker completions, busy time and throughput"""
+    counts = dict(db.execute("SELECT status, COUNT(*) FROM tasks GROUP BY status").fetchall())
+    workers = {}
+    for worker, done, failed, busy, first, last in db.execute(
+            "SELECT worker, SUM(status = 'done'), SUM(status = 'failed'), "
+            "SUM(finished_at - started_at), MIN(started_at), MAX(finished_at) "
+            "FROM runs GROUP BY worker ORDER BY worker"):
+        span = max(last - first, 1)
+        workers[worker] = {
+            "done": done,
+            "failed": failed,
+            "busy_seconds": round(busy, 1),
+            "utilization": round(100 * busy / span, 1),
+            "tasks_per_hour": round(done * 3600 / span, 2),
+        }
+    return {"queue": counts, "workers": workers}
+
+
+def run_worker(db, todo_path, worker):
+    """Pull tasks until the queue drains; heartbeats keep the lease alive"""
+    completed = 0
+    started = time.time()
+
+    while True:
+        claimed = claim_task(db, worker)
+        if claimed is None:
+            # Leased tasks may still come back if their worker dies
+            if outstanding_leases(db):
+                time.sleep(IDLE_POLL_SECONDS)
+                continue
+            break
+
+        task_id, text = claimed
+        print(f"🦇 [{worker}] task {task_id}: {text}", flush=True)
+
+        stop = threading.Event()
+
+        def keep_alive():
+            beat_db = connect(todo_path)
+            while not stop.wait(max(LEASE_SECONDS // 3, 1)):
+                if not heartbeat(beat_db, task_id, worker):
+                    break
+            beat_db.close()
+
+        beat = threading.Thread(target=keep_alive, daemon=True)
+        beat.start()
+        try:
+            command = TASK_COMMAND.replace("{task}", shlex.quote(text))
+            succeeded = subprocess.call(command, shell=True) == 0
+        finally:
+            stop.set()
+            beat.join()
+
+        finish_task(db, todo_path, task_id, worker, succeeded)
+        completed += succeeded
+
+    elapsed = max(time.time() - started, 1)
+    print(f"🦇 [{worker}] queue drained: {completed} tasks in {elapsed:.0f}s "
+          f"({completed * 3600 / elapsed:.1f}/hour)", flush=True)
+    return 0
+
+
+def print_stats(stats):
+    """Human readable stats report"""
+    queue = stats["queue"]
+    print("Queue: " + ", ".join(f"{status} {queue.get(status, 0)}"
+                                for status in ("pending", "leased", "done", "failed")))
+    for worker, row in stats["workers"].items():
+        print(f"  {worker}: {row['done']} done, {row['failed']} failed, "
+              f"{row['tasks_per_hour']}/hour, {row['utilization']}% busy")
+
+
+def main():
+    """Command line entry point used by parallel.sh"""
+    args = sys.argv[1:]
+    todo_path = "todo.md"
+    if args[:1] == ["--todo"] and len(args) > 1:
+        todo_path, args = args[1], args[2:]
+    todo_path = os.path.abspath(todo_path)
+
+    command = args[0] if args else "stats"
+    db = connect(todo_path)
+
+    if command == "load":
+        print(load_tasks(db, todo_path))
+    elif command == "claim" and len(args) == 2:
+        claimed = claim_task(db, args[1])
+        if claimed is None:
+            return 2 if outstanding_leases(db) else 1
+        print(f"{claimed[0]}\t{claimed[1]}")
+    elif command == "heartbeat" and len(args) == 3:
+        return 0 if heartbeat(db, int(args[1]), args[2]) else 1
+    elif command in ("complete", "fail") and len(args) == 3:
+        return 0 if finish_task(db, todo_path, int(args[1]), args[2], command == "complete") else 1
+    elif command == "worker" and len(args) == 2:
+        return run_worker(db, todo_path, args[1])
+    elif command == "stats":
+        stats = queue_stats(db)
+        if "--json" in args:
+            print(json.dumps(stats))
+        else:
+            print_stats(stats)
+    else:
+        print(__doc__.strip(), file=sys.stderr)
+        return 2
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -48,6 +48,63 @@ cp -r .claude "$WORKTREE_PATH/" 2>/dev/null || echo "No .claude directory to cop
 cp .env* "$WORKTREE_PATH/" 2>/dev/null || echo "No .env files to copy"
 cp CLAUDE.md "$WORKTREE_PATH/" 2>/dev/null || echo "No CLAUDE.md to copy"
 
+# Attach shared caches so the new worktree doesn't cold-start every build.
+# Hooks and the context analyzer already read through the content-addressed
+# cache in ~/.claude/cache/cas (keyed by git blob hash); here we clone the
+# heavy per-checkout directories copy-on-write where the filesystem allows.
+# Python venvs are not cloned: their scripts and pyvenv.cfg point at the
+# checkout they were created in, so a clone would run and modify the main venv.
+DEPENDENCY_DIRS=(node_modules vendor/bundle)
+VENV_DIRS=(.venv venv)
+TOOL_CACHE_DIRS=(.mypy_cache .ruff_cache .pytest_cache .eslintcache tsconfig.tsbuildinfo)
+
+clone_cow() {
+    local source="$1"
+    local target="$2"
+    
+    mkdir -p "$(dirname "$target")"
+    if [[ "$OSTYPE" == "darwin"* ]]; then
+        cp -Rc "$source" "$target" 2>/dev/null   # APFS clonefile
+    else
+        cp -R --reflink=always "$source" "$target" 2>/dev/null   # btrfs/xfs reflinks
+    fi
+}
+
+echo -e "${GREEN}Attaching shared caches...${NC}"
+for dep_dir in "${DEPENDENCY_DIRS[@]}"; do
+    if [ -d "$dep_dir" ] && [ ! -e "$WORKTREE_PATH/$dep_dir" ]; then
+        if clone_cow "$dep_dir" "$WORKTREE_PATH/$dep_dir"; then
+            echo "  $dep_dir: copy-on-write clone"
+        else
+            # No CoW support: a symlink would let installs in the worktree mutate the
+            # main checkout, and a full copy is slow
+            rm -rf "$WORKTREE_PATH/$dep_dir"
+            echo "  $dep_dir: not shared (no copy-on-write support), install dependencies in the worktree"
+        fi
+    fi
+done
+
+for venv_dir in "${VENV_DIRS[@]}"; do
+    if [ -d "$venv_dir" ] && [ ! -e "$WORKTREE_PATH/$venv_dir" ]; then
+        echo "  $venv_dir: not shared (venvs are tied to their checkout), create one in the worktree"
+    fi
+done
+
+for cache_dir in "${TOOL_CACHE_DIRS[@]}"; do
+    if [ -e "$cache_dir" ] && [ ! -e "$WORKTREE_PATH/$cache_dir" ]; then
+        if ! clone_cow "$cache_dir" "$WORKTREE_PATH/$cache_dir"; then
+            rm -rf "$WORKTREE_PATH/$cache_dir"
+            cp -R "$cache_dir" "$WORKTREE_PATH/$cache_dir"
+        fi
+    fi
+done
+
+# Expire shared cache entries no worktree has written for a while
+SHARED_CACHE="${CLAUDE_HOME:-$HOME/.claude}/lib/shared_cache.py"
+if [ -f "$SHARED_CACHE" ] && command -v python3 &> /dev/null; then
+    python3 "$SHARED_CACHE" prune > /dev/null 2>&1 || true
+fi
+
 # Platform-specific terminal launch
 if [[ "$OSTYPE" == "darwin"* ]]; then
     # macOS
@@ -20,6 +20,12 @@ setup_mcp_servers() {
         cp "${BASH_SOURCE[0]%/*}/../mcp/lib/mcp_utils.sh" "$claude_home/mcp/lib/"
     fi
     
+    # Copy MCP client manager
+    if [[ -f "${BASH_SOURCE[0]%/*}/../mcp/lib/mcp_client_manager.py" ]]; then
+        cp "${BASH_SOURCE[0]%/*}/../mcp/lib/mcp_client_manager.py" "$claude_home/mcp/lib/"
+        chmod +x "$claude_home/mcp/lib/mcp_client_manager.py"
+    fi
+    
     # Create MCP server installation script
     create_mcp_installer "$claude_home"
     
@@ -401,7 +407,14 @@ create_mcp_config() {
         "log_file": "$claude_home/mcp/logs/mcp.log",
         "health_check_interval": 300,
         "cache_enabled": true,
-        "cache_ttl": 3600
+        "cache_ttl": 3600,
+        "pool": {
+            "pool_size": 2,
+            "request_timeout": 30,
+            "handshake_timeout": 20,
+            "restart_backoff_initial": 1,
+            "restart_backoff_max": 60
+        }
     }
 }
 EOF
@@ -423,7 +436,7 @@ source "$CLAUDE_HOME/lib/batman.sh"
 source "$CLAUDE_HOME/mcp/lib/mcp_utils.sh"
 
 show_usage() {
-    echo "Usage: $0 {start|stop|restart|status|install|health}"
+    echo "Usage: $0 {start|stop|restart|status|install|health|warm}"
     echo ""
     echo "Commands:"
     echo "  start    - Start all MCP servers"
@@ -432,6 +445,7 @@ show_usage() {
     echo "  status   - Show server status"
     echo "  install  - Install MCP servers"
     echo "  health   - Run health check"
+    echo "  warm     - Pre-warm pooled connections for the given servers"
 }
 
 start_servers() {
@@ -487,6 +501,10 @@ case "${1:-}" in
     health)
         mcp_health_check
         ;;
+    warm)
+        shift
+        mcp_manager warm "$@"
+        ;;
     *)
         show_usage
         exit 1
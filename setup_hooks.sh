@@ -66,6 +66,16 @@ copy_hook "$PROJECT_DIR/hooks/notification/voice_notify.py" "$HOOKS_DIR/notifica
 # Stop hooks
 copy_hook "$PROJECT_DIR/hooks/stop/session_logger.py" "$HOOKS_DIR/stop/session_logger.py" "Session Logger"
 
+# Hook dispatcher and its pipeline definition
+copy_hook "$PROJECT_DIR/hooks/dispatch.py" "$HOOKS_DIR/dispatch.py" "Hook Dispatcher"
+copy_hook "$PROJECT_DIR/hooks/dispatcher.py" "$HOOKS_DIR/dispatcher.py" "Hook Dispatcher Module"
+if [[ ! -f "$HOOKS_DIR/pipeline.json" ]]; then
+    cp "$PROJECT_DIR/hooks/pipeline.json" "$HOOKS_DIR/pipeline.json"
+    echo -e "${GREEN}✅ Installed hook pipeline${NC}"
+else
+    echo -e "${YELLOW}📦 Kept existing hook pipeline ($HOOKS_DIR/pipeline.json)${NC}"
+fi
+
 # Install settings.json
 echo -e "${BLUE}⚙️  Configuring Batcave settings...${NC}"
 if [[ -f "$CLAUDE_DIR/settings.json" ]]; then
@@ -162,7 +172,7 @@ import tempfile
 import subprocess
 import json
 
-def test_hook(hook_path, tool_data):
+def run_hook(hook_path, tool_data):
     """Test a hook with given tool data"""
     try:
         result = subprocess.run(
@@ -221,7 +231,7 @@ def main():
         hook_name = os.path.basename(hook_path)
         
         if os.path.exists(full_path):
-            success, message = test_hook(full_path, test_data)
+            success, message = run_hook(full_path, test_data)
             status = "✅" if success else "❌"
             print(f"{status} {hook_name}: {message}")
         else:
@@ -5,11 +5,27 @@ ABOUTME: Creates sample files and tests the linting and formatting hooks
 """
 
 import os
+import sys
+import time
+import statistics
 import tempfile
 import subprocess
 import json
 
-def test_hook(hook_path, tool_data):
+# Cold start of a hook answering a payload it ignores, as ms over a bare `python -I -S`
+# (HOOK_STARTUP_SLACK scales the budgets on slow machines)
+STARTUP_SLACK = float(os.environ.get("HOOK_STARTUP_SLACK", "1"))
+STARTUP_RUNS = 9
+IRRELEVANT_PAYLOADS = [
+    # (hook, arguments, payload, budget in ms)
+    ("dispatch.py", ["PreToolUse"], {"tool_name": "Read", "tool_input": {"file_path": "/tmp/test.txt"}}, 8),
+    ("pre_tool_use/safety_guard.py", [], {"tool": "Read", "input": {"file_path": "/tmp/test.txt"}}, 30),
+    ("pre_tool_use/context_validator.py", [], {"tool_name": "Glob", "parameters": {"pattern": "*.py"}}, 30),
+    ("post_tool_use/auto_format.py", [], {"tool": "Read", "input": {"file_path": "/tmp/test.py"}}, 30),
+    ("post_tool_use/linter_check.py", [], {"tool": "Write", "input": {"file_path": "/tmp/test.txt"}}, 30),
+]
+
+def run_hook(hook_path, tool_data):
     """Test a hook with given tool data"""
     try:
         result = subprocess.run(
@@ -31,6 +47,34 @@ def test_hook(hook_path, tool_data):
     except Exception as e:
         return False, str(e)
 
+def cold_start_ms(args, payload="", env=None, runs=STARTUP_RUNS):
+    """Median wall time in ms of a fresh isolated interpreter running args"""
+    command = [sys.executable, '-I', '-S'] + args
+    subprocess.run(command, input=payload, text=True, capture_output=True, env=env)  # warm the bytecode caches
+    times = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        subprocess.run(command, input=payload, text=True, capture_output=True, env=env)
+        times.append((time.perf_counter() - started) * 1000)
+    return statistics.median(times)
+
+def benchmark_startup(hooks_dir):
+    """Yield (hook, ms over a bare interpreter, budget ms) for each hook on an irrelevant payload"""
+    with tempfile.TemporaryDirectory() as claude_home:
+        env = dict(os.environ, CLAUDE_HOME=claude_home)
+        bare = cold_start_ms(['-c', 'pass'], env=env)
+        for hook_path, args, payload, budget in IRRELEVANT_PAYLOADS:
+            full_path = os.path.join(hooks_dir, hook_path)
+            if os.path.exists(full_path):
+                overhead = cold_start_ms([full_path] + args, json.dumps(payload), env) - bare
+                yield hook_path, overhead, budget * STARTUP_SLACK
+
+def test_hook_startup_time():
+    """Hooks answer payloads they ignore at close to bare interpreter cost"""
+    hooks_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), "hooks")
+    for hook_path, overhead, budget in benchmark_startup(hooks_dir):
+        assert overhead <= budget, f"{hook_path}: {overhead:.1f}ms over a bare interpreter (budget {budget:.0f}ms)"
+
 def main():
     claude_dir = os.path.expanduser("~/.claude")
     hooks_dir = os.path.join(claude_dir, "hooks")
@@ -68,12 +112,17 @@ def main():
         hook_name = os.path.basename(hook_path)
         
         if os.path.exists(full_path):
-            success, message = test_hook(full_path, test_data)
+            success, message = run_hook(full_path, test_data)
             status = "✅" if success else "❌"
             print(f"{status} {hook_name}: {message}")
         else:
             print(f"❌ {hook_name}: Not found at {full_path}")
     
+    print("\n⏱️  Cold start on irrelevant payloads (over a bare `python -I -S`)")
+    for hook_path, overhead, budget in benchmark_startup(hooks_dir):
+        status = "✅" if overhead <= budget else "⚠️"
+        print(f"{status} {os.path.basename(hook_path)}: +{overhead:.1f}ms (budget {budget:.0f}ms)")
+    
     print("\n🦇 Hook verification complete!")
 
 if __name__ == "__main__":